@@ -1,11 +1,11 @@
 import aiohttp
+import argparse
 import asyncio
 import requests
 import ujson
 import json
 import re
 import sqlite3
-import pandas as pd
 import os
 import warnings
 
@@ -14,6 +14,8 @@ from datetime import datetime
 from dotenv import load_dotenv
 from data_providers.impl.fmp import FinancialModelingPrep
 from data_providers.fetcher import get_fetcher
+from utils.price_matrix import PRICE_MATRICES, save_price_matrix
+from utils.price_store import PriceLoader, migrate_ticker_tables
 
 load_dotenv()
 
@@ -141,7 +143,15 @@ CRYPTO_DATA = {
 # Filter out the specific RuntimeWarning
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in scalar divide")
 
-if os.path.exists("backup_db/crypto.db"):
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build backup_db/crypto.db')
+    parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of only fetching the missing price history')
+    return parser.parse_args()
+
+
+args = parse_args()
+# Without --full the stored prices are kept and only topped up
+if args.full and os.path.exists("backup_db/crypto.db"):
     os.remove('backup_db/crypto.db')
 
 def get_jsonparsed_data(data):
@@ -167,12 +177,15 @@ class CryptoDatabase:
         self.cursor.execute("PRAGMA journal_mode = wal")
         self.conn.commit()
         self._create_table()
+        self.prices = PriceLoader(self.conn, fmp, START_DATE, END_DATE)
 
     def close_connection(self):
         self.cursor.close()
         self.conn.close()
 
     def _create_table(self):
+        # The ticker list and fundamentals are always rebuilt
+        self.cursor.execute("DROP TABLE IF EXISTS cryptos")
         self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS cryptos (
             symbol TEXT PRIMARY KEY,
@@ -181,6 +194,10 @@ class CryptoDatabase:
             type TEXT
         )
         """)
+        # Creates the prices table and folds in the per-symbol tables of older databases
+        migrated = migrate_ticker_tables(self.conn)
+        if migrated:
+            print(f"Migrated {migrated} per-symbol price tables into prices")
 
     def get_column_type(self, value):
         column_type = ""
@@ -337,6 +354,7 @@ class CryptoDatabase:
                 i += 1
                 if i % 150 == 0:
                     await asyncio.gather(*tasks)
+                    self.prices.flush()
                     tasks = []
                     print('sleeping mode: ', i)
                     await asyncio.sleep(60)  # Pause for 60 seconds
@@ -345,42 +363,13 @@ class CryptoDatabase:
             
             if tasks:
                 await asyncio.gather(*tasks)
+            self.prices.flush()
+            self.prices.prune()
 
 
-    def _create_ticker_table(self, symbol):
-        #cleaned_symbol = re.sub(r'[^a-zA-Z0-9_]', '_', symbol)
-        # Check if table exists
-        self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{symbol}'")
-        table_exists = self.cursor.fetchone() is not None
-
-        if not table_exists:
-            query = f"""
-            CREATE TABLE '{cleaned_symbol}' (
-                date TEXT,
-                open FLOAT,
-                high FLOAT,
-                low FLOAT,
-                close FLOAT,
-                volume INT,
-                change_percent FLOAT,
-            );
-            """
-            self.cursor.execute(query)
-
     async def save_ohlc_data(self, session, symbol):
-        try:
-            #self._create_ticker_table(symbol)  # Create table for the symbol
-            ohlc_data = await fmp.get_historical_price_full(symbol, START_DATE, END_DATE)
-            if 'historical' in ohlc_data:
-                ohlc_values = [(item['date'], item['open'], item['high'], item['low'], item['close'], item['volume'], item['changePercent']) for item in ohlc_data['historical'][::-1]]
-
-                df = pd.DataFrame(ohlc_values, columns=['date', 'open', 'high', 'low', 'close', 'volume', 'change_percent'])
-            
-                # Perform bulk insert
-                df.to_sql(symbol, self.conn, if_exists='append', index=False)
-
-        except Exception as e:
-            print(f"Failed to create table for symbol {symbol}: {str(e)}")
+        # Buffered until the batch is flushed
+        await self.prices.fetch(symbol)
 
 
 
@@ -389,4 +378,5 @@ loop = asyncio.get_event_loop()
 all_tickers = [item for item in loop.run_until_complete(fmp.list_available_cryptocurrencies()) if item['symbol'] in ['DASHUSD','ETCUSD','LINKUSD','USDCUSD','SHIBUSD','BNBUSD','BTCUSD', 'ETHUSD', 'LTCUSD', 'SOLUSD','DOGEUSD','XRPUSD','XMRUSD','USDTUSD','ADAUSD','AVAXUSD','BCHUSD','TRXUSD','DOTUSD','ALGOUSD']]
 
 loop.run_until_complete(db.save_cryptos(all_tickers))
+save_price_matrix(db.conn, PRICE_MATRICES['crypto'], full=args.full, refresh=db.prices.refreshed)
 db.close_connection()
\ No newline at end of file
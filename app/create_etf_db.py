@@ -1,15 +1,16 @@
 import aiohttp
+import argparse
 import asyncio
 import sqlite3
 import json
 import ujson
-import pandas as pd
 import os
 from tqdm import tqdm
 import re
-import pandas as pd
 from datetime import datetime
 from data_providers.impl.fmp import FinancialModelingPrep
+from utils.price_matrix import PRICE_MATRICES, save_price_matrix
+from utils.price_store import PriceLoader, migrate_ticker_tables
 import warnings
 from data_providers.fetcher import get_fetcher
 from dotenv import load_dotenv
@@ -28,9 +29,41 @@ warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid valu
 start_date = datetime(2015, 1, 1).strftime("%Y-%m-%d")
 end_date = datetime.today().strftime("%Y-%m-%d")
 
-
-
-if os.path.exists("backup_db/etf.db"):
+# Columns filled by save_fundamental_data, declared up front instead of being
+# added with ALTER TABLE as values show up
+FUNDAMENTAL_COLUMNS = {
+    'profile': 'TEXT',
+    'inceptionDate': 'TEXT',
+    'etfProvider': 'TEXT',
+    'expenseRatio': 'REAL',
+    'totalAssets': 'INTEGER',
+    'quote': 'TEXT',
+    'price': 'REAL',
+    'changesPercentage': 'REAL',
+    'marketCap': 'INTEGER',
+    'volume': 'INTEGER',
+    'avgVolume': 'INTEGER',
+    'eps': 'REAL',
+    'pe': 'REAL',
+    'previousClose': 'REAL',
+    'holding': 'TEXT',
+    'numberOfHoldings': 'INTEGER',
+    'country_weightings': 'TEXT',
+    'etf_dividend': 'TEXT',
+    'shareholders': 'TEXT',
+}
+
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build backup_db/etf.db')
+    parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of only fetching the missing price history')
+    return parser.parse_args()
+
+
+args = parse_args()
+# Without --full the stored prices are kept and only topped up
+if args.full and os.path.exists("backup_db/etf.db"):
     os.remove('backup_db/etf.db')
 
 
@@ -124,49 +157,30 @@ class ETFDatabase:
         self.cursor.execute("PRAGMA journal_mode = wal")
         self.conn.commit()
         self._create_table()
+        self.prices = PriceLoader(self.conn, fmp, start_date, end_date)
+        self.fundamentals = []
 
     def close_connection(self):
         self.cursor.close()
         self.conn.close()
 
     def _create_table(self):
-        self.cursor.execute("""
+        # The ticker list and fundamentals are always rebuilt
+        self.cursor.execute("DROP TABLE IF EXISTS etfs")
+        columns = ''.join(f",\n            {column} {column_type}" for column, column_type in FUNDAMENTAL_COLUMNS.items())
+        self.cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS etfs (
             symbol TEXT PRIMARY KEY,
             name TEXT,
             exchange TEXT,
             exchangeShortName TEXT,
-            type TEXT
+            type TEXT{columns}
         )
         """)
-
-    def get_column_type(self, value):
-        column_type = ""
-
-        if isinstance(value, str):
-            column_type = "TEXT"
-        elif isinstance(value, int):
-            column_type = "INTEGER"
-        elif isinstance(value, float):
-            column_type = "REAL"
-        else:
-            # Handle other data types or customize based on your specific needs
-            column_type = "TEXT"
-
-        return column_type
-
-    def remove_null(self, value):
-        if isinstance(value, str) and value == None:
-            value = 'n/a'
-        elif isinstance(value, int) and value == None:
-            value = 0
-        elif isinstance(value, float) and value == None:
-            value = 0
-        else:
-            # Handle other data types or customize based on your specific needs
-            pass
-
-        return value
+        # Creates the prices table and folds in the per-symbol tables of older databases
+        migrated = migrate_ticker_tables(self.conn)
+        if migrated:
+            print(f"Migrated {migrated} per-symbol price tables into prices")
 
     def delete_data_if_condition(self, condition, symbol):
         # Get a list of all tables in the database
@@ -216,8 +230,8 @@ class ETFDatabase:
             fundamental_data = {}
 
     
-            for method in methods:
-                parsed_data = await method['method']()
+            results = await asyncio.gather(*(method['method']() for method in methods))
+            for method, parsed_data in zip(methods, results):
 
                 try:
                     if isinstance(parsed_data, list) and method['key'] == 'etf_info':
@@ -264,32 +278,8 @@ class ETFDatabase:
                     pass
 
 
-            # Check if columns already exist in the table
-            self.cursor.execute("PRAGMA table_info(etfs)")
-            columns = {column[1]: column[2] for column in self.cursor.fetchall()}
-
-            # Update column definitions with keys from fundamental_data
-            column_definitions = {
-                key: (self.get_column_type(fundamental_data.get(key, None)), self.remove_null(fundamental_data.get(key, None)))
-                for key in fundamental_data
-            }
-
-            '''
-            if len(json.loads(fundamental_data['holding'])) == 0:
-                self.cursor.execute("DELETE FROM etfs WHERE symbol = ?", (symbol,))
-                #self.cursor.execute("DELETE FROM symbol WHERE symbol = ?", (symbol,))
-                self.conn.commit()
-                print(f"Delete {symbol}")
-                return
-            '''
-
-            for column, (column_type, value) in column_definitions.items():
-                if column not in columns and column_type:
-                    self.cursor.execute(f"ALTER TABLE etfs ADD COLUMN {column} {column_type}")
-
-                self.cursor.execute(f"UPDATE etfs SET {column} = ? WHERE symbol = ?", (value, symbol))
-
-            self.conn.commit()
+            # Written with the rest of the batch in flush()
+            self.fundamentals.append(tuple(fundamental_data.get(column) for column in FUNDAMENTAL_COLUMNS) + (symbol,))
 
         except Exception as e:
             print(f"Failed to fetch fundamental data for symbol {symbol}: {str(e)}")
@@ -345,6 +335,7 @@ class ETFDatabase:
                 i += 1
                 if i % 150 == 0:
                     await asyncio.gather(*tasks)
+                    self.flush()
                     tasks = []
                     print('sleeping mode: ', i)
                     await asyncio.sleep(60)  # Pause for 60 seconds
@@ -353,44 +344,21 @@ class ETFDatabase:
             
             if tasks:
                 await asyncio.gather(*tasks)
+            self.flush()
+            self.prices.prune()
 
 
-    def _create_ticker_table(self, symbol):
-        #cleaned_symbol = re.sub(r'[^a-zA-Z0-9_]', '_', symbol)
-        # Check if table exists
-        self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{symbol}'")
-        table_exists = self.cursor.fetchone() is not None
-
-        if not table_exists:
-            query = f"""
-            CREATE TABLE '{cleaned_symbol}' (
-                date TEXT,
-                open FLOAT,
-                high FLOAT,
-                low FLOAT,
-                close FLOAT,
-                volume INT,
-                change_percent FLOAT,
-            );
-            """
-            self.cursor.execute(query)
+    def flush(self):
+        # One transaction per batch of symbols instead of a commit per value
+        assignments = ', '.join(f"{column} = ?" for column in FUNDAMENTAL_COLUMNS)
+        with self.conn:
+            self.cursor.executemany(f"UPDATE etfs SET {assignments} WHERE symbol = ?", self.fundamentals)
+        self.fundamentals = []
+        self.prices.flush()
 
     async def save_ohlc_data(self, session, symbol):
-        try:
-            #self._create_ticker_table(symbol)  # Create table for the symbol
-
-            ohlc_data = await fmp.get_historical_price_full(symbol, start_date, end_date)
-            if 'historical' in ohlc_data:
-                ohlc_values = [(item['date'], item['open'], item['high'], item['low'], item['close'], item['volume'], item['changePercent']) for item in ohlc_data['historical'][::-1]]
-
-                df = pd.DataFrame(ohlc_values, columns=['date', 'open', 'high', 'low', 'close', 'volume', 'change_percent'])
-            
-                # Perform bulk insert
-                df.to_sql(symbol, self.conn, if_exists='append', index=False)
-
-        except Exception as e:
-            print(f"Failed to create table for symbol {symbol}: {str(e)}")
-
+        # Buffered until the batch is flushed
+        await self.prices.fetch(symbol)
 
 
 
@@ -403,4 +371,5 @@ for item in all_tickers:
         print(item)
 '''
 loop.run_until_complete(db.save_etfs(all_tickers))
+save_price_matrix(db.conn, PRICE_MATRICES['etf'], full=args.full, refresh=db.prices.refreshed)
 db.close_connection()
\ No newline at end of file
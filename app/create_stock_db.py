@@ -1,4 +1,5 @@
 import aiohttp
+import argparse
 import asyncio
 import sqlite3
 import json
@@ -19,6 +20,8 @@ from dotenv import load_dotenv
 import os
 from data_providers.fetcher import get_fetcher
 from data_providers.impl.fmp import FinancialModelingPrep
+from utils.price_matrix import PRICE_MATRICES, save_price_matrix
+from utils.price_store import PriceLoader, migrate_ticker_tables
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -33,8 +36,44 @@ end_date = datetime.today().strftime("%Y-%m-%d")
 
 quarter_date = '2024-06-30'
 
-
-if os.path.exists("backup_db/stocks.db"):
+# Columns filled by save_fundamental_data, declared up front instead of being
+# added with ALTER TABLE as values show up
+FUNDAMENTAL_COLUMNS = {
+    'profile': 'TEXT',
+    'beta': 'REAL',
+    'country': 'TEXT',
+    'sector': 'TEXT',
+    'industry': 'TEXT',
+    'discounted_cash_flow': 'REAL',
+    'quote': 'TEXT',
+    'price': 'REAL',
+    'changesPercentage': 'REAL',
+    'marketCap': 'INTEGER',
+    'volume': 'INTEGER',
+    'avgVolume': 'INTEGER',
+    'eps': 'REAL',
+    'pe': 'REAL',
+    'stock_dividend': 'TEXT',
+    'history_employee_count': 'TEXT',
+    'stock_split': 'TEXT',
+    'stock_peers': 'TEXT',
+    'shareholders': 'TEXT',
+    'historicalShares': 'TEXT',
+    'revenue_product_segmentation': 'TEXT',
+    'revenue_geographic_segmentation': 'TEXT',
+    'analyst_estimates': 'TEXT',
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build backup_db/stocks.db')
+    parser.add_argument('--full', action='store_true', help='Rebuild from scratch instead of only fetching the missing price history')
+    return parser.parse_args()
+
+
+args = parse_args()
+# Without --full the stored prices are kept and only topped up
+if args.full and os.path.exists("backup_db/stocks.db"):
     os.remove('backup_db/stocks.db')
 
 
@@ -53,53 +92,33 @@ class StockDatabase:
         self.cursor.execute("PRAGMA journal_mode = wal")
         self.conn.commit()
         self._create_table()
+        self.prices = PriceLoader(self.conn, fmp, start_date, end_date)
+        self.fundamentals = []
 
     def close_connection(self):
         self.cursor.close()
         self.conn.close()
 
     def _create_table(self):
-        self.cursor.execute("""
+        # The ticker list and fundamentals are always rebuilt
+        self.cursor.execute("DROP TABLE IF EXISTS stocks")
+        columns = ''.join(f",\n            {column} {column_type}" for column, column_type in FUNDAMENTAL_COLUMNS.items())
+        self.cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS stocks (
             symbol TEXT PRIMARY KEY,
             name TEXT,
             exchange TEXT,
             exchangeShortName TEXT,
-            type TEXT
+            type TEXT{columns}
         )
         """)
+        # Creates the prices table and folds in the per-symbol tables of older databases
+        migrated = migrate_ticker_tables(self.conn)
+        if migrated:
+            print(f"Migrated {migrated} per-symbol price tables into prices")
         self.conn.commit()
 
 
-    def get_column_type(self, value):
-        column_type = ""
-
-        if isinstance(value, str):
-            column_type = "TEXT"
-        elif isinstance(value, int):
-            column_type = "INTEGER"
-        elif isinstance(value, float):
-            column_type = "REAL"
-        else:
-            # Handle other data types or customize based on your specific needs
-            column_type = "TEXT"
-
-        return column_type
-
-    def remove_null(self, value):
-        if isinstance(value, str) and value == None:
-            value = 'n/a'
-        elif isinstance(value, int) and value == None:
-            value = 0
-        elif isinstance(value, float) and value == None:
-            value = 0
-        else:
-            # Handle other data types or customize based on your specific needs
-            pass
-
-        return value
-
-
     async def save_fundamental_data(self, session, symbol):
 
         try:
@@ -150,8 +169,8 @@ class StockDatabase:
             fundamental_data = {}
 
 
-            for method in methods:
-                parsed_data = await method['method']()
+            results = await asyncio.gather(*(method['method']() for method in methods))
+            for method, parsed_data in zip(methods, results):
 
                 try:
                     if isinstance(parsed_data, list) and method['key'] == 'profile':
@@ -212,24 +231,9 @@ class StockDatabase:
                     pass
 
 
-            # Check if columns already exist in the table
-            self.cursor.execute("PRAGMA table_info(stocks)")
-            columns = {column[1]: column[2] for column in self.cursor.fetchall()}
-
-            # Update column definitions with keys from fundamental_data
-            column_definitions = {
-                key: (self.get_column_type(fundamental_data.get(key, None)), self.remove_null(fundamental_data.get(key, None)))
-                for key in fundamental_data
-            }
+            # Written with the rest of the batch in flush()
+            self.fundamentals.append(tuple(fundamental_data.get(column) for column in FUNDAMENTAL_COLUMNS) + (symbol,))
 
-
-            for column, (column_type, value) in column_definitions.items():
-                if column not in columns and column_type:
-                    self.cursor.execute(f"ALTER TABLE stocks ADD COLUMN {column} {column_type}")
-
-                self.cursor.execute(f"UPDATE stocks SET {column} = ? WHERE symbol = ?", (value, symbol))
-
-            self.conn.commit()
         except Exception as e:
             print(f"Failed to fetch fundamental data for symbol {symbol}: {str(e)}")
 
@@ -298,6 +302,7 @@ class StockDatabase:
                 i += 1
                 if i % 60 == 0:
                     await asyncio.gather(*tasks)
+                    self.flush()
                     tasks = []
                     print('sleeping mode 30 seconds')
                     await asyncio.sleep(30)  # Pause for 60 seconds
@@ -305,59 +310,21 @@ class StockDatabase:
             
             if tasks:
                 await asyncio.gather(*tasks)
+            self.flush()
+            self.prices.prune()
 
 
-    def _create_ticker_table(self, symbol):
-        cleaned_symbol = symbol  # Ensure this is a safe string to use as a table name
-        self.cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS '{cleaned_symbol}' (
-                date TEXT UNIQUE,
-                open FLOAT,
-                high FLOAT,
-                low FLOAT,
-                close FLOAT,
-                volume INT,
-                change_percent FLOAT
-            );
-        """)
-        self.conn.commit()
+    def flush(self):
+        # One transaction per batch of symbols instead of a commit per value
+        assignments = ', '.join(f"{column} = ?" for column in FUNDAMENTAL_COLUMNS)
+        with self.conn:
+            self.cursor.executemany(f"UPDATE stocks SET {assignments} WHERE symbol = ?", self.fundamentals)
+        self.fundamentals = []
+        self.prices.flush()
 
     async def save_ohlc_data(self, session, symbol):
-        try:
-            self._create_ticker_table(symbol)  # Ensure the table exists
-
-            # Fetch OHLC data from the API
-            ohlc_data = await fmp.get_historical_price_full(symbol, start_date, end_date)
-
-            if 'historical' in ohlc_data:
-                historical_data = ohlc_data['historical'][::-1]
-
-                for entry in historical_data:
-                    # Prepare the data for each entry
-                    date = entry.get('date')
-                    open_price = entry.get('open')
-                    high = entry.get('high')
-                    low = entry.get('low')
-                    close = entry.get('close')
-                    volume = entry.get('volume')
-                    change_percent = entry.get('changePercent')
-
-                    # Check if this date's data already exists
-                    self.cursor.execute(f"SELECT date FROM '{symbol}' WHERE date = ?", (date,))
-                    exists = self.cursor.fetchone()
-
-                    # If it doesn't exist, insert the new data
-                    if not exists:
-                        self.cursor.execute(f"""
-                            INSERT INTO '{symbol}' (date, open, high, low, close, volume, change_percent)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (date, open_price, high, low, close, volume, change_percent))
-                
-                # Commit all changes to the database
-                self.conn.commit()
-
-        except Exception as e:
-            print(f"Failed to fetch or insert OHLC data for symbol {symbol}: {str(e)}")
+        # Buffered until the batch is flushed
+        await self.prices.fetch(symbol)
 
 
 
@@ -368,4 +335,5 @@ all_tickers = [item for item in all_tickers if '-' not in item['symbol'] or item
 
 
 loop.run_until_complete(db.save_stocks(all_tickers))
+save_price_matrix(db.conn, PRICE_MATRICES['stocks'], full=args.full, refresh=db.prices.refreshed)
 db.close_connection()
\ No newline at end of file
@@ -330,7 +330,6 @@ async def run():
 
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     
     if train_mode:
         # Warm start training
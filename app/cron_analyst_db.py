@@ -15,6 +15,8 @@ import asyncio
 import statistics
 import math
 
+from utils.price_store import read_prices
+
 load_dotenv()
 api_key = os.getenv('BENZINGA_API_KEY')
 
@@ -25,11 +27,6 @@ with open(f"json/stock-screener/data.json", 'rb') as file:
     stock_screener_data = orjson.loads(file.read())
 stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data}
 
-query_template = """
-    SELECT date, close
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
 buy_ratings = ['Outperform', 'Overweight', 'Market Outperform', 'Buy', 'Positive', 'Sector Outperform']
 
 sell_ratings = ['Negative', 'Underperform', 'Underweight', 'Reduce', 'Sell']
@@ -392,8 +389,7 @@ async def process_analyst(item, con, session, start_date, end_date):
             # Check if the ticker data is already cached
             if ticker not in ticker_price_cache:
                 # If not cached, query the stock data and cache it
-                query = query_template.format(ticker=ticker)
-                df = pd.read_sql_query(query, con, params=(start_date, end_date))
+                df = read_prices(con, ticker, start_date, end_date, columns=('date', 'close'))
                 ticker_price_cache[ticker] = df
             else:
                 # Use cached data
@@ -213,7 +213,6 @@ async def run():
 
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     stock_symbols = [row[0] for row in cursor.fetchall()]
     for ticker in tqdm(stock_symbols):
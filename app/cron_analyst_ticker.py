@@ -13,17 +13,14 @@ import statistics
 import os
 from dotenv import load_dotenv
 
+from utils.price_store import read_prices
+
 load_dotenv()
 api_key = os.getenv('BENZINGA_API_KEY')
 
 fin = financial_data.Benzinga(api_key)
 
 
-query_template = """
-    SELECT date,close
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
 end_date = datetime.today().date()
 start_date_12m = end_date - timedelta(days=365)
 
@@ -273,8 +270,7 @@ def run(chunk, analyst_list, con):
                 
                 try:
                     # Add historical price for the last 12 months
-                    query = query_template.format(ticker=ticker)
-                    df_12m = pd.read_sql_query(query, con, params=(start_date_12m, end_date)).round(2)
+                    df_12m = read_prices(con, ticker, start_date_12m, end_date, columns=('date', 'close')).round(2)
                     df_12m['date'] = pd.to_datetime(df_12m['date'])
 
                     df_12m_last_per_month = df_12m.groupby(df_12m['date'].dt.to_period('M')).tail(1)
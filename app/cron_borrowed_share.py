@@ -41,12 +41,10 @@ async def run():
     etf_con = sqlite3.connect('etf.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketcap >=1E9 AND symbol NOT LIKE '%.%'")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
@@ -251,7 +251,6 @@ async def get_data(session, total_symbols):
 async def run():
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     total_symbols = [row[0] for row in cursor.fetchall()]
     #total_symbols = ['TSLA']  # For testing purposes
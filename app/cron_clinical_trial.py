@@ -69,7 +69,6 @@ async def run():
     con = sqlite3.connect('stocks.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol, name FROM stocks WHERE sector = 'Healthcare' AND symbol NOT LIKE '%.%'")
     company_data = [{'symbol': row[0], 'name': row[1]} for row in cursor.fetchall()]
     con.close()
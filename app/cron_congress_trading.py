@@ -343,7 +343,6 @@ async def run():
 
         con = sqlite3.connect('stocks.db')
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT symbol, name, sector FROM stocks WHERE symbol NOT LIKE '%.%'")
         stock_raw_data = cursor.fetchall()
         stock_raw_data = [{
@@ -360,7 +359,6 @@ async def run():
 
         etf_con = sqlite3.connect('etf.db')
         etf_cursor = etf_con.cursor()
-        etf_cursor.execute("PRAGMA journal_mode = wal")
         etf_cursor.execute("SELECT DISTINCT symbol, name FROM etfs")
         etf_raw_data = etf_cursor.fetchall()
         etf_raw_data = [{
@@ -372,7 +370,6 @@ async def run():
 
         crypto_con = sqlite3.connect('crypto.db')
         crypto_cursor = crypto_con.cursor()
-        crypto_cursor.execute("PRAGMA journal_mode = wal")
         crypto_cursor.execute("SELECT DISTINCT symbol, name FROM cryptos")
         crypto_raw_data = crypto_cursor.fetchall()
         crypto_raw_data = [{
@@ -379,7 +379,6 @@ def create_dataset():
     
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol, name FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
     stock_data = [{'symbol': row[0], 'name': row[1]} for row in cursor.fetchall()]
     print(f"Total stocks: {len(stock_data)}")
@@ -1,4 +1,3 @@
-import pandas as pd
 import sqlite3
 from datetime import datetime, timedelta
 import concurrent.futures
@@ -8,35 +7,28 @@ import warnings
 import numpy as np
 import os
 
+from utils.price_matrix import PRICE_MATRICES, PriceMatrix, correlate, correlation_window, open_price_matrix
+
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in divide")
 
-def get_stock_prices(ticker, cursor, start_date, end_date):
-    query = f"""
-        SELECT date, close, volume
-        FROM "{ticker}"
-        WHERE date BETWEEN ? AND ?
-    """
-    cursor.execute(query, (start_date, end_date))
-    return pd.DataFrame(cursor.fetchall(), columns=['date', 'close', 'volume'])
+# Set once per worker from the memory mapped price matrix, see correlation_window()
+window = {}
+
+def init_worker(directory, start_date, end_date):
+    window.update(correlation_window(PriceMatrix.load(directory), start_date, end_date))
 
-def process_symbol(op_symbol, symbols, start_date, end_date, query_fundamental):
+def process_symbol(op_symbol, query_fundamental):
     with sqlite3.connect('stocks.db') as con:
-        con.execute("PRAGMA journal_mode = WAL")
         cursor = con.cursor()
         
-        op_df = get_stock_prices(op_symbol, cursor, start_date, end_date)
-        avg_volume = op_df['volume'].mean() * 0.5
-        correlations = {}
-
-        for symbol in symbols:
-            if symbol != op_symbol:
-                try:
-                    stock_df = get_stock_prices(symbol, cursor, start_date, end_date)
-                    if stock_df['volume'].mean() > avg_volume:
-                        correlation = np.corrcoef(op_df['close'], stock_df['close'])[0, 1]
-                        correlations[symbol] = correlation
-                except Exception:
-                    pass
+        if op_symbol not in window['index']:
+            return
+        pos = window['index'][op_symbol]
+        # Pearson correlation with every symbol at once, over the sessions each pair shares
+        values = correlate(window, op_symbol)
+        candidates = window['volume'] > window['volume'][pos] * 0.5
+        candidates[pos] = False
+        correlations = {symbol: values[row] for symbol, row in window['index'].items() if candidates[row]}
 
         sorted_correlations = sorted(correlations.items(), key=lambda x: x[1], reverse=True)
         most_least_list = sorted_correlations[:5] + sorted_correlations[-5:]
@@ -64,18 +56,21 @@ def main():
     query_fundamental = "SELECT name, marketCap FROM stocks WHERE symbol = ?"
     
     with sqlite3.connect('stocks.db') as con:
-        con.execute("PRAGMA journal_mode = WAL")
         cursor = con.cursor()
         cursor.execute("SELECT DISTINCT symbol FROM stocks")
         symbols = [row[0] for row in cursor.fetchall()]
 
+        # Build the matrix if the builders haven't written one yet
+        open_price_matrix(PRICE_MATRICES['stocks'], con)
+
     end_date = datetime.today()
     start_date = end_date - timedelta(days=365)
+    initargs = (PRICE_MATRICES['stocks'], start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
 
     num_processes = 4
     
-    with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes) as executor:
-        futures = [executor.submit(process_symbol, symbol, symbols, start_date, end_date, query_fundamental) for symbol in symbols]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker, initargs=initargs) as executor:
+        futures = [executor.submit(process_symbol, symbol, query_fundamental) for symbol in symbols]
         for _ in tqdm(concurrent.futures.as_completed(futures), total=len(symbols), desc="Processing"):
             pass
 
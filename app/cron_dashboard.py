@@ -299,7 +299,6 @@ async def get_analyst_report():
         # Connect to the database and retrieve symbols
         with sqlite3.connect('stocks.db') as con:
             cursor = con.cursor()
-            cursor.execute("PRAGMA journal_mode = wal")
             cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%' AND marketCap > 10E9")
             symbols = {row[0] for row in cursor.fetchall()}  # Use a set for fast lookups
 
@@ -520,12 +519,10 @@ try:
 	etf_con = sqlite3.connect('etf.db')
 
 	cursor = con.cursor()
-	cursor.execute("PRAGMA journal_mode = wal")
 	cursor.execute("SELECT DISTINCT symbol FROM stocks")
 	stock_symbols = [row[0] for row in cursor.fetchall()]
 
 	etf_cursor = etf_con.cursor()
-	etf_cursor.execute("PRAGMA journal_mode = wal")
 	etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
 	etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
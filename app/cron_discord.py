@@ -12,7 +12,6 @@ CRYPTO_DB = 'crypto'
 def db_connection(db_name):
     conn = sqlite3.connect(f'{db_name}.db')
     cursor = conn.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     try:
         yield cursor
     finally:
@@ -63,7 +63,6 @@ async def run():
     try:
         con = sqlite3.connect('stocks.db')
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks")
         stock_symbols = [row[0] for row in cursor.fetchall()]
         con.close()
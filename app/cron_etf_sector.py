@@ -47,7 +47,6 @@ def save_json(data, symbol):
 async def run():
     con = sqlite3.connect('etf.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM etfs")
     symbols = [row[0] for row in cursor.fetchall()]
     con.close()
@@ -41,7 +41,6 @@ async def get_data(session, symbol):
 async def run():
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     symbols = [row[0] for row in cursor.fetchall()]
     con.close()
@@ -5,6 +5,7 @@ import aiohttp
 import sqlite3
 from tqdm import tqdm
 from dotenv import load_dotenv
+from utils.helper import write_json
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -51,8 +52,7 @@ async def fetch_data(session, url, symbol, rate_limiter):
 
 async def save_json(symbol, period, data_type, data):
     os.makedirs(f"json/financial-statements/{data_type}/{period}/", exist_ok=True)
-    with open(f"json/financial-statements/{data_type}/{period}/{symbol}.json", 'w') as file:
-        ujson.dump(data, file)
+    write_json(f"json/financial-statements/{data_type}/{period}/{symbol}.json", data)
 
 async def calculate_margins(symbol):
     for period in ['annual', 'quarter']:
@@ -93,8 +93,7 @@ async def calculate_margins(symbol):
                         ratio_item['pretaxProfitMargin'] = None
                         ratio_item['netProfitMargin'] = None
 
-                with open(ratios_path, "w") as file:
-                    ujson.dump(ratio_data, file)
+                write_json(ratios_path, ratio_data)
 
         except Exception as e:
             print(f"Error calculating margins for {symbol}: {e}")
@@ -138,7 +137,6 @@ async def get_financial_statements(session, symbol, semaphore, rate_limiter):
 async def run():
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     symbols = [row[0] for row in cursor.fetchall()]
     con.close()
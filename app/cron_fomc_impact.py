@@ -8,16 +8,13 @@ import sqlite3
 import pandas as pd
 from tqdm import tqdm
 
+from utils.price_store import read_prices
+
 # Load environment variables
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
 
 
-query_template = """
-    SELECT date, close
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
 
 # Function to save JSON data
 async def save_json(symbol, data):
@@ -78,11 +75,9 @@ async def run():
     stock_con = sqlite3.connect('stocks.db')
     etf_con = sqlite3.connect('etf.db')
     stock_cursor = stock_con.cursor()
-    stock_cursor.execute("PRAGMA journal_mode = wal")
     stock_cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND marketCap >= 500E6")
     stock_symbols = [row[0] for row in stock_cursor.fetchall()]
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
@@ -90,9 +85,8 @@ async def run():
     
     for ticker in tqdm(total_symbols):
         try:
-            query = query_template.format(ticker=ticker)
             connection = stock_con if ticker in stock_symbols else etf_con
-            df_price = pd.read_sql_query(query, connection, params=(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+            df_price = read_prices(connection, ticker, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), columns=('date', 'close'))
 
             if len(df_price) > 150 and len(fomc_dates) > 0:
                 # Convert 'date' column in df_price to datetime.date for comparison
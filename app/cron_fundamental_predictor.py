@@ -207,7 +207,6 @@ async def run():
     con = sqlite3.connect('stocks.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap >= 300E9")
     stock_symbols = [row[0] for row in cursor.fetchall()]
     print('Number of Stocks')
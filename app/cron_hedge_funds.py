@@ -205,7 +205,6 @@ if __name__ == '__main__':
     stock_con = sqlite3.connect('stocks.db')
     
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT cik FROM institutes")
     cik_symbols = [row[0] for row in cursor.fetchall()]
     #Test mode
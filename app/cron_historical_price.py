@@ -1,11 +1,12 @@
 import ujson
 import asyncio
 import aiohttp
-import aiofiles
 import sqlite3
 from datetime import datetime, timedelta, time
 import pytz
 import pandas as pd
+from utils.helper import write_json
+from utils.price_store import read_prices
 
 from dotenv import load_dotenv
 import os
@@ -52,40 +53,29 @@ async def get_historical_data(ticker, query_con, session):
                 data.append(df.to_json(orient="records"))
 
             # Database read for 6M, 1Y, MAX data
-            query_template = """
-                SELECT date, open,high,low,close,volume
-                FROM "{ticker}"
-                WHERE date BETWEEN ? AND ?
-            """
-            query = query_template.format(ticker=ticker)
-            df_6m = pd.read_sql_query(query, query_con, params=(start_date_6m, end_date)).round(2).rename(columns={"date": "time"})
-            df_1y = pd.read_sql_query(query, query_con, params=(start_date_1y, end_date)).round(2).rename(columns={"date": "time"})
-            df_5y = pd.read_sql_query(query, query_con, params=(start_date_5y, end_date)).round(2).rename(columns={"date": "time"})
-            df_max = pd.read_sql_query(query, query_con, params=(start_date_max, end_date)).round(2).rename(columns={"date": "time"})
-
-            async with aiofiles.open(f"json/historical-price/one-week/{ticker}.json", 'w') as file:
-                res = ujson.loads(data[0]) if data else []
-                await file.write(ujson.dumps(res))
-
-            async with aiofiles.open(f"json/historical-price/one-month/{ticker}.json", 'w') as file:
-                res = ujson.loads(data[1]) if len(data) > 1 else []
-                await file.write(ujson.dumps(res))
-
-            async with aiofiles.open(f"json/historical-price/six-months/{ticker}.json", 'w') as file:
-                res = ujson.loads(df_6m.to_json(orient="records"))
-                await file.write(ujson.dumps(res))
-
-            async with aiofiles.open(f"json/historical-price/one-year/{ticker}.json", 'w') as file:
-                res = ujson.loads(df_1y.to_json(orient="records"))
-                await file.write(ujson.dumps(res))
-
-            async with aiofiles.open(f"json/historical-price/five-years/{ticker}.json", 'w') as file:
-                res = ujson.loads(df_5y.to_json(orient="records"))
-                await file.write(ujson.dumps(res))
-
-            async with aiofiles.open(f"json/historical-price/max/{ticker}.json", 'w') as file:
-                res = ujson.loads(df_max.to_json(orient="records"))
-                await file.write(ujson.dumps(res))
+            columns = ('date', 'open', 'high', 'low', 'close', 'volume')
+            df_6m = read_prices(query_con, ticker, start_date_6m, end_date, columns).round(2).rename(columns={"date": "time"})
+            df_1y = read_prices(query_con, ticker, start_date_1y, end_date, columns).round(2).rename(columns={"date": "time"})
+            df_5y = read_prices(query_con, ticker, start_date_5y, end_date, columns).round(2).rename(columns={"date": "time"})
+            df_max = read_prices(query_con, ticker, start_date_max, end_date, columns).round(2).rename(columns={"date": "time"})
+
+            res = ujson.loads(data[0]) if data else []
+            write_json(f"json/historical-price/one-week/{ticker}.json", res)
+
+            res = ujson.loads(data[1]) if len(data) > 1 else []
+            write_json(f"json/historical-price/one-month/{ticker}.json", res)
+
+            res = ujson.loads(df_6m.to_json(orient="records"))
+            write_json(f"json/historical-price/six-months/{ticker}.json", res)
+
+            res = ujson.loads(df_1y.to_json(orient="records"))
+            write_json(f"json/historical-price/one-year/{ticker}.json", res)
+
+            res = ujson.loads(df_5y.to_json(orient="records"))
+            write_json(f"json/historical-price/five-years/{ticker}.json", res)
+
+            res = ujson.loads(df_max.to_json(orient="records"))
+            write_json(f"json/historical-price/max/{ticker}.json", res)
 
     except Exception as e:
         print(f"Failed to fetch data for {ticker}: {e}")
@@ -95,17 +85,14 @@ async def run():
     chunk_size = 100
     try:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks")
         stock_symbols = [row[0] for row in cursor.fetchall()]
 
         etf_cursor = etf_con.cursor()
-        etf_cursor.execute("PRAGMA journal_mode = wal")
         etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
         etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
         crypto_cursor = crypto_con.cursor()
-        crypto_cursor.execute("PRAGMA journal_mode = wal")
         crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
         crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
 
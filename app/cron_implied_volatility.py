@@ -18,13 +18,11 @@ headers = {"Accept": "application/json, text/plain", "Authorization": api_key}
 con = sqlite3.connect('stocks.db')
 etf_con = sqlite3.connect('etf.db')
 cursor = con.cursor()
-cursor.execute("PRAGMA journal_mode = wal")
 #cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND marketCap > 1E9")
 cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
 stocks_symbols = [row[0] for row in cursor.fetchall()]
 
 etf_cursor = etf_con.cursor()
-etf_cursor.execute("PRAGMA journal_mode = wal")
 #etf_cursor.execute("SELECT DISTINCT symbol FROM etfs WHERE marketCap > 1E9")
 etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
 etf_symbols = [row[0] for row in etf_cursor.fetchall()]
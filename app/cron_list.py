@@ -88,7 +88,6 @@ async def get_etf_holding():
     # Create a connection to the ETF database
     etf_con = sqlite3.connect('etf.db')
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     
     # Fetch distinct ETF symbols
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
@@ -378,7 +377,6 @@ async def get_faang():
 async def get_penny_stocks():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -427,7 +425,6 @@ async def get_penny_stocks():
 async def get_oversold_stocks():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -477,7 +474,6 @@ async def get_oversold_stocks():
 async def get_overbought_stocks():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -528,7 +524,6 @@ async def get_overbought_stocks():
 async def get_top_dividend_stocks():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -579,7 +574,6 @@ async def get_top_dividend_stocks():
 async def get_highest_revenue():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -625,7 +619,6 @@ async def get_highest_revenue():
 async def get_highest_income_tax():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -671,7 +664,6 @@ async def get_highest_income_tax():
 async def get_most_employees():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -718,7 +710,6 @@ async def get_most_employees():
 async def get_most_ftd_shares():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -767,7 +758,6 @@ async def get_most_ftd_shares():
 async def get_most_shorted_stocks():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -813,7 +803,6 @@ async def get_most_shorted_stocks():
 async def get_highest_oi_change():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -874,7 +863,6 @@ async def get_highest_oi_change():
 async def get_highest_option_iv_rank():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -926,7 +914,6 @@ async def get_highest_option_iv_rank():
 async def get_highest_option_premium():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -980,7 +967,6 @@ async def etf_bitcoin_list():
     try:
         with sqlite3.connect('etf.db') as etf_con:
             etf_cursor = etf_con.cursor()
-            etf_cursor.execute("PRAGMA journal_mode = wal")
             etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
             etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
@@ -1093,7 +1079,6 @@ async def get_all_reits_list(cursor):
 async def get_index_list():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks")
         symbols = [row[0] for row in cursor.fetchall()]
 
@@ -1147,13 +1132,11 @@ async def get_all_stock_tickers():
         '''
         with sqlite3.connect('etf.db') as etf_con:
             etf_cursor = etf_con.cursor()
-            etf_cursor.execute("PRAGMA journal_mode = wal")
             etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
             etf_symbols = [row[0] for row in etf_cursor.fetchall()]
         '''
         with sqlite3.connect('stocks.db') as con:
             cursor = con.cursor()
-            cursor.execute("PRAGMA journal_mode = wal")
             cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
             stock_symbols = [row[0] for row in cursor.fetchall()]
 
@@ -1202,13 +1185,11 @@ async def get_all_etf_tickers():
         '''
         with sqlite3.connect('etf.db') as etf_con:
             etf_cursor = etf_con.cursor()
-            etf_cursor.execute("PRAGMA journal_mode = wal")
             etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
             etf_symbols = [row[0] for row in etf_cursor.fetchall()]
         '''
         with sqlite3.connect('etf.db') as con:
             cursor = con.cursor()
-            cursor.execute("PRAGMA journal_mode = wal")
             cursor.execute("SELECT DISTINCT symbol FROM etfs")
             etf_symbols = [row[0] for row in cursor.fetchall()]
 
@@ -1331,11 +1312,9 @@ async def run():
     try:
         con = sqlite3.connect('stocks.db')
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
 
         etf_con = sqlite3.connect('etf.db')
         etf_cursor = etf_con.cursor()
-        etf_cursor.execute("PRAGMA journal_mode = wal")
         etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
         etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
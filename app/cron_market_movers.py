@@ -1,4 +1,3 @@
-from datetime import date, datetime, timedelta, time
 import ujson
 import orjson
 import sqlite3
@@ -6,7 +5,8 @@ import pandas as pd
 import asyncio
 import aiohttp
 import pytz
-from utils.helper import check_market_hours
+from utils.helper import check_market_hours, write_json
+from utils.trading_calendar import is_trading_day, now_et
 
 from GetStartEndDate import GetStartEndDate
 
@@ -24,22 +24,13 @@ volume_threshold = 50_000
 
 def check_market_hours():
 
-    holidays = ['2025-01-01', '2025-01-09','2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25']
-    
     # Get the current date and time in ET (Eastern Time)
-    et_timezone = pytz.timezone('America/New_York')
-    current_time = datetime.now(et_timezone)
-    current_date_str = current_time.strftime('%Y-%m-%d')
+    current_time = now_et()
     current_hour = current_time.hour
     current_minute = current_time.minute
-    current_day = current_time.weekday()  # Monday is 0, Sunday is 6
-
-    # Check if the current date is a holiday or weekend
-    is_weekend = current_day >= 5  # Saturday (5) or Sunday (6)
-    is_holiday = current_date_str in holidays
 
     # Determine the market status
-    if is_weekend or is_holiday:
+    if not is_trading_day(current_time):
         return 0 #Closed
     elif current_hour < 9 or (current_hour == 9 and current_minute < 30):
         return 1 # Pre-Market
@@ -260,7 +251,6 @@ async def get_pre_after_market_movers(symbols):
 try:
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     symbols = [row[0] for row in cursor.fetchall()]
     #Filter out tickers
@@ -269,20 +259,17 @@ try:
     
     data = asyncio.run(get_gainer_loser_active_stocks(symbols))
     for category in data.keys():
-        with open(f"json/market-movers/markethours/{category}.json", 'w') as file:
-            file.write(orjson.dumps(data[category]).decode("utf-8"))
+        write_json(f"json/market-movers/markethours/{category}.json", data[category])
     
 
     
     data = asyncio.run(get_pre_after_market_movers(symbols))
     if market_status == 1:
         for category in data.keys():
-            with open(f"json/market-movers/premarket/{category}.json", 'w') as file:
-                file.write(orjson.dumps(data[category]).decode("utf-8"))
+            write_json(f"json/market-movers/premarket/{category}.json", data[category])
     elif market_status == 2:
         for category in data.keys():
-            with open(f"json/market-movers/afterhours/{category}.json", 'w') as file:
-                file.write(orjson.dumps(data[category]).decode("utf-8"))
+            write_json(f"json/market-movers/afterhours/{category}.json", data[category])
     
 
     con.close()
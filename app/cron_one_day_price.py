@@ -5,6 +5,7 @@ import sqlite3
 from datetime import datetime, timedelta, time
 import pandas as pd
 from GetStartEndDate import GetStartEndDate
+from utils.helper import write_json
 from dotenv import load_dotenv
 import os
 
@@ -13,8 +14,7 @@ api_key = os.getenv('FMP_API_KEY')
 
 
 async def save_price_data(symbol, data):
-    with open(f"json/one-day-price/{symbol}.json", 'w') as file:
-        ujson.dump(data, file)
+    write_json(f"json/one-day-price/{symbol}.json", data)
 
 
 async def fetch_and_save_symbols_data(symbols):
@@ -94,12 +94,10 @@ async def run():
     etf_con = sqlite3.connect('etf.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
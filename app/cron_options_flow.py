@@ -6,7 +6,8 @@ from datetime import datetime
 from GetStartEndDate import GetStartEndDate
 from dotenv import load_dotenv
 from benzinga import financial_data
-from utils.helper import check_market_hours
+from utils.helper import check_market_hours, write_json
+from utils.options_activity import connect, mark_synced, store_activity
 
 # Load environment variables
 load_dotenv()
@@ -87,6 +88,15 @@ async def main():
     # Fetch and process option data
     options_data = await fetch_all_pages()
 
+    # Keep the raw activity in the per-ticker store before it gets cleaned up in place
+    con = connect()
+    try:
+        store_activity(con, options_data)
+        if options_data:
+            mark_synced(con)
+    finally:
+        con.close()
+
     # Clean and filter the data
     filtered_data = clean_and_filter_data(options_data)
 
@@ -96,8 +106,7 @@ async def main():
     # Write the final data to a JSON file
     output_file = "json/options-flow/feed/data.json"
     if len(sorted_data) > 0:
-        with open(output_file, 'w') as file:
-            file.write(orjson.dumps(sorted_data).decode("utf-8"))
+        write_json(output_file, sorted_data)
 
     print(f"Data successfully written to {output_file}")
 
@@ -5,10 +5,11 @@ from datetime import datetime,timedelta
 from dotenv import load_dotenv
 import os
 import sqlite3
-import pandas as pd
 import time
 from tqdm import tqdm
 
+from utils.price_store import read_prices
+
 load_dotenv()
 
 api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
@@ -17,13 +18,11 @@ api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
 con = sqlite3.connect('stocks.db')
 etf_con = sqlite3.connect('etf.db')
 cursor = con.cursor()
-cursor.execute("PRAGMA journal_mode = wal")
 #cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND marketCap > 1E9")
 cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
 stocks_symbols = [row[0] for row in cursor.fetchall()]
 
 etf_cursor = etf_con.cursor()
-etf_cursor.execute("PRAGMA journal_mode = wal")
 #etf_cursor.execute("SELECT DISTINCT symbol FROM etfs WHERE marketCap > 1E9")
 etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
 etf_symbols = [row[0] for row in etf_cursor.fetchall()]
@@ -35,11 +34,6 @@ total_symbols = stocks_symbols + etf_symbols
 #today = datetime.today()
 #N_days_ago = today - timedelta(days=90)
 
-query_template = """
-    SELECT date, close, change_percent
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
 
 def get_tickers_from_directory(directory: str):
     try:
@@ -97,8 +91,7 @@ def prepare_data(data, symbol):
     start_date_str = data[-1]['date']
     end_date_str = data[0]['date']
 
-    query = query_template.format(ticker=symbol)
-    df_price = pd.read_sql_query(query, con if symbol in stocks_symbols else etf_con, params=(start_date_str, end_date_str)).round(2)
+    df_price = read_prices(con if symbol in stocks_symbols else etf_con, symbol, start_date_str, end_date_str, columns=('date', 'close', 'change_percent')).round(2)
     df_price = df_price.rename(columns={"change_percent": "changesPercentage"})
 
     # Convert the DataFrame to a dictionary for quick lookups by date
@@ -13,13 +13,11 @@ api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
 def get_total_symbols():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
         stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     with sqlite3.connect('etf.db') as etf_con:
         etf_cursor = etf_con.cursor()
-        etf_cursor.execute("PRAGMA journal_mode = wal")
         etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
         etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
@@ -53,7 +53,6 @@ def get_symbols(db_name, table_name):
     """
     with sqlite3.connect(db_name) as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute(f"SELECT DISTINCT symbol FROM {table_name} WHERE symbol NOT LIKE '%.%'")
         return [row[0] for row in cursor.fetchall()]
 
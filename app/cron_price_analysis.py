@@ -72,19 +72,16 @@ async def run():
     crypto_con = sqlite3.connect('crypto.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     #cursor.execute("SELECT DISTINCT symbol FROM stocks")
     #cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap > 10E9 AND symbol NOT LIKE '%.%'")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap > 1E9")
     stock_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs WHERE totalAssets > 5E9")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
     crypto_cursor = crypto_con.cursor()
-    crypto_cursor.execute("PRAGMA journal_mode = wal")
     crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
     crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
     crypto_symbols = convert_symbols(crypto_symbols) #Convert BTCUSD to BTC-USD for yfinance
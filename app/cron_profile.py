@@ -11,6 +11,7 @@ from tqdm import tqdm
 from dotenv import load_dotenv
 import os
 import re
+from utils.helper import write_json
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -46,8 +47,7 @@ STATE_MAP = {
 
 
 async def save_json(symbol, data):
-    with open(f"json/profile/{symbol}.json", 'w') as file:
-        file.write(orjson.dumps(data).decode('utf-8'))
+    write_json(f"json/profile/{symbol}.json", data)
 
 def custom_sort(entry):
     title_lower = entry['position'].lower()
@@ -206,7 +206,6 @@ async def run():
 
     con = sqlite3.connect('stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     symbols = [row[0] for row in cursor.fetchall()]
     
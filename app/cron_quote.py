@@ -4,6 +4,7 @@ import aiohttp
 import sqlite3
 from datetime import datetime
 import pytz
+from utils.helper import write_json
 
 from dotenv import load_dotenv
 import os
@@ -56,8 +57,7 @@ async def get_bid_ask_quote_of_stocks(ticker_list):
                 return {}
 
 async def save_quote_as_json(symbol, data):
-    with open(f"json/quote/{symbol}.json", 'w') as file:
-        file.write(orjson.dumps(data).decode())
+    write_json(f"json/quote/{symbol}.json", data)
 
 async def save_pre_post_quote_as_json(symbol, data):
     try:
@@ -67,11 +67,10 @@ async def save_pre_post_quote_as_json(symbol, data):
             previous_close = quote_data['price']
             changes_percentage = round((data['price']/previous_close-1)*100,2)
         if exchange in ['NASDAQ','AMEX','NYSE']:
-            with open(f"json/pre-post-quote/{symbol}.json", 'w') as file:
-                dt = datetime.fromtimestamp(data['timestamp']/1000, ny_timezone)
-                formatted_date = dt.strftime("%b %d, %Y, %I:%M %p %Z")
-                res = {'symbol': symbol, 'price': round(data['price'],2), 'changesPercentage': changes_percentage, 'time': formatted_date}
-                file.write(orjson.dumps(res).decode())
+            dt = datetime.fromtimestamp(data['timestamp']/1000, ny_timezone)
+            formatted_date = dt.strftime("%b %d, %Y, %I:%M %p %Z")
+            res = {'symbol': symbol, 'price': round(data['price'],2), 'changesPercentage': changes_percentage, 'time': formatted_date}
+            write_json(f"json/pre-post-quote/{symbol}.json", res)
     except Exception as e:
         pass
 
@@ -88,8 +87,7 @@ async def save_bid_ask_as_json(symbol, data):
         })
 
         # Save the updated quote data back to the same JSON file
-        with open(f"json/quote/{symbol}.json", 'w') as file:
-            file.write(orjson.dumps(quote_data).decode())
+        write_json(f"json/quote/{symbol}.json", quote_data)
     except Exception as e:
         print(f"An error occurred: {e}")  # Print the error for debugging
 
@@ -100,17 +98,14 @@ async def run():
     crypto_con = sqlite3.connect('crypto.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
     crypto_cursor = crypto_con.cursor()
-    crypto_cursor.execute("PRAGMA journal_mode = wal")
     crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
     crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
 
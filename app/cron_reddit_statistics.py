@@ -19,13 +19,11 @@ sia = SentimentIntensityAnalyzer()
 con = sqlite3.connect('stocks.db')
 
 cursor = con.cursor()
-cursor.execute("PRAGMA journal_mode = wal")
 cursor.execute("SELECT DISTINCT symbol FROM stocks")
 stock_symbols = [row[0] for row in cursor.fetchall()]
 
 etf_con = sqlite3.connect('etf.db')
 etf_cursor = etf_con.cursor()
-etf_cursor.execute("PRAGMA journal_mode = wal")
 etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
 etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
@@ -41,7 +41,6 @@ async def get_data(symbol):
 
 async def run():
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     total_symbols = [row[0] for row in cursor.fetchall()]
     #total_symbols = ['NVDA']  # For testing purposes
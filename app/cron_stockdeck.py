@@ -90,7 +90,6 @@ async def get_data(ticker):
 
 async def run():
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
     for ticker in tqdm(stocks_symbols):
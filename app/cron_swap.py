@@ -28,7 +28,6 @@ os.makedirs(COMPANIES_PATH, exist_ok=True)
 def get_stock_symbols():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap >= 1E9 AND symbol NOT LIKE '%.%'")
         total_symbols = [row[0] for row in cursor.fetchall()]
         return total_symbols
@@ -4,9 +4,10 @@ import aiohttp
 import sqlite3
 from datetime import datetime
 from rating import rating_model
-import pandas as pd
 from tqdm import tqdm
 
+from utils.price_store import read_prices
+
 async def save_ta_rating(symbol, data):
     with open(f"json/ta-rating/{symbol}.json", 'w') as file:
         ujson.dump(data, file)
@@ -21,17 +22,14 @@ async def run():
     crypto_con = sqlite3.connect('crypto.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
     crypto_cursor = crypto_con.cursor()
-    crypto_cursor.execute("PRAGMA journal_mode = wal")
     crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
     crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
 
@@ -47,16 +45,7 @@ async def run():
             elif symbol in stocks_symbols:
                 query_con = con
 
-            query_template = """
-                    SELECT
-                        date, open, high, low, close, volume
-                    FROM
-                        "{symbol}"
-                    WHERE
-                        date BETWEEN ? AND ?
-                """
-            query = query_template.format(symbol=symbol)
-            df = pd.read_sql_query(query,query_con, params=(start_date, end_date))
+            df = read_prices(query_con, symbol, start_date, end_date, columns=('date', 'open', 'high', 'low', 'close', 'volume'))
 
             try:
                 # Assuming rating_model and save_quote_as_json are defined elsewhere
@@ -7,6 +7,8 @@ import sqlite3
 import os
 from tqdm import tqdm
 
+from utils.price_matrix import PRICE_MATRICES, open_price_matrix
+
 async def save_json(symbol, data):
     os.makedirs("json/var", exist_ok=True)  # Ensure directory exists
     with open(f"json/var/{symbol}.json", 'w') as file:
@@ -58,43 +60,39 @@ async def run():
     crypto_con = sqlite3.connect('crypto.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     stocks_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
     crypto_cursor = crypto_con.cursor()
-    crypto_cursor.execute("PRAGMA journal_mode = wal")
     crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
     crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
 
     total_symbols = stocks_symbols + etf_symbols + crypto_symbols
 
+    matrices = {
+        'stocks': open_price_matrix(PRICE_MATRICES['stocks'], con),
+        'etf': open_price_matrix(PRICE_MATRICES['etf'], etf_con),
+        'crypto': open_price_matrix(PRICE_MATRICES['crypto'], crypto_con),
+    }
+
     for symbol in tqdm(total_symbols):
         try:
             if symbol in etf_symbols:  
-                query_con = etf_con
+                matrix = matrices['etf']
             elif symbol in crypto_symbols:  
-                query_con = crypto_con
+                matrix = matrices['crypto']
             elif symbol in stocks_symbols:  
-                query_con = con
+                matrix = matrices['stocks']
             else:
                 continue
 
-            query_template = """
-                    SELECT
-                        date, open, high, low, close, volume
-                    FROM
-                        "{symbol}"
-                    WHERE
-                        date BETWEEN ? AND ?
-                """
-            query = query_template.format(symbol=symbol)
-            df = pd.read_sql_query(query, query_con, params=(start_date, end_date))
+            # Same columns as the per-symbol table had (the matrix has no open), so
+            # compute_var's dropna() still skips days with gaps in any of them
+            df = matrix.frame(symbol, ('high', 'low', 'close', 'volume'), start_date, end_date)
 
             # Convert date to datetime
             df['date'] = pd.to_datetime(df['date'])
@@ -6,10 +6,9 @@ import logging
 from pathlib import Path
 from typing import Dict, Any
 from dotenv import load_dotenv
-from datetime import datetime, time
-import zoneinfo
 import aiofiles
-import functools
+
+from utils.trading_calendar import is_market_open
 
 # Use uvloop for faster event loop if available
 try:
@@ -27,16 +26,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Precompute holidays and use a set for faster lookups
-US_HOLIDAYS = {
-    "2024-01-01", "2024-01-15", "2024-02-19", 
-    "2024-03-29", "2024-05-27", "2024-06-19", 
-    "2024-07-04", "2024-09-02", "2024-11-28", 
-    "2024-12-25"
-}
-
-# Use functools.cache to memoize market hours check
-@functools.cache
 def check_market_hours() -> bool:
     """
     Check if the stock market is currently open.
@@ -44,20 +33,7 @@ def check_market_hours() -> bool:
     Returns:
         bool: True if market is open, False otherwise
     """
-    et_tz = zoneinfo.ZoneInfo('America/New_York')
-    now = datetime.now(et_tz)
-    
-    # Quick weekend check
-    if now.weekday() >= 5:
-        return False
-    
-    # Use set for faster holiday lookup
-    if now.strftime('%Y-%m-%d') in US_HOLIDAYS:
-        return False
-    
-    # Market hours check
-    current_time = now.time()
-    return time(9, 30) <= current_time < time(16, 0)
+    return is_market_open()
 
 class WebSocketStockTicker:
     def __init__(self, api_key: str, uri: str = "wss://websockets.financialmodelingprep.com"):
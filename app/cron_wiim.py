@@ -2,7 +2,6 @@ import aiohttp
 import aiofiles
 import ujson
 import sqlite3
-import pandas as pd
 import asyncio
 import pytz
 import time
@@ -12,6 +11,9 @@ from datetime import datetime, timedelta
 from tqdm import tqdm
 import pytz
 
+from utils.price_store import read_prices
+from utils.trading_calendar import previous_trading_day
+
 
 date_format = "%a, %d %b %Y %H:%M:%S %z"
 
@@ -22,44 +24,10 @@ headers = {"accept": "application/json"}
 
 N_weeks_ago = datetime.now(pytz.UTC) - timedelta(weeks=50)
 
-query_template = """
-    SELECT
-        close
-    FROM
-        "{symbol}"
-    WHERE
-        date BETWEEN ? AND ?
-"""
-
-# List of holidays when the stock market is closed
-holidays = ['2025-01-01', '2025-01-09','2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25']
-
-
-def is_holiday(date):
-    """Check if the given date is a holiday"""
-    str_date = date.strftime("%Y-%m-%d")
-    return str_date in holidays
-
 def correct_weekday(selected_date):
-    # Monday is 0 and Sunday is 6
-    if selected_date.weekday() == 0:
-        selected_date -= timedelta(3)
-    elif selected_date.weekday() <= 4:
-        selected_date -= timedelta(1)
-    elif selected_date.weekday() == 5:
-        selected_date -= timedelta(1)
-    elif selected_date.weekday() == 6:
-        selected_date -= timedelta(2)
-    
-    # Check if the selected date is a holiday and adjust if necessary
-    while is_holiday(selected_date):
-        selected_date -= timedelta(1)
-    
-    # Adjust again if the resulting date is a Saturday or Sunday
-    if selected_date.weekday() >= 5:
-        selected_date -= timedelta(selected_date.weekday() - 4)
-    
-    return selected_date
+    # Move back to the previous trading day, keeping the time of day
+    previous = previous_trading_day(selected_date.date())
+    return selected_date - timedelta(days=(selected_date.date() - previous).days)
 
 # Create a semaphore to limit concurrent requests
 REQUEST_LIMIT = 500
@@ -136,10 +104,8 @@ async def get_endpoint(session, symbol, con, semaphore):
                         end_date = date_obj.strftime("%Y-%m-%d")
                         new_date_str = date_obj_ny.strftime("%Y-%m-%d %H:%M:%S")
                         
-                        query = query_template.format(symbol=symbol)
-                        
                         try:
-                            df = pd.read_sql_query(query, con, params=(start_date, end_date))
+                            df = read_prices(con, symbol, start_date, end_date, columns='close')
                             if not df.empty:
                                 change_percent = round((df['close'].iloc[1] / df['close'].iloc[0] - 1) * 100, 2)
                             else:
@@ -171,14 +137,12 @@ async def run():
     con = sqlite3.connect('stocks.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
     stock_symbols = [row[0] for row in cursor.fetchall()]
 
     etf_con = sqlite3.connect('etf.db')
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
     
@@ -5,24 +5,21 @@ import gzip
 import re
 import os
 import secrets
-from benzinga import financial_data
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 # Third-party library imports
 import numpy as np
-import pandas as pd
 import orjson
 import aiohttp
 import aiofiles
 import redis
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-import requests
 from pathlib import Path
 import asyncio
 
 # Database related imports
 import sqlite3
-from contextlib import contextmanager
 from pocketbase import PocketBase
 
 # FastAPI and related imports
@@ -32,163 +29,67 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.security.api_key import APIKeyHeader
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from functools import partial
 from datetime import datetime
-from utils.helper import load_latest_json
+from utils.helper import latest_json_path, write_json
+from utils.file_cache import FileCache, FILE_ENDPOINTS, gzip_response
+from utils.cache_policy import ttl_for
+from utils.db_pool import ReadOnlyPool
+from utils.reference_data import invalidate_stale_keys
+from utils.reference_bundle import ReferenceReloader
+from utils.options_feed import OptionsFeed, CursorError, encode_cursor
+from utils.options_activity import OPTIONS_ACTIVITY_DB, META_QUERY, activity_query, covers, decode_rows, normalize_ticker
+from benzinga import financial_data
 import uvicorn
 
-# DB constants & context manager
+# DB constants
 
 STOCK_DB = 'stocks'
 ETF_DB = 'etf'
 CRYPTO_DB = 'crypto'
-INSTITUTE_DB = 'institute'
 
 OPTIONS_WATCHLIST_DIR = Path("json/options-historical-data/watchlist")
 
-# Prioritization strategy dictionary
-PRIORITY_STRATEGIES = {
-    'exact_symbol_match': 0,
-    'symbol_prefix_match': 1,
-    'exact_name_match': 2,
-    'name_prefix_match': 3,
-    'symbol_contains': 4,
-    'name_contains': 5
-}
-
-def calculate_score(item: Dict, search_query: str) -> int:
-    name_lower = item['name'].lower()
-    symbol_lower = item['symbol'].lower()
-    query_lower = search_query.lower()
-
-    if len(query_lower) == 1:
-        if symbol_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
-        elif name_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_name_match']
-        else:
-            base_score = len(PRIORITY_STRATEGIES)
-    else:
-        if symbol_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
-        elif symbol_lower.startswith(query_lower):
-            base_score = PRIORITY_STRATEGIES['symbol_prefix_match']
-        elif name_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_name_match']
-        elif name_lower.startswith(query_lower):
-            base_score = PRIORITY_STRATEGIES['name_prefix_match']
-        elif query_lower in symbol_lower:
-            base_score = PRIORITY_STRATEGIES['symbol_contains']
-        elif query_lower in name_lower:
-            base_score = PRIORITY_STRATEGIES['name_contains']
-        else:
-            base_score = len(PRIORITY_STRATEGIES)
-
-    dot_penalty = 1 if '.' in symbol_lower else 0
-    return base_score + dot_penalty
-
-
-@contextmanager
-def db_connection(db_name):
-  conn = sqlite3.connect(f'{db_name}.db')
-  cursor = conn.cursor()
-  cursor.execute("PRAGMA journal_mode = wal")
-  try:
-    yield cursor
-  finally:
-    conn.commit()
-    cursor.close()
-    conn.close()
-
 ################# Redis #################
-redis_client = redis.Redis(host='redis', port=6379, db=0)
-redis_client.flushdb() # TECH DEBT
+# One asyncio pool shared by every handler so cache lookups never block the event loop
+redis_pool = aioredis.ConnectionPool(
+    host='redis',
+    port=6379,
+    db=0,
+    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)),
+    socket_timeout=5,
+    socket_connect_timeout=2,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+file_cache = FileCache(redis_client)
+options_feed = OptionsFeed("json/options-flow/feed/data.json")
 caching_time = 3600*12 #Cache data for 12 hours
 
 #########################################
 
-#------Start Stocks DB------------#
-with db_connection(STOCK_DB) as cursor:
-  cursor.execute("SELECT DISTINCT symbol FROM stocks")
-  symbols = [row[0] for row in cursor.fetchall()]
-
-  cursor.execute("SELECT symbol, name, type, marketCap FROM stocks")
-  raw_data = cursor.fetchall()
-  stock_list_data = [{
-    'symbol': row[0],
-    'name': row[1],
-    'type': row[2].capitalize(),
-    'marketCap': row[3],
-  } for row in raw_data if row[3] is not None]
-#------End Stocks DB------------#
-
-#------Start ETF DB------------#
-with db_connection(ETF_DB) as cursor:
-  cursor.execute("SELECT DISTINCT symbol FROM etfs")
-  etf_symbols = [row[0] for row in cursor.fetchall()]
-
-  cursor.execute("SELECT symbol, name, type FROM etfs")
-  raw_data = cursor.fetchall()
-  etf_list_data = [{
-    'symbol': row[0],
-    'name': row[1],
-    'type': row[2].upper(),
-  } for row in raw_data]
-#------End ETF DB------------#
-
-#------Start Crypto DB------------#
-with db_connection(CRYPTO_DB) as cursor:
-  cursor.execute("SELECT DISTINCT symbol FROM cryptos")
-  crypto_symbols = [row[0] for row in cursor.fetchall()]
-
-  cursor.execute("SELECT symbol, name, type FROM cryptos")
-  raw_data = cursor.fetchall()
-  crypto_list_data = [{
-    'symbol': row[0],
-    'name': row[1],
-    'type': row[2].capitalize(),
-  } for row in raw_data]
-#------End Crypto DB------------#
-
-#------Start Institute DB------------#
-with db_connection(INSTITUTE_DB) as cursor:
-  cursor.execute("SELECT cik FROM institutes")
-  cik_list = [row[0] for row in cursor.fetchall()]
-#------End Institute DB------------#
-
-#------Start Stock Screener--------#
-with open(f"json/stock-screener/data.json", 'rb') as file:
-    stock_screener_data = orjson.loads(file.read())
-
-# Convert stock_screener_data into a dictionary keyed by symbol
-stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data}
-#------End Stock Screener--------#
-
-#------Init Searchbar Data------------#
-searchbar_data = stock_list_data + etf_list_data
-
-for item in searchbar_data:
-    try:
-        # Look up the symbol in the stock_screener_data_dict
-        symbol = item['symbol']
-        item['isin'] = stock_screener_data_dict[symbol]['isin']
-    except Exception as e:
-        item['isin'] = None
-
+#------Start Reference Data------------#
+# Symbol sets, search index and screener data. Rebuilt in the background when
+# restart_json.py writes new files, so picking them up needs no restart.
+def invalidate_legacy_cache(bundle):
+    invalidate_stale_keys(redis.Redis(host='redis', port=6379, db=0), bundle.snapshot_version)
 
-etf_set, crypto_set = set(etf_symbols), set(crypto_symbols)
+reference = ReferenceReloader(on_reload=invalidate_legacy_cache)
+invalidate_legacy_cache(reference.current)
+#------End Reference Data------------#
 
 
-### TECH DEBT ###
-con = sqlite3.connect('stocks.db')
-etf_con = sqlite3.connect('etf.db')
-crypto_con = sqlite3.connect('crypto.db')
-con_inst = sqlite3.connect('institute.db')
+# Read-only connections for the handlers, queried off the event loop
+stock_db = ReadOnlyPool(f'{STOCK_DB}.db')
+etf_db = ReadOnlyPool(f'{ETF_DB}.db')
+crypto_db = ReadOnlyPool(f'{CRYPTO_DB}.db')
+options_activity_db = ReadOnlyPool(OPTIONS_ACTIVITY_DB)
 
 load_dotenv()
 
@@ -196,6 +97,7 @@ pb = PocketBase('http://127.0.0.1:8090')
 
 FMP_API_KEY = os.getenv('FMP_API_KEY')
 Benzinga_API_KEY = os.getenv('BENZINGA_API_KEY')
+# Per-ticker options activity the local store doesn't cover
 fin = financial_data.Benzinga(Benzinga_API_KEY)
 
 app = FastAPI(docs_url=None, redoc_url=None, openapi_url = None)
@@ -244,6 +146,37 @@ DEFAULT_UVICORN_BASE_URL = '0.0.0.0'
 DEFAULT_UVICORN_PORT = 8000
 
 
+@app.on_event("shutdown")
+async def close_redis_pool():
+    await redis_pool.disconnect()
+
+
+@app.on_event("startup")
+async def start_reference_reloader():
+    reference.start()
+
+
+@app.on_event("startup")
+async def start_file_change_listener():
+    file_cache.start_listening()
+
+
+@app.on_event("shutdown")
+async def stop_file_change_listener():
+    await file_cache.stop_listening()
+
+
+@app.on_event("shutdown")
+async def stop_reference_reloader():
+    await reference.stop()
+
+
+@app.on_event("shutdown")
+async def close_db_pools():
+    for pool in (stock_db, etf_db, crypto_db, options_activity_db):
+        pool.close()
+
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
@@ -373,6 +306,21 @@ class HeatMapData(BaseModel):
 class StockScreenerData(BaseModel):
     ruleOfList: List[str]
 
+class ScreenerFilter(BaseModel):
+    name: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+    value: Optional[str] = None
+    values: Optional[List[str]] = None
+
+class StockScreenerQuery(BaseModel):
+    filters: List[ScreenerFilter] = []
+    ruleOfList: List[str] = []
+    sortBy: str = 'marketCap'
+    sortOrder: str = 'desc'
+    limit: int = Field(default=100, ge=1, le=1000)
+    offset: int = Field(default=0, ge=0)
+
 class IndicatorListData(BaseModel):
     ruleOfList: list
     tickerList: list
@@ -386,6 +334,23 @@ class InfoText(BaseModel):
 class HistoricalDate(BaseModel):
     date: str
 
+class OptionsFlowFeedQuery(BaseModel):
+    # Clients of the original endpoint send only lastId ('' for the first page)
+    lastId: Optional[str] = None
+    cursor: str = ''
+    limit: int = Field(default=100, ge=1, le=500)
+    ticker: str = ''
+    putCall: str = ''
+    sentiment: str = ''
+    minPremium: float = 0
+
+class BatchItem(BaseModel):
+    endpoint: str
+    params: Dict[str, str] = {}
+
+class BatchData(BaseModel):
+    requests: List[BatchItem]
+
 class OptionsWatchList(BaseModel):
     optionsIdList: list
 
@@ -410,7 +375,7 @@ def load_json(file_path):
 
 async def load_json_async(file_path):
     # Check if the data is cached in Redis
-    cached_data = redis_client.get(file_path)
+    cached_data = await redis_client.get(file_path)
     if cached_data:
         return orjson.loads(cached_data)
 
@@ -418,7 +383,7 @@ async def load_json_async(file_path):
         with open(file_path, 'r') as f:
             data = orjson.loads(f.read())
             # Cache the data in Redis for 10 minutes
-            redis_client.set(file_path, orjson.dumps(data), ex=600)
+            await redis_client.set(file_path, orjson.dumps(data), ex=600)
             return data
     except Exception:
         return None
@@ -431,176 +396,57 @@ async def hello_world():
 
 
 @app.post("/correlation-ticker")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"correlation-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/correlation/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to 12 hour
-
-    return res
+    return await file_cache.response("correlation-ticker", request, ticker=ticker)
 
 
 
 @app.post("/stock-rating")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"stock-rating-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/ta-rating/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("stock-rating", request, ticker=ticker)
 
 @app.post("/historical-price")
-async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key)):
+async def get_stock(data: HistoricalPrice, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     time_period = data.timePeriod
-
-    cache_key = f"historical-price-{ticker}-{time_period}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/historical-price/{time_period}/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("historical-price", request, time_period=time_period, ticker=ticker)
     
 @app.post("/export-price-data")
-async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key)):
+async def get_stock(data: HistoricalPrice, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     time_period = data.timePeriod
-    cache_key = f"export-price-data-{ticker}-{time_period}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
     if time_period == 'max':
-        try:
-            with open(f"json/historical-price/max/{ticker}.json", 'rb') as file:
-                res = orjson.loads(file.read())
-        except:
-            res = []
-    else:
-        try:
-            with open(f"json/export/price/{time_period}/{ticker}.json", 'rb') as file:
-                res = orjson.loads(file.read())
-        except:
-            res = []
-
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+        return await file_cache.response("historical-price", request, time_period=time_period, ticker=ticker)
+    return await file_cache.response("export-price-data", request, time_period=time_period, ticker=ticker)
 
 @app.post("/one-day-price")
-async def get_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-    cache_key = f"one-day-price-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/one-day-price/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*3)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("one-day-price", request, ticker=ticker)
 
 
 @app.post("/hover-stock-chart")
-async def get_hover_stock_chart(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_hover_stock_chart(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-    cache_key = f"hover-stock-chart-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+    paths = {'quote': f"json/quote/{ticker}.json", 'history': f"json/one-day-price/{ticker}.json"}
 
-    try:
-        with open(f"json/one-day-price/{ticker}.json", 'rb') as file:
-            price_data = orjson.loads(file.read())
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            quote_data = orjson.loads(file.read())
-        res = {**quote_data, 'history': price_data}
-    except:
-        res = {}
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*3)
+    def build():
+        try:
+            with open(paths['history'], 'rb') as file:
+                price_data = orjson.loads(file.read())
+            with open(paths['quote'], 'rb') as file:
+                quote_data = orjson.loads(file.read())
+            res = {**quote_data, 'history': price_data}
+        except:
+            res = {}
+        return gzip.compress(orjson.dumps(res))
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.cached_response(request, f"hover-stock-chart-{ticker}", file_cache.stat(paths), build, ttl_for('intraday'), paths)
 
 
 
@@ -613,21 +459,9 @@ def shuffle_list(lst):
 
 
 @app.post("/similar-stocks")
-async def similar_stocks(data: TickerData, api_key: str = Security(get_api_key)):
+async def similar_stocks(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"similar-stocks-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/similar-stocks/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("similar-stocks", request, ticker=ticker)
 
 
 @app.post("/similar-etfs")
@@ -635,7 +469,7 @@ async def get_similar_etfs(data: TickerData, api_key: str = Security(get_api_key
     ticker = data.ticker.upper()
 
     cache_key = f"similar-etfs-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -652,9 +486,7 @@ async def get_similar_etfs(data: TickerData, api_key: str = Security(get_api_key
             LIMIT 15
         """
 
-        etf_cursor = etf_con.cursor()
-        etf_cursor.execute(query, (ticker, ticker, ticker))
-        raw_data = etf_cursor.fetchall()
+        raw_data = await etf_db.fetchall(query, (ticker, ticker, ticker))
 
         result = [
             {"symbol": row[0], "name": row[1], "totalAssets": row[2], "numberOfHoldings": row[3]}
@@ -665,206 +497,54 @@ async def get_similar_etfs(data: TickerData, api_key: str = Security(get_api_key
             result = random.sample(result, k=5)
 
         result.sort(key=lambda x: x["totalAssets"], reverse=True)  # Sort the list in-place
-
-        etf_cursor.close()  # Close the cursor after executing the query
     except:
         result = []
 
-    redis_client.set(cache_key, orjson.dumps(result))
-    redis_client.expire(cache_key, 3600*3600)
+    await redis_client.set(cache_key, orjson.dumps(result), ex=ttl_for('static'))
     return result
 
 
 @app.post("/market-movers")
-async def get_market_movers(data: GeneralData, api_key: str = Security(get_api_key)):
+async def get_market_movers(data: GeneralData, request: Request, api_key: str = Security(get_api_key)):
     params = data.params
-    cache_key = f"market-movers-{params}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/market-movers/markethours/{params}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 5*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("market-movers", request, params=params)
 
 @app.get("/mini-plots-index")
-async def get_market_movers(api_key: str = Security(get_api_key)):
-    cache_key = f"get-mini-plots-index"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/mini-plots-index/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 5*60)
-
-    return res
+async def get_market_movers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("mini-plots-index", request)
 
 
 
 @app.post("/market-news")
-async def get_market_news(data: MarketNews, api_key: str = Security(get_api_key)):
+async def get_market_news(data: MarketNews, request: Request, api_key: str = Security(get_api_key)):
     news_type = data.newsType
-
-    cache_key = f"market-news-{news_type}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/market-news/{news_type}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 15 min
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("market-news", request, news_type=news_type)
 
 
 @app.post("/stock-news")
-async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_news(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"stock-news-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-
-    try:
-        with open(f"json/market-news/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*30)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("stock-news", request, ticker=ticker)
 
 
 @app.post("/stock-press-release")
-async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_news(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"press-releases-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-
-    try:
-        with open(f"json/market-news/press-releases/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("stock-press-release", request, ticker=ticker)
 
 
 
 @app.post("/stock-dividend")
-async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_dividend(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"stock-dividend-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/dividends/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {'history': []}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("stock-dividend", request, ticker=ticker)
 
 
 
 @app.post("/stock-quote")
-async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_dividend(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"stock-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)
-    return res
+    return await file_cache.response("stock-quote", request, ticker=ticker)
 
 @app.post("/history-employees")
 async def history_employees(data: TickerData, api_key: str = Security(get_api_key)):
@@ -872,7 +552,7 @@ async def history_employees(data: TickerData, api_key: str = Security(get_api_ke
     ticker = data['ticker'].upper()
 
     cache_key = f"history-employees-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -885,367 +565,79 @@ async def history_employees(data: TickerData, api_key: str = Security(get_api_ke
         symbol = ?
     """
 
-    df = pd.read_sql_query(query_template,con, params=(ticker,))
+    row = await stock_db.fetchone(query_template, (ticker,))
     try:
-        history_employee_count = orjson.loads(df['history_employee_count'].iloc[0])
+        history_employee_count = orjson.loads(row[0])
         res = sorted([entry for entry in history_employee_count if entry["employeeCount"] != 0], key=lambda x: x["filingDate"])
     except:
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600) # Set cache expiration time to 1 hour
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('static'))
     return res
 
 @app.post("/stock-income")
-async def stock_income(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_income(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
+    return await file_cache.response("stock-income", request, ticker=ticker)
 
-    cache_key = f"stock-income-{ticker}"
-    cached_result = redis_client.get(cache_key)
-
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/financial-statements/income-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
-    except:
-        quarter_res = []
-
-    try:
-        with open(f"json/financial-statements/income-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
-    except:
-        annual_res = []
-
-    res = {'quarter': quarter_res, 'annual': annual_res}
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.post("/stock-balance-sheet")
-async def stock_balance_sheet(data: TickerData, api_key: str = Security(get_api_key)):
-    data = data.dict()
-    ticker = data['ticker'].upper()
-
-    cache_key = f"stock-balance-sheet-{ticker}"
-    cached_result = redis_client.get(cache_key)
-
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/financial-statements/balance-sheet-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
-    except:
-        quarter_res = []
-
-    try:
-        with open(f"json/financial-statements/balance-sheet-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
-    except:
-        annual_res = []
-
-    res = {'quarter': quarter_res, 'annual': annual_res}
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    ) 
+@app.post("/stock-balance-sheet")
+async def stock_balance_sheet(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    data = data.dict()
+    ticker = data['ticker'].upper()
+    return await file_cache.response("stock-balance-sheet", request, ticker=ticker)
 
 @app.post("/stock-ratios")
-async def stock_ratios(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_ratios(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"stock-ratios-{ticker}"
-    cached_result = redis_client.get(cache_key)
-
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/financial-statements/ratios/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
-    except:
-        quarter_res = []
-
-    try:
-        with open(f"json/financial-statements/ratios/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
-    except:
-        annual_res = []
-
-    res = {'quarter': quarter_res, 'annual': annual_res}
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    ) 
+    return await file_cache.response("stock-ratios", request, ticker=ticker)
 
 
 @app.post("/stock-cash-flow")
-async def stock_cash_flow(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_cash_flow(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"stock-cash-flow-{ticker}"
-    cached_result = redis_client.get(cache_key)
-
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/financial-statements/cash-flow-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
-    except:
-        quarter_res = []
-
-    try:
-        with open(f"json/financial-statements/cash-flow-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
-    except:
-        annual_res = []
-
-    res = {'quarter': quarter_res, 'annual': annual_res}
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    ) 
+    return await file_cache.response("stock-cash-flow", request, ticker=ticker)
 
 
 
 
 @app.get("/economic-calendar")
-async def economic_calendar(api_key: str = Security(get_api_key)):
-
-    cache_key = f"economic-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/economic-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def economic_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("economic-calendar", request)
 
 
 @app.get("/earnings-calendar")
-async def earnings_calendar(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"earnings-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def earnings_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("earnings-calendar", request)
 
 
 @app.get("/dividends-calendar")
-async def dividends_calendar(api_key: str = Security(get_api_key)):
-
-    cache_key = f"dividends-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/dividends-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def dividends_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("dividends-calendar", request)
 
 @app.get("/stock-splits-calendar")
-async def stock_splits_calendar(api_key: str = Security(get_api_key)):
-    cache_key = f"stock-splits-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/stock-splits-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def stock_splits_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("stock-splits-calendar", request)
 
 
 
 @app.post("/stockdeck")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"stockdeck-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/stockdeck/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("stockdeck", request, ticker=ticker)
 
 
 @app.post("/analyst-summary-rating")
-async def get_analyst_rating(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_analyst_rating(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"analyst-summary-rating-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/analyst/summary/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("analyst-summary-rating", request, ticker=ticker)
 
 @app.post("/analyst-ticker-history")
-async def get_analyst_ticke_history(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_analyst_ticke_history(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"analyst-ticker-history-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/analyst/history/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("analyst-ticker-history", request, ticker=ticker)
 
 
 @app.post("/indicator-data")
@@ -1258,6 +650,7 @@ async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api
         rule_of_list.append('name')
     
     ticker_list = [t.upper() for t in data.tickerList if t is not None]
+    ref = reference.current
 
     combined_results = []
     
@@ -1269,8 +662,8 @@ async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api
     for ticker, quote in quote_dict.items():
         # Determine the ticker type based on the sets
         ticker_type = (
-            'etf' if ticker in etf_set else 
-            'crypto' if ticker in crypto_set else 
+            'etf' if ticker in ref.etf_set else 
+            'crypto' if ticker in ref.crypto_set else 
             'stock'
         )
 
@@ -1283,7 +676,7 @@ async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api
     # Fetch and merge data from stock_screener_data, but exclude price, volume, and changesPercentage
     screener_keys = [key for key in rule_of_list if key not in ['volume', 'marketCap', 'changesPercentage', 'price', 'symbol', 'name']]
     if screener_keys:
-        screener_dict = {item['symbol']: {k: v for k, v in item.items() if k in screener_keys} for item in stock_screener_data}
+        screener_dict = ref.screener_store.project([result.get('symbol') for result in combined_results], screener_keys)
         for result in combined_results:
             symbol = result.get('symbol')
             if symbol in screener_dict:
@@ -1379,14 +772,9 @@ async def get_watchlist(data: GetWatchList, api_key: str = Security(get_api_key)
         ['symbol', 'name']
     ))
 
-    # Prepare screener dictionary with efficient lookup
-    screener_dict = {
-        item['symbol']: {
-            key: item.get(key) 
-            for key in rule_of_list if key in item
-        }
-        for item in stock_screener_data
-    }
+    # Only the watchlist rows and requested columns of the screener data
+    ref = reference.current
+    screener_dict = ref.screener_store.project([ticker.upper() for ticker in ticker_list], rule_of_list)
 
     # Use concurrent processing with more efficient method
     results_and_extras = await asyncio.gather(
@@ -1396,8 +784,8 @@ async def get_watchlist(data: GetWatchList, api_key: str = Security(get_api_key)
                 rule_of_list, 
                 quote_keys_to_include, 
                 screener_dict,
-                etf_set,  # Assuming these are pre-computed sets
-                crypto_set
+                ref.etf_set,
+                ref.crypto_set
             ) 
             for ticker in ticker_list
         ]
@@ -1542,15 +930,37 @@ def process_option_activity(item):
     item['tradeCount'] = item.get('trade_count', 0)
     return item
 
+# Shared upstream session: pooled connections, bounded concurrency, and one
+# in-flight request per option id no matter how many users ask for it
+BENZINGA_CONCURRENCY = int(os.getenv('BENZINGA_CONCURRENCY', 10))
+benzinga_semaphore = asyncio.Semaphore(BENZINGA_CONCURRENCY)
+benzinga_inflight = {}
+http_session = None
+
+def get_http_session():
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=BENZINGA_CONCURRENCY * 2, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10, connect=3),
+        )
+    return http_session
+
+@app.on_event("shutdown")
+async def close_http_session():
+    if http_session is not None:
+        await http_session.close()
+
 async def fetch_option_data(option_id: str):
     url = "https://api.benzinga.com/api/v1/signal/option_activity"
     headers = {"accept": "application/json"}
     querystring = {"token": Benzinga_API_KEY, "parameters[id]": option_id}
     
     try:
-        response = requests.get(url, headers=headers, params=querystring)
-        response.raise_for_status()
-        data = orjson.loads(response.text)
+        async with benzinga_semaphore:
+            async with get_http_session().get(url, headers=headers, params=querystring) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
         option_activity = data.get('option_activity', [])
         
         if isinstance(option_activity, list):
@@ -1562,11 +972,38 @@ async def fetch_option_data(option_id: str):
         print(f"Error fetching data for {option_id}: {e}")
         return []
 
+async def fetch_and_store_option_data(option_id: str):
+    option_activity = await fetch_option_data(option_id)
+    if option_activity:
+        file_path = OPTIONS_WATCHLIST_DIR / f"{option_id}.json"
+        await asyncio.to_thread(write_json, str(file_path), option_activity, False)
+    return option_activity
+
+def read_option_data(option_id: str):
+    try:
+        with open(OPTIONS_WATCHLIST_DIR / f"{option_id}.json", 'rb') as json_file:
+            return orjson.loads(json_file.read())
+    except FileNotFoundError:
+        return None
+
+async def get_option_data(option_id: str):
+    option_data = await asyncio.to_thread(read_option_data, option_id)
+    if option_data is not None:
+        return option_data
+
+    task = benzinga_inflight.get(option_id)
+    if task is None:
+        task = asyncio.ensure_future(fetch_and_store_option_data(option_id))
+        benzinga_inflight[option_id] = task
+        task.add_done_callback(lambda _: benzinga_inflight.pop(option_id, None))
+    # Shielded so one client disconnecting doesn't cancel the fetch for everyone else
+    return await asyncio.shield(task)
+
 @app.post("/get-options-watchlist")
 async def get_options_watchlist(data: OptionsWatchList, api_key: str = Security(get_api_key)):
     options_list_id = sorted(data.optionsIdList)
     cache_key = f"options-watchlist-{options_list_id}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1574,25 +1011,11 @@ async def get_options_watchlist(data: OptionsWatchList, api_key: str = Security(
             headers={"Content-Encoding": "gzip"}
         )
 
-    result = []
-
-    for option_id in options_list_id:
-        file_path = OPTIONS_WATCHLIST_DIR / f"{option_id}.json"
-        
-        if file_path.exists():
-            with open(file_path, 'rb') as json_file:
-                option_data = orjson.loads(json_file.read())
-                result.extend(option_data)
-        else:
-            option_activity = await fetch_option_data(option_id)
-            if option_activity:
-                with open(file_path, 'wb') as file:
-                    file.write(orjson.dumps(option_activity))
-                result.extend(option_activity)
+    option_data = await asyncio.gather(*[get_option_data(option_id) for option_id in options_list_id])
+    result = [item for items in option_data if items for item in items]
 
     compressed_data = gzip.compress(orjson.dumps(result))
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60 * 30)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, compressed_data, ex=60 * 30)  # Set cache expiration time to 1 day
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1608,11 +1031,11 @@ async def brownian_motion(data:TickerData, api_key: str = Security(get_api_key))
     ticker = data['ticker'].upper()
 
     cache_key = f"price-prediction-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
     
-    if ticker in etf_symbols:
+    if ticker in reference.current.etf_set:
         table_name = 'etfs'
     else:
         table_name = 'stocks'
@@ -1626,15 +1049,13 @@ async def brownian_motion(data:TickerData, api_key: str = Security(get_api_key))
         symbol = ?
     """
 
-    df = pd.read_sql_query(query, etf_con if table_name == 'etfs' else con, params=(ticker,))
-    df_dict = df.to_dict()
+    row = await (etf_db if table_name == 'etfs' else stock_db).fetchone(query, (ticker,))
     try:
-        price_dict = orjson.loads(df_dict['pricePrediction'][0])
+        price_dict = orjson.loads(row[0])
     except:
         price_dict = {'1W': {'min': 0, 'mean': 0, 'max': 0}, '1M': {'min': 0, 'mean': 0, 'max': 0}, '3M': {'min': 0, 'mean': 0, 'max': 0}, '6M': {'min': 0, 'mean': 0, 'max': 0}}
 
-    redis_client.set(cache_key, orjson.dumps(price_dict))
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to 1 hour
+    await redis_client.set(cache_key, orjson.dumps(price_dict), ex=ttl_for('daily'))
     return price_dict
 
 
@@ -1642,9 +1063,10 @@ async def brownian_motion(data:TickerData, api_key: str = Security(get_api_key))
 @app.post("/stock-screener-data")
 async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_key)):
     rule_of_list = sorted(data.ruleOfList)
+    ref = reference.current
 
-    cache_key = f"stock-screener-data-{rule_of_list}"
-    cached_result = redis_client.get(cache_key)
+    cache_key = f"stock-screener-data-{ref.version}-{rule_of_list}"
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1655,19 +1077,15 @@ async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_k
     always_include = ['symbol', 'marketCap', 'price', 'changesPercentage', 'name','volume','pe']
 
     try:
-        filtered_data = [
-            {key: item.get(key) for key in set(always_include + rule_of_list) if key in item}
-            for item in stock_screener_data
-        ]
+        # Decoding the whole universe takes a while, keep it off the event loop
+        filtered_data = await asyncio.to_thread(ref.screener_store.rows, set(always_include + rule_of_list))
     except Exception as e:
         filtered_data = []
 
     # Compress the JSON data
-    res = orjson.dumps(filtered_data)
-    compressed_data = gzip.compress(res)
+    compressed_data = await asyncio.to_thread(lambda: gzip.compress(orjson.dumps(filtered_data)))
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, compressed_data, ex=ttl_for('daily'))
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1676,24 +1094,43 @@ async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_k
     )
 
 
+@app.post("/stock-screener-query")
+async def stock_screener_query(data: StockScreenerQuery, api_key: str = Security(get_api_key)):
+    try:
+        total, rows = reference.current.screener_store.query(
+            filters=[item.dict() for item in data.filters],
+            sort_by=data.sortBy,
+            ascending=data.sortOrder == 'asc',
+            limit=data.limit,
+            offset=data.offset,
+            columns=data.ruleOfList,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    res = {'total': total, 'offset': data.offset, 'data': rows}
+    return Response(content=orjson.dumps(res), media_type="application/json")
+
+
 @app.post("/get-quant-stats")
 async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
     cache_key = f"get-quant-stats-{ticker}"
     
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
-    if ticker in etf_symbols:
+    ref = reference.current
+    if ticker in ref.etf_set:
         table_name = 'etfs'
-        query_con = etf_con
-    elif ticker in crypto_symbols:
+        query_db = etf_db
+    elif ticker in ref.crypto_set:
         table_name = 'cryptos'
-        query_con = crypto_con
+        query_db = crypto_db
     else:
         table_name = 'stocks'
-        query_con = con
+        query_db = stock_db
     # If the hash doesn't exist or doesn't match, fetch data from the database
     query_metrics_template = f"""
         SELECT
@@ -1704,17 +1141,14 @@ async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)
             symbol = ?
     """
 
-    metrics_data = pd.read_sql_query(query_metrics_template, query_con, params=(ticker,))
+    row = await query_db.fetchone(query_metrics_template, (ticker,))
     
     try:
-        #metrics_data = orjson.loads(metrics_data.to_dict()['quantStats'][0])
-        metrics_data = metrics_data.to_dict()['quantStats'][0]
-        metrics_data = eval(metrics_data)
+        metrics_data = eval(row[0])
     except:
         metrics_data = {}
     # Store the data and hash in the cache
-    redis_client.set(cache_key, orjson.dumps(metrics_data))
-    redis_client.expire(cache_key, 3600 *24) # Set cache expiration time to 1 hour
+    await redis_client.set(cache_key, orjson.dumps(metrics_data), ex=ttl_for('daily'))
 
     return metrics_data
 
@@ -1723,24 +1157,9 @@ async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)
 
 
 @app.post("/congress-trading-ticker")
-async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_fair_price(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-congress-trading-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/congress-trading/company/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 15*60) # Set cache expiration time to Infinity
-
-    return res
+    return await file_cache.response("congress-trading-ticker", request, ticker=ticker)
 
 
 
@@ -1751,7 +1170,7 @@ async def get_shareholders(data: TickerData, api_key: str = Security(get_api_key
     ticker = data['ticker'].upper()
 
     cache_key = f"shareholders-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -1772,114 +1191,96 @@ async def get_shareholders(data: TickerData, api_key: str = Security(get_api_key
     except:
         res = {}
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('daily'))
     return res
 
 
 @app.post("/cik-data")
-async def get_hedge_funds_data(data: GetCIKData, api_key: str = Security(get_api_key)):
+async def get_hedge_funds_data(data: GetCIKData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     cik = data['cik']
-
-    cache_key = f"{cik}-hedge-funds"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    
-    try:
-        with open(f"json/hedge-funds/companies/{cik}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("cik-data", request, cik=cik)
 
 
 @app.get("/all-hedge-funds")
-async def get_all_hedge_funds_data(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"all-hedge-funds"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+async def get_all_hedge_funds_data(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("all-hedge-funds", request)
+
+BATCH_MAX_REQUESTS = 50
+# Template field of FILE_ENDPOINTS -> (body field of the endpoint's own route,
+# the normalization that route applies), so batch items take the public params
+BATCH_FIELDS = {
+    'ticker': ('ticker', str.upper),
+    'time_period': ('timePeriod', str),
+    'params': ('params', str),
+    'category': ('category', str),
+    'news_type': ('newsType', str),
+    'cik': ('cik', str),
+    'sector': ('filterList', str),
+    'filter_list': ('filterList', str.lower),
+    'category_type': ('filterList', lambda value: list_category_type(value.lower())),
+    'etf_provider': ('etfProvider', str.lower),
+    'contract_id': ('params', str),
+    'selected_date': ('date', str),
+    'analyst_id': ('analystId', str),
+    'politician_id': ('politicianId', str.lower),
+}
 
-    try:
-        with open(f"json/hedge-funds/all-hedge-funds.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+def batch_request(item):
+    """(endpoint, template params) of a batch item, resolved like its single route does."""
+    endpoint, params = item.endpoint, item.params
+    if endpoint == 'export-price-data' and params.get('timePeriod') == 'max':
+        # /export-price-data serves the max history from the historical price files
+        endpoint = 'historical-price'
+    fields = {}
+    for field in file_cache.fields[endpoint]:
+        name, normalize = BATCH_FIELDS[field]
+        if name not in params:
+            raise HTTPException(status_code=400, detail=f"Missing parameter for {item.endpoint}: {name}")
+        fields[field] = normalize(params[name])
+    return endpoint, fields
+
+@app.post("/batch")
+async def get_batch(data: BatchData, api_key: str = Security(get_api_key)):
+    """
+    Several file backed lookups in one round trip, e.g. everything a stock page
+    needs. Takes [{"endpoint": "historical-price", "params": {"ticker": "AAPL", "timePeriod": "max"}}, ...]
+    with the endpoint names of FILE_ENDPOINTS and the body fields of their own
+    routes (params they don't use are ignored), and returns a JSON array of the
+    results in the same order.
+    """
+    if len(data.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_REQUESTS} requests per batch")
 
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
+    requests = []
+    for item in data.requests:
+        if item.endpoint not in FILE_ENDPOINTS:
+            raise HTTPException(status_code=400, detail=f"Unknown endpoint: {item.endpoint}")
+        requests.append(batch_request(item))
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
+    compressed_data = await file_cache.batch(requests)
+    return gzip_response(compressed_data)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
 @app.get("/searchbar")
 async def get_stock(
     query: str = Query(""),
     api_key: str = Security(lambda: None)  # Replace with your actual security function
-) -> JSONResponse:
-
-    if not query:
-        return JSONResponse(content=[])
-
-    # Check for exact ISIN match first
-    exact_match = next((item for item in searchbar_data if item.get("isin",None) == query), None)
-    if exact_match:
-        return JSONResponse(content=[exact_match])
-
-    # Precompile case-insensitive regex for faster matching
-    search_pattern = re.compile(re.escape(query.lower()), re.IGNORECASE)
-
-    # Filter items based on the search pattern (ignore items where neither name nor symbol match)
-    filtered_data = [
-        item for item in searchbar_data
-        if search_pattern.search(item['name']) or search_pattern.search(item['symbol'])
-    ]
-
-    # Sort by the calculated score, giving exact symbol matches the highest priority,
-    # and then by descending marketCap for other matches
-    results = sorted(
-        filtered_data,
-        key=lambda item: (
-            calculate_score(item, query),
-            0 if item.get('marketCap') is None else -item['marketCap']
-        )
-    )[:5]
-    return JSONResponse(content=orjson.loads(orjson.dumps(results)))
+) -> Response:
+    search_index = reference.current.search_index
+    results = search_index.search(query, limit=5)
+    if not results:
+        # Nothing matched as typed, try again allowing for typos
+        results = search_index.fuzzy_search(query, limit=5)
+    return Response(content=orjson.dumps(results), media_type="application/json")
 
 
 @app.get("/full-searchbar")
 async def get_data(api_key: str = Security(get_api_key)):
     
-    cache_key = f"full-searchbar"
-    cached_result = redis_client.get(cache_key)
+    ref = reference.current
+    cache_key = f"full-searchbar-{ref.version}"
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1888,11 +1289,10 @@ async def get_data(api_key: str = Security(get_api_key)):
         )
 
 
-    res = orjson.dumps(searchbar_data)
+    res = orjson.dumps(ref.searchbar_data)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
+    await redis_client.set(cache_key, compressed_data, ex=ttl_for('static'))
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1907,7 +1307,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
     ticker = data['ticker'].upper()
 
     cache_key = f"revenue-segmentation-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         #redis_client.expire(cache_key, caching_time) 
         return orjson.loads(cached_result)
@@ -1922,10 +1322,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
             symbol = ?
     """
 
-    query = query_template.format(ticker=ticker)
-    cur = con.cursor()
-    cur.execute(query, (ticker,))
-    result = cur.fetchone()  # Get the first row
+    result = await stock_db.fetchone(query_template, (ticker,))
 
     if result is not None:
         product_list = orjson.loads(result[0])
@@ -1936,8 +1333,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
 
     res_list = [product_list, geographic_list]
 
-    redis_client.set(cache_key, orjson.dumps(res_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await redis_client.set(cache_key, orjson.dumps(res_list), ex=ttl_for('daily'))
 
     return res_list
 
@@ -1947,7 +1343,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
 async def get_crypto_profile(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     cache_key = f"crypto-profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -1959,10 +1355,7 @@ async def get_crypto_profile(data: TickerData, api_key: str = Security(get_api_k
         WHERE
             symbol = ?
     """
-    query = query_template.format(ticker=ticker)
-    cur = crypto_con.cursor()
-    cur.execute(query, (ticker,))
-    result = cur.fetchone()  # Get the first row
+    result = await crypto_db.fetchone(query_template, (ticker,))
     profile_list = []
 
     try:
@@ -1971,8 +1364,7 @@ async def get_crypto_profile(data: TickerData, api_key: str = Security(get_api_k
     except:
         profile_list = []
 
-    redis_client.set(cache_key, orjson.dumps(profile_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await redis_client.set(cache_key, orjson.dumps(profile_list), ex=ttl_for('daily'))
 
     return profile_list
 
@@ -1984,7 +1376,7 @@ async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key))
     ticker = data['ticker'].upper()
 
     cache_key = f"etf-profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -1996,10 +1388,7 @@ async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key))
         WHERE
             symbol = ?
     """
-    query = query_template.format(ticker=ticker)
-    cur = etf_con.cursor()
-    cur.execute(query, (ticker,))
-    result = cur.fetchone()  # Get the first row
+    result = await etf_db.fetchone(query_template, (ticker,))
     profile_list = []
 
     try:
@@ -2011,182 +1400,45 @@ async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key))
     except:
         profile_list = []
 
-    redis_client.set(cache_key, orjson.dumps(profile_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await redis_client.set(cache_key, orjson.dumps(profile_list), ex=ttl_for('daily'))
 
     return profile_list
 
 
 
 @app.post("/etf-holdings")
-async def etf_holdings(data: TickerData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"etf-holdings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf/holding/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("etf-holdings", request, ticker=ticker)
 
 
 @app.post("/etf-sector-weighting")
-async def etf_holdings(data: TickerData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"etf-sector-weighting-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf-sector/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("etf-sector-weighting", request, ticker=ticker)
 
 
 
 @app.get("/all-etf-tickers")
-async def get_all_etf_tickers(api_key: str = Security(get_api_key)):
-    cache_key = f"all-etf-tickers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/all-symbols/etfs.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_all_etf_tickers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("all-etf-tickers", request)
 
 @app.get("/all-crypto-tickers")
-async def get_all_crypto_tickers(api_key: str = Security(get_api_key)):
-    cache_key = f"all-crypto-tickers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/all-symbols/cryptos.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_all_crypto_tickers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("all-crypto-tickers", request)
 
 @app.get("/congress-rss-feed")
-async def get_congress_rss_feed(api_key: str = Security(get_api_key)):
-    cache_key = f"congress-rss-feed"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/congress-trading/rss-feed/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*15)
-    return res
+async def get_congress_rss_feed(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("congress-rss-feed", request)
 
 
 
 
 @app.post("/historical-sector-price")
-async def historical_sector_price(data:FilterStockList, api_key: str = Security(get_api_key)):
+async def historical_sector_price(data:FilterStockList, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     sector = data['filterList']
-    cache_key = f"history-price-sector-{sector}"
-    cached_result = redis_client.get(cache_key)
-
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/sector/{sector}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("historical-sector-price", request, sector=sector)
 
 
 
@@ -2236,7 +1488,7 @@ async def get_earnings_call_transcripts(data:TranscriptData, api_key: str = Secu
     year = data['year']
     quarter = data['quarter']
     cache_key = f"earnings-call-transcripts-{ticker}-{year}-{quarter}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
 
     if cached_result:
         return orjson.loads(cached_result)
@@ -2255,51 +1507,24 @@ async def get_earnings_call_transcripts(data:TranscriptData, api_key: str = Secu
     except:
         res = {}
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('daily'))
     return res
 
 @app.get("/ticker-mentioning")
-async def get_ticker_mentioning(api_key: str = Security(get_api_key)):
-
-    cache_key = f"get-ticker-mentioning"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/ticker-mentioning/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+async def get_ticker_mentioning(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("ticker-mentioning", request)
 
 
 @app.post("/top-etf-ticker-holder")
-async def top_etf_ticker_holder(data: TickerData, api_key: str = Security(get_api_key)):
+async def top_etf_ticker_holder(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"top-etf-{ticker}-holder"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/top-etf-ticker-holder/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("top-etf-ticker-holder", request, ticker=ticker)
 
 
 @app.get("/popular-etfs")
 async def get_popular_etfs(api_key: str = Security(get_api_key)):
     cache_key = "popular-etfs"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -2319,153 +1544,55 @@ async def get_popular_etfs(api_key: str = Security(get_api_key)):
         print(f"Error: {e}")
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 5 minutes
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('intraday'))
     return res
 
 
 @app.get("/all-etf-providers")
-async def get_all_etf_providers(api_key: str = Security(get_api_key)):
-
-    cache_key = f"get-all-etf-providers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/all-etf-providers/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+async def get_all_etf_providers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("all-etf-providers", request)
 
 
 
 @app.post("/etf-provider")
-async def etf_holdings(data: ETFProviderData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: ETFProviderData, request: Request, api_key: str = Security(get_api_key)):
     etf_provider = data.etfProvider.lower()
-    cache_key = f"etf-provider-{etf_provider}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf/provider/{etf_provider}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("etf-provider", request, etf_provider=etf_provider)
 
 
 @app.get("/etf-new-launches")
 async def etf_provider(api_key: str = Security(get_api_key)):
     cache_key = f"etf-new-launches"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     limit = 100
     if cached_result:
         return orjson.loads(cached_result)
 
     # Check if data is cached; if not, fetch and cache it
-    cursor = etf_con.cursor()
     query = "SELECT symbol, name, expenseRatio, totalAssets, numberOfHoldings, inceptionDate FROM etfs ORDER BY inceptionDate DESC LIMIT ?"
-    cursor.execute(query, (limit,))
-    raw_data = cursor.fetchall()
-    cursor.close()
+    raw_data = await etf_db.fetchall(query, (limit,))
 
     # Extract only relevant data and sort it
     res = [{'symbol': row[0], 'name': row[1], 'expenseRatio': row[2], 'totalAssets': row[3], 'numberOfHoldings': row[4], 'inceptionDate': row[5]} for row in raw_data]
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('daily'))
     return res
 
 @app.get("/etf-bitcoin-list")
-async def get_etf_bitcoin_list(api_key: str = Security(get_api_key)):
-
-    cache_key = f"get-etf-bitcoin-list"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/etf-bitcoin-list/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+async def get_etf_bitcoin_list(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("etf-bitcoin-list", request)
 
 
 @app.post("/analyst-estimate")
-async def get_analyst_estimate(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_analyst_estimate(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"get-analyst-estimates-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst-estimate/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("analyst-estimate", request, ticker=ticker)
 
 
 @app.post("/insider-trading")
-async def get_insider_trading(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_insider_trading(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"insider-trading-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/insider-trading/history/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("insider-trading", request, ticker=ticker)
 
     
 
@@ -2474,7 +1601,7 @@ async def get_insider_trading_statistics(data:TickerData, api_key: str = Securit
     ticker = data.ticker.upper()
 
     cache_key = f"insider-trading-statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -2484,76 +1611,34 @@ async def get_insider_trading_statistics(data:TickerData, api_key: str = Securit
     except:
         res = {}
     
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('daily'))
     return res
 
 @app.post("/get-executives")
-async def get_executives(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_executives(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("get-executives", request, ticker=ticker)
+
+@app.post("/get-sec-filings")
+async def get_sec_filings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
+    return await file_cache.response("get-sec-filings", request, ticker=ticker)
 
-    cache_key = f"get-executives-{ticker}"
-    cached_result = redis_client.get(cache_key)
+
+
+@app.post("/ipo-calendar")
+async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
+    year = data.year
+    cache_key = f"ipo-calendar-{year}"
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
-        return orjson.loads(cached_result)
+        return StreamingResponse(
+        io.BytesIO(cached_result),
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip"})
 
     try:
-        with open(f"json/executives/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
-
-@app.post("/get-sec-filings")
-async def get_sec_filings(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-
-    cache_key = f"get-sec-filings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/sec-filings/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.post("/ipo-calendar")
-async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
-    year = data.year
-    cache_key = f"ipo-calendar-{year}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/ipo-calendar/data.json", 'rb') as file:
+        with open(f"json/ipo-calendar/data.json", 'rb') as file:
             res = orjson.loads(file.read())
         if year != 'all':
             res = [entry for entry in res if entry['date'].startswith(year)]
@@ -2562,8 +1647,7 @@ async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await redis_client.set(cache_key, compressed_data, ex=ttl_for('daily'))
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2572,36 +1656,13 @@ async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
     )
 
 @app.get("/trending")
-async def get_trending(api_key: str = Security(get_api_key)):
-    cache_key = f"get-trending"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/trending/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_trending(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("trending", request)
 
 @app.get("/heatmap")
 async def get_heatmap(api_key: str = Security(get_api_key)):
     cache_key = "heatmap"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     
     if cached_result:
         return StreamingResponse(
@@ -2622,8 +1683,7 @@ async def get_heatmap(api_key: str = Security(get_api_key)):
     compressed_data = gzip.compress(html_content.encode('utf-8'))
     
     # Cache the compressed HTML
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60 * 5)  # Set cache expiration time to 5 min
+    await redis_client.set(cache_key, compressed_data, ex=ttl_for('intraday'))
     
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2635,70 +1695,21 @@ async def get_heatmap(api_key: str = Security(get_api_key)):
     )
 
 @app.post("/pre-post-quote")
-async def get_pre_post_quote(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_pre_post_quote(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-pre-post-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/pre-post-quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("pre-post-quote", request, ticker=ticker)
 
 @app.post("/get-quote")
-async def get_pre_post_quote(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_pre_post_quote(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("get-quote", request, ticker=ticker)
 
 
 
 @app.post("/options-contract-history")
-async def get_data(data:GeneralData, api_key: str = Security(get_api_key)):
+async def get_data(data:GeneralData, request: Request, api_key: str = Security(get_api_key)):
     contract_id = data.params
-    cache_key = f"options-contract-history-{contract_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/hottest-contracts/contracts/{contract_id}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("options-contract-history", request, contract_id=contract_id)
 
 @app.post("/options-gex-dex")
 async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
@@ -2706,7 +1717,7 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     category = data.category.lower()
 
     cache_key = f"options-gex-dex-{ticker}-{category}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2726,8 +1737,7 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
         data = []
     data = orjson.dumps(data)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
+    await redis_client.set(cache_key, compressed_data, ex=3600*60)
     return StreamingResponse(
         io.BytesIO(compressed_data),
         media_type="application/json",
@@ -2741,7 +1751,7 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     category = data.category.lower()
 
     cache_key = f"options-oi-{ticker}-{category}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2759,8 +1769,7 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     data = orjson.dumps(data)
 
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
+    await redis_client.set(cache_key, compressed_data, ex=3600*60)
     return StreamingResponse(
         io.BytesIO(compressed_data),
         media_type="application/json",
@@ -2768,60 +1777,49 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     )
 
 @app.post("/options-stats-ticker")
-async def get_options_stats_ticker(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_stats_ticker(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"options-stats-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/options-stats/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
+    return await file_cache.response("options-stats-ticker", request, ticker=ticker)
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
+async def get_options_activity(ticker, start_date='', end_date='', pagesize=500, page=0, cache_ttl=60):
+    """
+    Raw Benzinga activity of one ticker, newest first. Read from the store
+    cron_options_flow.py fills; pages the store can't fully answer are fetched
+    per ticker from Benzinga and cached in Redis.
+    """
+    query, params = activity_query(ticker, start_date, end_date, pagesize, page * pagesize)
+    try:
+        rows = await options_activity_db.fetchall(query, params)
+        meta = dict(await options_activity_db.fetchall(META_QUERY))
+        if covers(rows, pagesize, start_date, end_date, meta):
+            return decode_rows(rows)
+    except sqlite3.Error:
+        pass
 
-@app.post("/raw-options-flow-ticker")
-@limiter.limit("500/minute")
-async def get_raw_options_flow_ticker(data:OptionsFlowData, request: Request, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    start_date = data.start_date
-    end_date = data.end_date
-    pagesize = data.pagesize
-    page = data.page
     cache_key = f"raw-options-flow-{ticker}-{start_date}-{end_date}-{pagesize}-{page}"
-    #print(ticker, start_date, end_date, pagesize, page)
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
+        return orjson.loads(cached_result)
     try:
-        data = fin.options_activity(company_tickers=ticker, date_from=start_date, date_to = end_date, page=page, pagesize=pagesize)
+        # Benzinga spells class shares with a dot (BRK.B)
+        data = await asyncio.to_thread(
+            fin.options_activity, company_tickers=ticker.replace('-', '.'), date_from=start_date, date_to=end_date, page=page, pagesize=pagesize
+        )
         data = orjson.loads(fin.output(data))['option_activity']
     except Exception as e:
         print(e)
-        data = []
+        return []
+    await redis_client.set(cache_key, orjson.dumps(data), ex=cache_ttl)
+    return data
 
-    data = orjson.dumps(data)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 5 min
+
+@app.post("/raw-options-flow-ticker")
+@limiter.limit("500/minute")
+async def get_raw_options_flow_ticker(data:OptionsFlowData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = normalize_ticker(data.ticker)
+    res_list = await get_options_activity(ticker, data.start_date, data.end_date, data.pagesize, data.page)
+    compressed_data = gzip.compress(orjson.dumps(res_list))
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2832,18 +1830,9 @@ async def get_raw_options_flow_ticker(data:OptionsFlowData, request: Request, ap
 
 @app.post("/options-flow-ticker")
 async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"options-flow-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
+    ticker = normalize_ticker(data.ticker)
     try:
-        data = fin.options_activity(company_tickers=ticker, pagesize=500)
-        data = orjson.loads(fin.output(data))['option_activity']
+        data = await get_options_activity(ticker, pagesize=500, cache_ttl=60*5)
         res_list = []
         keys_to_keep = {'time', 'sentiment','option_activity_type', 'price', 'underlying_price', 'cost_basis', 'strike_price', 'date', 'date_expiration', 'open_interest', 'put_call', 'volume'}
         for item in data:
@@ -2859,8 +1848,6 @@ async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_a
 
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 5 min
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2870,269 +1857,109 @@ async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_a
 
 
 @app.post("/options-gex-ticker")
-async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_flow_ticker(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"options-gex-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-    try:
-        with open(f"json/options-gex/companies/{ticker}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("options-gex-ticker", request, ticker=ticker)
 
 @app.post("/options-historical-data-ticker")
-async def get_options_chain(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_chain(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"options-historical-data-{ticker}"
-
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-    try:
-        with open(f"json/options-historical-data/companies/{ticker}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("options-historical-data-ticker", request, ticker=ticker)
 
 
 @app.post("/options-historical-flow")
-async def get_options_chain(data:HistoricalDate, api_key: str = Security(get_api_key)):
+async def get_options_chain(data:HistoricalDate, request: Request, api_key: str = Security(get_api_key)):
     selected_date = data.date
-    cache_key = f"options-historical-flow-{selected_date}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-    try:
-        with open(f"json/options-historical-data/flow-data/{selected_date}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("options-historical-flow", request, selected_date=selected_date)
 
-'''
 @app.post("/options-flow-feed")
-async def get_options_flow_feed(data: LastOptionId, api_key: str = Security(get_api_key)):
-    last_option_id = data.lastId
-
-    try:
-        with open(f"json/options-flow/feed/data.json", 'rb') as file:
-            all_data = orjson.loads(file.read())
+async def get_options_flow_feed_page(data: OptionsFlowFeedQuery, api_key: str = Security(get_api_key)):
+    """
+    Pages of the options flow feed, newest first.
 
-        if len(last_option_id) == 0:
-            res_list = all_data[0:100]
-        else:
-            # Find the index of the element with the last known ID
-            start_index = next((i for i, item in enumerate(all_data) if item["id"] == last_option_id), -1)
-            if start_index == -1:
-                raise ValueError("Last known ID not found in data")
+    Body: {cursor, limit, ticker, putCall, sentiment, minPremium}, all optional.
+    Response: {"data": [...items], "nextCursor": str | null}; pass nextCursor
+    back as cursor for the next page, null means there is none. An expired or
+    malformed cursor is a 400.
 
-            # Get the next 100 elements
-            res_list = all_data[start_index + 1:start_index + 101]
+    Legacy body {lastId}: the next 100 items after that id as a gzipped bare
+    list, [] if the id is no longer in the feed.
+    """
+    await options_feed.refresh()
+    if data.lastId is not None and not data.cursor:
+        try:
+            res_list, _ = options_feed.page(cursor=encode_cursor(data.lastId) if data.lastId else '', limit=100)
+        except CursorError:
+            res_list = []
+        return gzip_response(gzip.compress(orjson.dumps(res_list)))
+
+    try:
+        res_list, next_cursor = options_feed.page(
+            cursor=data.cursor,
+            limit=data.limit,
+            ticker=data.ticker.upper(),
+            put_call=data.putCall,
+            sentiment=data.sentiment,
+            min_premium=data.minPremium,
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Compress the data
-        compressed_data = gzip.compress(orjson.dumps(res_list))
+    res = {'data': res_list, 'nextCursor': next_cursor}
+    return Response(content=orjson.dumps(res), media_type="application/json")
 
-        return StreamingResponse(
-            io.BytesIO(compressed_data),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    except Exception as e:
-        # Log the error for debugging
-        print(f"Error: {str(e)}")
-        return StreamingResponse(
-            io.BytesIO(gzip.compress(orjson.dumps([]))),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-'''
 @app.get("/options-flow-feed")
-async def get_options_flow_feed(api_key: str = Security(get_api_key)):
-    try:
-        with open(f"json/options-flow/feed/data.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_options_flow_feed(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("options-flow-feed", request)
 
 
 @app.get("/dark-pool-flow-feed")
-async def get_dark_pool_feed(api_key: str = Security(get_api_key)):
-    cache_key = f"dark-pooll-flow-feed"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+async def get_dark_pool_feed(request: Request, api_key: str = Security(get_api_key)):
+    file_path = latest_json_path("json/dark-pool/historical-flow")
 
-    try:
-        directory = "json/dark-pool/historical-flow"
-        res_list = load_latest_json(directory)
-        res_list = [item for item in res_list if float(item['premium']) > 500_000]
+    def build():
+        try:
+            with open(file_path, 'rb') as file:
+                res_list = orjson.loads(file.read())
+            res_list = [item for item in res_list if float(item['premium']) > 500_000]
+        except:
+            res_list = []
+        return gzip.compress(orjson.dumps(res_list))
 
-    except:
-        res_list = []
-        
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
+    return await file_cache.cached_response(request, "dark-pool-flow-feed", file_cache.stat(file_path), build, ttl_for('live'), file_path)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
-
-
-@app.get("/options-zero-dte")
-async def get_options_flow_feed(api_key: str = Security(get_api_key)):
-    try:
-        with open(f"json/options-flow/zero-dte/data.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/options-zero-dte")
+async def get_options_flow_feed(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("options-zero-dte", request)
 
 
 @app.post("/options-bubble")
-async def get_options_bubble(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_bubble(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"options-bubble-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/options-bubble/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("options-bubble", request, ticker=ticker)
 
 
 @app.get("/top-analysts")
-async def get_all_analysts(api_key: str = Security(get_api_key)):
-    cache_key = f"top-analysts"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/top-analysts.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+async def get_all_analysts(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("top-analysts", request)
 
 @app.get("/top-analysts-stocks")
-async def get_all_analysts(api_key: str = Security(get_api_key)):
-    cache_key = f"top-analysts-stocks"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/top-stocks.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+async def get_all_analysts(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("top-analysts-stocks", request)
 
 @app.post("/analyst-stats")
-async def get_all_analysts(data:AnalystId, api_key: str = Security(get_api_key)):
+async def get_all_analysts(data:AnalystId, request: Request, api_key: str = Security(get_api_key)):
     analyst_id = data.analystId
-
-    cache_key = f"analyst-stats-{analyst_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/analyst-db/{analyst_id}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("analyst-stats", request, analyst_id=analyst_id)
 
 @app.post("/wiim")
 async def get_wiim(data:TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
 
     cache_key = f"wiim-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -3142,327 +1969,175 @@ async def get_wiim(data:TickerData, api_key: str = Security(get_api_key)):
     except:
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('intraday'))
     return res
 
 @app.get("/dashboard-info")
-async def get_dashboard_info(api_key: str = Security(get_api_key)):
-
-    cache_key = f"dashboard-info"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/dashboard/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)
-    return res
+async def get_dashboard_info(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("dashboard-info", request)
 
 @app.post("/sentiment-analysis")
-async def get_sentiment_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_sentiment_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"sentiment-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/sentiment-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("sentiment-analysis", request, ticker=ticker)
 
 @app.post("/trend-analysis")
-async def get_trend_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_trend_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"trend-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/trend-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("trend-analysis", request, ticker=ticker)
 
 @app.post("/price-analysis")
-async def get_price_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_price_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"price-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/price-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("price-analysis", request, ticker=ticker)
 
 
 
 @app.post("/fundamental-predictor-analysis")
-async def get_fundamental_predictor_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_fundamental_predictor_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"fundamental-predictor-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/fundamental-predictor-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("fundamental-predictor-analysis", request, ticker=ticker)
 
 
 @app.post("/value-at-risk")
-async def get_trend_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_trend_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"value-at-risk-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/var/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("value-at-risk", request, ticker=ticker)
 
 @app.post("/government-contract")
-async def get_government_contract(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_government_contract(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"government-contract-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/government-contract/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("government-contract", request, ticker=ticker)
 
 @app.post("/corporate-lobbying")
-async def get_lobbying(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_lobbying(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"corporate-lobbying-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/corporate-lobbying/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("corporate-lobbying", request, ticker=ticker)
 
 @app.post("/enterprise-values")
-async def get_enterprise_values(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_enterprise_values(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"enterprise-values-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/enterprise-values/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("enterprise-values", request, ticker=ticker)
 
 
 @app.post("/share-statistics")
-async def get_enterprise_values(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_enterprise_values(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"share-statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/share-statistics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response("share-statistics", request, ticker=ticker)
 
 
 @app.post("/politician-stats")
-async def get_politician_stats(data:PoliticianId, api_key: str = Security(get_api_key)):
+async def get_politician_stats(data:PoliticianId, request: Request, api_key: str = Security(get_api_key)):
     politician_id = data.politicianId.lower()
-    cache_key = f"politician-stats-{politician_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+    return await file_cache.response("politician-stats", request, politician_id=politician_id)
 
-    try:
-        with open(f"json/congress-trading/politician-db/{politician_id}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = {}
+@app.get("/all-politicians")
+async def get_all_politician(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("all-politicians", request)
 
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/most-shorted-stocks")
+async def get_most_shorted_stocks(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("most-shorted-stocks", request)
 
-@app.get("/all-politicians")
-async def get_all_politician(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"all-politician"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    
-    try:
-        with open(f"json/congress-trading/search_list.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
 
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
+@app.post("/historical-dark-pool")
+async def get_dark_pool(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("historical-dark-pool", request, ticker=ticker)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.post("/dark-pool-level")
+async def get_dark_pool(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("dark-pool-level", request, ticker=ticker)
 
 
 
-@app.get("/most-shorted-stocks")
-async def get_most_shorted_stocks(api_key: str = Security(get_api_key)):
-    cache_key = f"most-shorted-stocks"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/most-shorted-stocks/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+@app.post("/market-maker")
+async def get_market_maker(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("market-maker", request, ticker=ticker)
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+@app.post("/clinical-trial")
+async def get_clinical_trial(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("clinical-trial", request, ticker=ticker)
 
 
-@app.post("/historical-dark-pool")
-async def get_dark_pool(data:TickerData, api_key: str = Security(get_api_key)):
+@app.get("/fda-calendar")
+async def get_market_maker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("fda-calendar", request)
+
+
+@app.post("/fail-to-deliver")
+async def get_fail_to_deliver(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"historical-dark-pool-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
+    return await file_cache.response("fail-to-deliver", request, ticker=ticker)
 
-    try:
-        with open(f"json/dark-pool/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
+@app.post("/analyst-insight")
+async def get_analyst_insight(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("analyst-insight", request, ticker=ticker)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
+@app.post("/implied-volatility")
+async def get_data(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("implied-volatility", request, ticker=ticker)
 
-@app.post("/dark-pool-level")
-async def get_dark_pool(data:TickerData, api_key: str = Security(get_api_key)):
+@app.post("/hottest-contracts")
+async def get_data(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"dark-pool-level-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    return await file_cache.response("hottest-contracts", request, ticker=ticker)
+
+@app.get("/cramer-tracker")
+async def get_cramer_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("cramer-tracker", request)
+
+@app.get("/lobbying-tracker")
+async def get_cramer_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("lobbying-tracker", request)
+
+
+@app.get("/reddit-tracker")
+async def get_reddit_tracker(api_key: str = Security(get_api_key)):
+    cache_key = f"reddit-tracker"
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
+            io.BytesIO(cached_result),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"}
+        )
 
     try:
-        with open(f"json/dark-pool/price-level/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        with open(f"json/reddit-tracker/wallstreetbets/data.json", 'rb') as file:
+            latest_post = orjson.loads(file.read())[0:25]
     except:
-        res = []
+        latest_post = []
+
+    try:
+        with open(f"json/reddit-tracker/wallstreetbets/stats.json", 'rb') as file:
+            stats = orjson.loads(file.read())
+    except:
+        stats = []
+
+    try:
+        with open(f"json/reddit-tracker/wallstreetbets/trending.json", 'rb') as file:
+            trending = orjson.loads(file.read())
+    except:
+        trending = {}
+
+    res = {'posts': latest_post, 'stats': stats, 'trending': trending}
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)
-    
+
+    await redis_client.set(cache_key, compressed_data, ex=60*15)
+
     return StreamingResponse(
         io.BytesIO(compressed_data),
         media_type="application/json",
@@ -3471,550 +2146,54 @@ async def get_dark_pool(data:TickerData, api_key: str = Security(get_api_key)):
 
 
 
-@app.post("/market-maker")
-async def get_market_maker(data:TickerData, api_key: str = Security(get_api_key)):
+@app.post("/historical-market-cap")
+async def get_historical_market_cap(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"market-maker-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/market-maker/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-@app.post("/clinical-trial")
-async def get_clinical_trial(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"clinical-trial-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/clinical-trial/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.get("/fda-calendar")
-async def get_market_maker(api_key: str = Security(get_api_key)):
-    cache_key = f"fda-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/fda-calendar/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*15)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/fail-to-deliver")
-async def get_fail_to_deliver(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"fail-to-deliver-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/fail-to-deliver/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/analyst-insight")
-async def get_analyst_insight(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"analyst-insight-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/analyst/insight/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/implied-volatility")
-async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"implied-volatility-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/implied-volatility/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except Exception as e:
-        print(e)
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.post("/hottest-contracts")
-async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"hottest-contracts-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/hottest-contracts/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/cramer-tracker")
-async def get_cramer_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"cramer-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/cramer-tracker/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/lobbying-tracker")
-async def get_cramer_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"corporate-lobbying-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/corporate-lobbying/tracker/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.get("/reddit-tracker")
-async def get_reddit_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"reddit-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/data.json", 'rb') as file:
-            latest_post = orjson.loads(file.read())[0:25]
-    except:
-        latest_post = []
-
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/stats.json", 'rb') as file:
-            stats = orjson.loads(file.read())
-    except:
-        stats = []
-
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/trending.json", 'rb') as file:
-            trending = orjson.loads(file.read())
-    except:
-        trending = {}
-
-    res = {'posts': latest_post, 'stats': stats, 'trending': trending}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.post("/historical-market-cap")
-async def get_historical_market_cap(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"historical-market-cap-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/market-cap/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/economic-indicator")
-async def get_economic_indicator(api_key: str = Security(get_api_key)):
-    cache_key = f"economic-indicator"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/economic-indicator/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/sector-industry-overview")
-async def get_industry_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"sector-industry-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/sector-overview")
-async def get_sector_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"sector-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/sector-overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/industry-stocks")
-async def get_sector_overview(data: FilterStockList, api_key: str = Security(get_api_key)):
-    filter_list = data.filterList.lower()
-    cache_key = f"industry-stocks-{filter_list}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/industries/{filter_list}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.get("/industry-overview")
-async def get_industry_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"industry-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/industry-overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.post("/next-earnings")
-async def get_next_earnings(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"next-earnings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings/next/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
+    return await file_cache.response("historical-market-cap", request, ticker=ticker)
 
-    
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
+@app.get("/economic-indicator")
+async def get_economic_indicator(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("economic-indicator", request)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,15*60)
+@app.get("/sector-industry-overview")
+async def get_industry_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("sector-industry-overview", request)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/sector-overview")
+async def get_sector_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("sector-overview", request)
 
-@app.post("/earnings-surprise")
-async def get_surprise_earnings(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"earnings-surprise-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings/surprise/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
+@app.post("/industry-stocks")
+async def get_sector_overview(data: FilterStockList, request: Request, api_key: str = Security(get_api_key)):
+    filter_list = data.filterList.lower()
+    return await file_cache.response("industry-stocks", request, filter_list=filter_list)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,15*60)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/industry-overview")
+async def get_industry_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("industry-overview", request)
 
-@app.post("/price-action-earnings")
-async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
+@app.post("/next-earnings")
+async def get_next_earnings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"price-action-earnings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings/past/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+    return await file_cache.response("next-earnings", request, ticker=ticker)
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*60)
+@app.post("/earnings-surprise")
+async def get_surprise_earnings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("earnings-surprise", request, ticker=ticker)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.post("/price-action-earnings")
+async def get_data(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response("price-action-earnings", request, ticker=ticker)
 
 @app.post("/info-text")
 async def get_info_text(data:InfoText, api_key: str = Security(get_api_key)):
     parameter = data.parameter
     cache_key = f"info-text-{parameter}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await redis_client.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
     try:
@@ -4023,296 +2202,73 @@ async def get_info_text(data:InfoText, api_key: str = Security(get_api_key)):
     except:
         res = {}
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key,3600*3600)
+    await redis_client.set(cache_key, orjson.dumps(res), ex=ttl_for('static'))
 
     return res
 
 @app.post("/fomc-impact")
-async def get_fomc_impact(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_fomc_impact(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"fomc-impact-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/fomc-impact/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("fomc-impact", request, ticker=ticker)
 
 @app.get("/sentiment-tracker")
-async def get_fomc_impact(api_key: str = Security(get_api_key)):
-
-    cache_key = f"sentiment-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/tracker/sentiment/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,5*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_fomc_impact(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("sentiment-tracker", request)
 
 @app.post("/business-metrics")
-async def get_fomc_impact(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_fomc_impact(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"business-metrics-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/business-metrics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("business-metrics", request, ticker=ticker)
 
 
 @app.get("/insider-tracker")
-async def get_insider_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"insider-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/tracker/insider/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,5*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_insider_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("insider-tracker", request)
 
 @app.post("/statistics")
-async def get_statistics(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_statistics(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/statistics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.post("/list-category")
-async def get_statistics(data: FilterStockList, api_key: str = Security(get_api_key)):
-    filter_list = data.filterList.lower()
-    cache_key = f"filter-list-{filter_list}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+    return await file_cache.response("statistics", request, ticker=ticker)
 
+def list_category_type(filter_list):
+    """Folder under json/ of a /list-category list."""
     if filter_list in ['financial','healthcare','technology','industrials','consumer-cyclical','real-estate','basic-materials','communication-services','energy','consumer-defensive','utilities']:
-        category_type = 'sector'
+        return 'sector'
     elif filter_list == 'reits':
-        category_type = 'industry'
+        return 'industry'
     elif filter_list in ['online-gambling','metaverse','sports-betting','virtual-reality','online-dating','pharmaceutical-stocks','gaming-stocks','augmented-reality','electric-vehicles','car-company-stocks','esports','clean-energy','mobile-games','social-media-stocks','ai-stocks','highest-option-premium','highest-option-iv-rank','highest-open-interest','highest-open-interest-change','most-shorted-stocks','most-ftd-shares','highest-income-tax','most-employees','highest-revenue','top-rated-dividend-stocks','penny-stocks','overbought-stocks','oversold-stocks','faang','magnificent-seven','ca','cn','de','gb','il','in','jp','nyse','nasdaq','amex','dowjones','sp500','nasdaq100','all-etf-tickers','all-stock-tickers']:
-        category_type = 'stocks-list'
+        return 'stocks-list'
     elif filter_list in ['dividend-kings','dividend-aristocrats']:
-        category_type = 'dividends'
+        return 'dividends'
     else:
-        category_type = 'market-cap'
-    try:
-        with open(f"json/{category_type}/list/{filter_list}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
+        return 'market-cap'
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.post("/list-category")
+async def get_statistics(data: FilterStockList, request: Request, api_key: str = Security(get_api_key)):
+    filter_list = data.filterList.lower()
+    category_type = list_category_type(filter_list)
+    return await file_cache.response("list-category", request, category_type=category_type, filter_list=filter_list)
 
 @app.post("/pre-after-market-movers")
-async def get_statistics(data: ParamsData, api_key: str = Security(get_api_key)):
+async def get_statistics(data: ParamsData, request: Request, api_key: str = Security(get_api_key)):
     params = data.params
     category = data.category
-    cache_key = f"pre-after-market-movers-{category}-{params}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/market-movers/{category}/{params}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {'gainers': [], 'losers': []}
-        
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("pre-after-market-movers", request, category=category, params=params)
 
 
 @app.post("/profile")
-async def get_statistics(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_statistics(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/profile/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-        
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response("profile", request, ticker=ticker)
 
 @app.get("/market-flow")
-async def get_market_flow(api_key: str = Security(get_api_key)):
-    cache_key = f"market-flow"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/market-flow/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-        
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,2*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_market_flow(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response("market-flow", request)
 
 
 @app.get("/newsletter")
-async def get_newsletter():
-    try:
-        with open(f"json/newsletter/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    return res
+async def get_newsletter(request: Request):
+    return await file_cache.response("newsletter", request)
 
 if __name__ == "__main__":
     api_port = int(os.environ.get('API_PORT', DEFAULT_UVICORN_PORT))
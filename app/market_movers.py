@@ -1,9 +1,13 @@
 import sqlite3
 from datetime import datetime, timedelta
-import pandas as pd
 import json
 import time
 
+import numpy as np
+
+from utils.price_matrix import PRICE_MATRICES, open_price_matrix
+from utils.trading_calendar import last_trading_day
+
 class Past_Market_Movers:
     def __init__(self):
         self.con = sqlite3.connect('backup_db/stocks.db')
@@ -15,47 +19,17 @@ class Past_Market_Movers:
         self.cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol != ?", ('%5EGSPC',))
         return [row[0] for row in self.cursor.fetchall()]
 
-    @staticmethod
-    def check_if_holiday():
-        holidays = {
-            datetime(2023, 5, 29): 'memorial_day',
-            datetime(2023, 6, 19): 'independence_day',
-            datetime(2023, 6, 20): 'independence_day+1',
-            datetime(2023, 9, 4): 'labor_day',
-        }
-
-        current_datetime = datetime.today()
-        for holiday_date, holiday_name in holidays.items():
-            if current_datetime == holiday_date:
-                return holiday_name
-        return None
-
     def correct_weekday_interval(self, prev_day):
-        holiday = self.check_if_holiday()
-        if holiday:
-            if holiday == 'memorial_day':
-                start_date = datetime(2023, 5, 26)
-            elif holiday in ('independence_day', 'independence_day+1'):
-                start_date = datetime(2023, 6, 16)
-            else:
-                start_date = datetime(2023, 9, 1)
-        else:
-            current_date = datetime.today() - timedelta(prev_day)
-            current_weekday = current_date.weekday()
-            if current_weekday in (5, 6):  # Saturday or Sunday
-                start_date = current_date - timedelta(days=current_weekday % 5 + 1)
-            else:
-                start_date = current_date
+        # Start at the last trading day on or before `prev_day` days ago
+        start_date = last_trading_day(datetime.today() - timedelta(prev_day))
         return start_date.strftime("%Y-%m-%d")
 
     def run(self, time_periods=[7,20,252,756,1260]):
         performance_data = []
-        query_template = """
-            SELECT date, close, volume FROM "{ticker}" WHERE date >= ?
-        """
-        query_fundamental_template = """
-            SELECT marketCap, name FROM stocks WHERE symbol = ?
-        """
+        symbols = set(self.symbols)
+        matrix = open_price_matrix(PRICE_MATRICES['stocks'], self.con)
+        self.cursor.execute("SELECT symbol, marketCap, name FROM stocks")
+        fundamentals = {symbol: (market_cap, name) for symbol, market_cap, name in self.cursor.fetchall()}
         gainer_json = {}
         loser_json = {}
         active_json = {}
@@ -68,17 +42,20 @@ class Past_Market_Movers:
             active_data = []
 
             start_date = self.correct_weekday_interval(time_period)
-            for ticker in self.symbols:
+            # Window of all symbols from the memory mapped price matrix
+            tickers, _, close = matrix.slice('close', start_date=start_date)
+            _, _, volume = matrix.slice('volume', start_date=start_date)
+            for ticker, closes, volumes in zip(tickers, close, volume):
                 try:
-                    query = query_template.format(ticker=ticker)
-                    df = pd.read_sql_query(query, self.con, params=(start_date,))
-                    if not df.empty:
-                        fundamental_data = pd.read_sql_query(query_fundamental_template, self.con, params=(ticker,))
-                        avg_volume = df['volume'].mean()
-                        market_cap = int(fundamental_data['marketCap'].iloc[0])
-                        if avg_volume > 1E6 and df['close'].mean() > 1 and market_cap >=50E6:
-                            changes_percentage = ((df['close'].iloc[-1] - df['close'].iloc[0]) / df['close'].iloc[0]) * 100
-                            performance_data.append((ticker, fundamental_data['name'].iloc[0], df['close'].iloc[-1], changes_percentage, avg_volume, market_cap))
+                    closes = closes[~np.isnan(closes)]
+                    if ticker in symbols and len(closes):
+                        first_close, last_close = closes[0], closes[-1]
+                        avg_close, avg_volume = closes.mean(), np.nanmean(volumes)
+                        market_cap, name = fundamentals[ticker]
+                        market_cap = int(market_cap)
+                        if avg_volume > 1E6 and avg_close > 1 and market_cap >=50E6:
+                            changes_percentage = ((last_close - first_close) / first_close) * 100
+                            performance_data.append((ticker, name, last_close, changes_percentage, avg_volume, market_cap))
                 except:
                     pass
 
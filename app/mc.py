@@ -9,6 +9,8 @@ import json
 from tqdm import tqdm
 import argparse
 
+from utils.price_matrix import PRICE_MATRICES, open_price_matrix
+
 #source https://medium.com/analytics-vidhya/monte-carlo-simulations-for-predicting-stock-prices-python-a64f53585662
 
 def parse_args():
@@ -126,17 +128,7 @@ def update_database(pred_dict, symbol, con):
 
 def process_symbol(ticker):
     try:
-        query_template = """
-            SELECT
-                date, close
-            FROM
-                "{ticker}"
-            WHERE
-                date BETWEEN ? AND ?
-        """
-
-        query = query_template.format(ticker=ticker)
-        df = pd.read_sql_query(query, con, params=(start_date, end_date))
+        df = matrix.frame(ticker, ('close',), start_date, end_date)
         time_list = [7,30,90,180]
 
         pred_dict = {}
@@ -166,6 +158,8 @@ db_name = args.db
 table_name = args.table
 
 con = sqlite3.connect(f'backup_db/{db_name}.db')
+# Mapped once here, the forked workers share its pages
+matrix = open_price_matrix(PRICE_MATRICES[db_name], con)
 
 symbol_query = f"SELECT DISTINCT symbol FROM {table_name}"
 
@@ -190,20 +184,11 @@ con.close()
 
 
 '''
-query_template = """
-    SELECT
-        date, close
-    FROM
-        {ticker}
-    WHERE
-        date BETWEEN ? AND ?
-"""
 ticker = 'AMD'
 start_date = datetime(2020,1,1)
 end_date = datetime.today()
 con = sqlite3.connect('stocks.db')
-query = query_template.format(ticker=ticker)
-df = pd.read_sql_query(query, con, params=(start_date, end_date))
+df = read_prices(con, ticker, start_date, end_date, columns=('date', 'close'))
 #Compute the logarithmic returns
 GeometricBrownianMotion(df).run()
 '''
\ No newline at end of file
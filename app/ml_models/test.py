@@ -243,7 +243,6 @@ async def test_process(con):
 async def main():
     con = sqlite3.connect('../stocks.db')
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap >= 500E9")
     stock_symbols = [row[0] for row in cursor.fetchall()]
     print(len(stock_symbols))
@@ -0,0 +1,33 @@
+import argparse
+import os
+
+import redis
+
+from utils.db_snapshot import DATABASES, publish_snapshot
+from utils.reference_data import drop_dependent_keys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Publish the databases built in backup_db/ as the live ones.')
+    parser.add_argument('names', nargs='*', default=list(DATABASES), help=f"Databases to publish, any of {', '.join(DATABASES)} (default: all)")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+published = 0
+for name in args.names:
+    source = f"backup_db/{name}.db"
+    if not os.path.exists(source):
+        print(f"Skipping {name}: {source} does not exist")
+        continue
+    print(f"Published {name}.db -> {publish_snapshot(source, name)}")
+    published += 1
+
+if published:
+    # The API's Redis keys built from the databases are stale now
+    try:
+        redis_client = redis.Redis(host=os.getenv('REDIS_HOST', 'redis'), port=6379, db=0, socket_connect_timeout=1, socket_timeout=5)
+        print(f"Dropped {drop_dependent_keys(redis_client)} cached API responses")
+    except redis.RedisError as e:
+        print(f"Could not drop the cached API responses: {e}")
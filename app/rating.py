@@ -229,21 +229,13 @@ class rating_model:
 # Load the data
 '''
 import sqlite3
+from utils.price_store import read_prices
 start_date = "2015-01-01"
 end_date = datetime.today().strftime("%Y-%m-%d")
 con = sqlite3.connect('stocks.db')
 symbol = 'ZTS'
 
-query_template = """
-    SELECT
-        date, open, high, low, close, volume
-    FROM
-        "{symbol}"
-    WHERE
-        date BETWEEN ? AND ?
-"""
-query = query_template.format(symbol=symbol)
-df = pd.read_sql_query(query, con, params=(start_date, end_date))
+df = read_prices(con, symbol, start_date, end_date, columns=('date', 'open', 'high', 'low', 'close', 'volume'))
 
 test = rating_model(df).ta_rating()
 print(test)
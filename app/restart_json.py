@@ -17,6 +17,11 @@ import hashlib
 import glob
 from tqdm import tqdm
 from utils.country_list import country_list
+from utils.helper import write_json
+from utils.reference_data import save_reference_snapshot
+from utils.column_table import ColumnTable
+from utils.price_matrix import PRICE_MATRICES, open_price_matrix
+from utils.price_store import first_price
 
 from dotenv import load_dotenv
 import os
@@ -29,18 +34,6 @@ benzinga_api_key = os.getenv('benzinga_api_key')
 berlin_tz = pytz.timezone('Europe/Berlin')
 
 
-query_price = """
-    SELECT 
-        close
-    FROM 
-        "{symbol}"
-    WHERE
-        date <= ?
-    ORDER BY 
-        date DESC
-    LIMIT 1
-"""
-
 query_shares = f"""
     SELECT 
         historicalShares
@@ -62,18 +55,20 @@ time_frames = {
 
 one_year_ago = datetime.now() - timedelta(days=365)
 
-def calculate_price_changes(symbol, item, con):
+def get_past_closes(con):
+    # {time frame: {symbol: close}}, read from the memory mapped price matrix
+    matrix = open_price_matrix(PRICE_MATRICES['stocks'], con)
+    return {name: matrix.last_before('close', date) for name, date in time_frames.items()}
+
+def calculate_price_changes(symbol, item, past_closes):
     try:
         # Loop through each time frame to calculate the change
-        for name, date in time_frames.items():
+        for name in time_frames:
             item[name] = None  # Initialize to None
 
-            query = query_price.format(symbol=symbol)
-            data = pd.read_sql_query(query, con, params=(date,))
-            
             # Check if data was retrieved and calculate the percentage change
-            if not data.empty:
-                past_price = data.iloc[0]['close']
+            if symbol in past_closes[name]:
+                past_price = past_closes[name][symbol]
                 current_price = item['price']
                 change = round(((current_price - past_price) / past_price) * 100, 2)
                 
@@ -612,7 +607,6 @@ def calculate_cagr(start_value, end_value, periods):
 async def get_stock_screener(con):
     #Stock Screener Data
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     
     next_year = datetime.now().year+1
 
@@ -645,6 +639,8 @@ async def get_stock_screener(con):
     cursor.execute("SELECT symbol, name,  sma_50, sma_200, ema_50, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta FROM stocks WHERE symbol NOT LIKE '%.%' AND eps IS NOT NULL AND marketCap IS NOT NULL AND beta IS NOT NULL")
     raw_data = cursor.fetchall()
 
+    past_closes = get_past_closes(con)
+
     # Iterate through stock_screener_data and update 'price' and 'changesPercentage' if symbols match
     # Add VaR value to stock screener
     for item in tqdm(stock_screener_data):
@@ -669,7 +665,7 @@ async def get_stock_screener(con):
             item['pe'] = None
             item['marketCap'] = None
 
-        calculate_price_changes(symbol, item, con)
+        calculate_price_changes(symbol, item, past_closes)
         calculate_share_changes(symbol, item, con)
         
 
@@ -1772,11 +1768,6 @@ async def get_ipo_calendar(con, symbols):
         WHERE
             symbol = ?
     """
-    query_open_price = """
-        SELECT open
-        FROM "{ticker}"
-        LIMIT 1
-    """
 
     # Iterate through quarters
     current_date = start_date
@@ -1819,8 +1810,8 @@ async def get_ipo_calendar(con, symbols):
                 quote_data = ujson.load(file)
             
             entry['currentPrice'] = quote_data.get('price',None)
-            df =  pd.read_sql_query(query_open_price.format(ticker = entry['symbol']), con)
-            entry['ipoPrice'] = round(df['open'].iloc[0], 2) if df['open'].iloc[0] != 0 else None
+            ipo_price = first_price(con, entry['symbol'], 'open')[0]
+            entry['ipoPrice'] = round(ipo_price, 2) if ipo_price != 0 else None
 
             if entry['ipoPrice'] != None and entry['currentPrice'] != None and entry['currentPrice'] != 0:
                 entry['return'] = None if (entry['ipoPrice'] in (0, None) or entry['currentPrice'] in (0, None)) else round(((entry['currentPrice'] / entry['ipoPrice'] - 1) * 100), 2)
@@ -1845,47 +1836,42 @@ async def save_json_files():
     etf_con = sqlite3.connect('etf.db')
 
     cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
     cursor.execute("SELECT DISTINCT symbol FROM stocks")
     symbols = [row[0] for row in cursor.fetchall()]
 
     etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
     etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
     etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
 
     
     stock_screener_data = await get_stock_screener(con)
-    with open(f"json/stock-screener/data.json", 'w') as file:
-        ujson.dump(stock_screener_data, file)
+    write_json("json/stock-screener/data.json", stock_screener_data)
+    # Column table the API workers memory map, then the symbol sets and
+    # searchbar universe the API loads at boot
+    ColumnTable.from_rows(stock_screener_data).save("json/reference/screener")
+    save_reference_snapshot(stock_screener_data)
 
     data = await get_ipo_calendar(con, symbols)
-    with open(f"json/ipo-calendar/data.json", 'w') as file:
-        ujson.dump(data, file)
+    write_json("json/ipo-calendar/data.json", data)
     
     earnings_list = await get_earnings_calendar(con,symbols)
-    with open(f"json/earnings-calendar/calendar.json", 'w') as file:
-        ujson.dump(earnings_list, file)
+    write_json("json/earnings-calendar/calendar.json", earnings_list)
 
     economic_list = await get_economic_calendar()
     if len(economic_list) > 0:
-        with open(f"json/economic-calendar/calendar.json", 'w') as file:
-            ujson.dump(economic_list, file)
+        write_json("json/economic-calendar/calendar.json", economic_list)
 
     dividends_list = await get_dividends_calendar(con,symbols)
-    with open(f"json/dividends-calendar/calendar.json", 'w') as file:
-        ujson.dump(dividends_list, file)
+    write_json("json/dividends-calendar/calendar.json", dividends_list)
 
     
     data = await get_congress_rss_feed(symbols, etf_symbols)
-    with open(f"json/congress-trading/rss-feed/data.json", 'w') as file:
-        ujson.dump(data, file)
+    write_json("json/congress-trading/rss-feed/data.json", data)
     
     
     data = await etf_providers(etf_con, etf_symbols)
-    with open(f"json/all-etf-providers/data.json", 'w') as file:
-        ujson.dump(data, file)
+    write_json("json/all-etf-providers/data.json", data)
 
     
 
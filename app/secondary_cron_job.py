@@ -13,8 +13,11 @@ import pytz
 import sqlite3
 import pandas as pd
 import numpy as np
+import redis
 import threading  # Import threading module for parallel execution
 
+from utils.reference_data import drop_dependent_keys
+
 
 berlin_tz = pytz.timezone('Europe/Berlin')
 
@@ -26,11 +29,19 @@ def run_pocketbase():
     # Run the asynchronous function inside an asyncio loop
     subprocess.run(["python3", "cron_pocketbase.py"])
     
+def drop_api_cache():
+    # fastapi is no longer restarted (which flushed Redis), so drop the keys it
+    # derives from the daily data explicitly
+    try:
+        drop_dependent_keys(redis.Redis(host='redis', port=6379, db=0))
+    except redis.RedisError as e:
+        print(f"Could not drop the cached API responses: {e}")
+
 def run_restart_cache():
     #update db daily
     week = datetime.today().weekday()
     if week <= 5:
-        subprocess.run(["pm2", "restart","fastapi"])
+        drop_api_cache()
         subprocess.run(["pm2", "restart","fastify"])
         subprocess.run(["pm2", "restart","websocket"])
 
@@ -38,7 +49,8 @@ def run_restart_cache():
 def run_json_job():
     # Run the asynchronous function inside an asyncio loop
     subprocess.run(["python3", "restart_json.py"])
-    subprocess.run(["pm2", "restart","fastapi"])
+    # fastapi picks up the new reference data by itself and drops the keys
+    # derived from it (DEPENDENT_PREFIXES), so it needs no restart
     subprocess.run(["pm2", "restart","fastify"])
     subprocess.run(["pm2", "restart","websocket"])
 
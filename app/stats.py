@@ -11,6 +11,8 @@ import concurrent.futures
 import numpy as np
 import argparse
 
+from utils.price_matrix import PRICE_MATRICES, open_price_matrix
+
 
 pd.set_option('display.max_rows', 150)
 
@@ -26,16 +28,7 @@ def get_ticker_data_from_database(database_path, sp500_ticker, start_date, end_d
     con_etf = sqlite3.connect(database_path)
     
     # Fetch data for the selected ticker (SPY or another ticker)
-    query_template = """
-        SELECT
-            date, close
-        FROM
-            "{ticker}"
-        WHERE
-            date BETWEEN ? AND ?
-    """
-    query = query_template.format(ticker=sp500_ticker)
-    df = pd.read_sql_query(query, con_etf, params=(start_date, end_date))
+    df = open_price_matrix(PRICE_MATRICES['etf'], con_etf).frame(sp500_ticker, ('close',), start_date, end_date)
     df['date'] = pd.to_datetime(df['date'])
     df = df.rename(columns={'date': 'Date'})
     df[sp500_ticker] = df['close'].pct_change()
@@ -223,17 +216,7 @@ def process_symbol(ticker, sp500_ticker, sp500_df):
     df = pd.DataFrame()
     combined_df = pd.DataFrame()
     try:
-        query_template = """
-            SELECT
-                date, close
-            FROM
-                "{ticker}"
-            WHERE
-                date BETWEEN ? AND ?
-        """
-
-        query = query_template.format(ticker=ticker)
-        df = pd.read_sql_query(query, con, params=(start_date, end_date))
+        df = matrix.frame(ticker, ('close',), start_date, end_date)
         df['date'] = pd.to_datetime(df['date'])
         df = df.rename(columns={'date': 'Date'})
         df[ticker] = df['close'].pct_change()
@@ -266,6 +249,8 @@ start_date = datetime(1970, 1, 1)
 end_date = datetime.today()
 
 con = sqlite3.connect(f'backup_db/{db_name}.db')
+# Mapped once here, the forked workers share its pages
+matrix = open_price_matrix(PRICE_MATRICES[db_name], con)
 
 # Load the S&P 500 ticker from the database
 sp500_ticker, sp500_df = get_ticker_data_from_database('backup_db/etf.db', "SPY", start_date, end_date)
@@ -299,22 +284,11 @@ start_date = datetime(1970, 1, 1)
 end_date = datetime.today()
 
 
-
-query_template = """
-    SELECT
-        date, close
-    FROM
-        "{ticker}"
-    WHERE
-        date BETWEEN ? AND ?
-"""
-
 ticker_list = ['IVV','SPY']
 
 combined_df = pd.DataFrame()
 for ticker in ticker_list:
-    query = query_template.format(ticker=ticker)
-    df = pd.read_sql_query(query, con, params=(start_date, end_date))
+    df = read_prices(con, ticker, start_date, end_date, columns=('date', 'close'))
     print(df)
     df['date'] = pd.to_datetime(df['date'])
     df = df.rename(columns={'date': 'Date'})
@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 import seaborn as sns
 import sqlite3
 
+from utils.price_store import read_prices
+
 def calculate_volatility(prices_df):
     prices_df = prices_df.sort_values(by='date')
     prices_df['return'] = prices_df['close'].pct_change()
@@ -27,31 +29,21 @@ stock_con = sqlite3.connect('stocks.db')
 etf_con = sqlite3.connect('etf.db')
 
 stock_cursor = stock_con.cursor()
-stock_cursor.execute("PRAGMA journal_mode = wal")
 stock_cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND marketCap >= 500E6")
 stock_symbols = [row[0] for row in stock_cursor.fetchall()]
 
 etf_cursor = etf_con.cursor()
-etf_cursor.execute("PRAGMA journal_mode = wal")
 etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
 etf_symbols = [row[0] for row in etf_cursor.fetchall()]
 
 
-query_template = """
-    SELECT date, close,change_percent
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
-
-
 ticker = 'NVDA'
 end_date = date.today()
 start_date = end_date - timedelta(1)
 end_date_str = end_date.strftime('%Y-%m-%d')
 start_date_str = start_date.strftime('%Y-%m-%d')
 
-query = query_template.format(ticker=ticker)
-df_price = pd.read_sql_query(query, stock_con if ticker in stock_symbols else etf_con, params=('2024-01-01', end_date_str)).round(2)
+df_price = read_prices(stock_con if ticker in stock_symbols else etf_con, ticker, '2024-01-01', end_date_str, columns=('date', 'close', 'change_percent')).round(2)
 df_price = df_price.rename(columns={"change_percent": "changesPercentage"})
 
 volatility = calculate_volatility(df_price)
@@ -12,6 +12,8 @@ import concurrent.futures
 import json
 from tqdm import tqdm
 
+from utils.price_store import read_prices
+
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in scalar divide")
 
@@ -80,17 +82,7 @@ def update_database(res, symbol, con):
 
 def process_symbol(ticker):
     try:
-        query_template = """
-            SELECT
-                date, open, high, low, close,volume
-            FROM
-                "{ticker}"
-            WHERE
-                date BETWEEN ? AND ?
-        """
-
-        query = query_template.format(ticker=ticker)
-        df = pd.read_sql_query(query, con, params=(start_date, end_date))
+        df = read_prices(con, ticker, start_date, end_date, columns=('date', 'open', 'high', 'low', 'close', 'volume'))
 
 
         if not df.empty:
@@ -137,20 +129,11 @@ if __name__ == '__main__':
 #==============Test mode================
 '''
 ticker = 'AAPL'
-query_template = """
-    SELECT
-        date, open, high, low, close
-    FROM
-        {ticker}
-    WHERE
-        date BETWEEN ? AND ?
-"""
 
 start_date = datetime(1970, 1, 1)
 end_date = datetime.today()
 con = sqlite3.connect('stocks.db')
-query = query_template.format(ticker=ticker)
-df = pd.read_sql_query(query, con, params=(start_date, end_date))
+df = read_prices(con, ticker, start_date, end_date, columns=('date', 'open', 'high', 'low', 'close'))
 con.close()
 
 df = df.rename(columns={"open": "Open", "high": "High", "low": "Low", "close": "Close"})
@@ -0,0 +1,16 @@
+import math
+import os
+import sys
+
+import pytest
+
+# The app modules import each other as top-level packages (utils.*), run from app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import helper  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_change_notifications(monkeypatch):
+    # write_json() announces rewrites over Redis, which tests have none of
+    monkeypatch.setattr(helper, '_PUBLISH_RETRY_AT', math.inf)
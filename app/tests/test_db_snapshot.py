@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sqlite3
+
+import utils.db_pool as db_pool
+from utils.db_pool import ReadOnlyPool
+from utils.db_snapshot import publish_snapshot, snapshot_version
+
+
+def build(path, value):
+    with sqlite3.connect(path) as con:
+        con.execute("PRAGMA journal_mode = wal")
+        con.execute("CREATE TABLE IF NOT EXISTS stocks (symbol TEXT PRIMARY KEY, price REAL)")
+        con.execute("INSERT OR REPLACE INTO stocks VALUES ('AAPL', ?)", (value,))
+    con.close()
+
+
+def test_publish_swaps_the_link(tmp_path):
+    source, snapshots, link = tmp_path / 'build.db', tmp_path / 'snapshots', tmp_path / 'stocks.db'
+    build(source, 1)
+    first = publish_snapshot(str(source), 'stocks', str(snapshots), str(tmp_path))
+    assert os.path.islink(link) and os.path.samefile(link, first)
+
+    reader = sqlite3.connect(f"file:{link}?mode=ro", uri=True)
+    assert reader.execute("SELECT journal_mode FROM pragma_journal_mode").fetchone()[0] == 'delete'
+    version = snapshot_version(str(link))
+
+    build(source, 2)
+    publish_snapshot(str(source), 'stocks', str(snapshots), str(tmp_path))
+    # The open connection keeps its version, a new one sees the published one
+    assert reader.execute("SELECT price FROM stocks").fetchone()[0] == 1
+    with sqlite3.connect(f"file:{link}?mode=ro", uri=True) as con:
+        assert con.execute("SELECT price FROM stocks").fetchone()[0] == 2
+    assert snapshot_version(str(link)) != version
+    reader.close()
+
+    publish_snapshot(str(source), 'stocks', str(snapshots), str(tmp_path))
+    # Only the two latest versions are kept, with no journal files left behind
+    assert len(os.listdir(snapshots)) == 2
+    assert all(entry.endswith('.db') for entry in os.listdir(snapshots))
+    assert not any(entry.endswith(('-wal', '-shm')) for entry in os.listdir(tmp_path))
+
+
+def test_pool_reopens_on_a_new_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_pool, 'SNAPSHOT_CHECK_INTERVAL', 0)
+    source, snapshots, link = tmp_path / 'build.db', tmp_path / 'snapshots', tmp_path / 'stocks.db'
+    build(source, 1)
+    publish_snapshot(str(source), 'stocks', str(snapshots), str(tmp_path))
+    pool = ReadOnlyPool(str(link), size=1)
+
+    async def price():
+        return (await pool.fetchone("SELECT price FROM stocks"))[0]
+
+    assert asyncio.run(price()) == 1
+    build(source, 2)
+    publish_snapshot(str(source), 'stocks', str(snapshots), str(tmp_path))
+    assert asyncio.run(price()) == 2
+    pool.close()
@@ -0,0 +1,147 @@
+import asyncio
+import gzip
+import os
+
+import fakeredis
+
+from utils.file_cache import FileCache, LocalCache
+
+
+def make_cache(tmp_path, ttl=60):
+    endpoints = {'quote': (str(tmp_path / '{ticker}.json'), b'{}', ttl)}
+    return FileCache(fakeredis.FakeAsyncRedis(), endpoints=endpoints, max_age=3600)
+
+
+def write(path, body):
+    path.write_bytes(body)
+    # Make sure the signature changes even within the mtime granularity
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 1_000_000,) * 2)
+
+
+def test_entries_follow_file_rewrites(tmp_path):
+    async def run():
+        cache = make_cache(tmp_path)
+        write(tmp_path / 'AAPL.json', b'{"price":1}')
+        assert gzip.decompress(await cache.get('quote', ticker='AAPL')) == b'{"price":1}'
+        write(tmp_path / 'AAPL.json', b'{"price":2}')
+        assert gzip.decompress(await cache.get('quote', ticker='AAPL')) == b'{"price":2}'
+    asyncio.run(run())
+
+
+def test_change_notification_evicts_both_tiers(tmp_path):
+    async def run():
+        cache = make_cache(tmp_path)
+        path = tmp_path / 'AAPL.json'
+        write(path, b'{"price":1}')
+        await cache.get('quote', ticker='AAPL')
+        keys = [key for key in await cache.redis.keys('file:*')]
+        assert keys and cache.local.entries
+
+        await cache.invalidate([str(path)])
+        assert not cache.local.entries
+        assert not await cache.redis.exists(*keys)
+        assert not await cache.redis.exists(f"deps:{os.path.normpath(path)}")
+    asyncio.run(run())
+
+
+def test_only_publishing_writers_get_the_long_ttl(tmp_path):
+    async def run():
+        cache = make_cache(tmp_path, ttl=60)
+        cache.listening = True
+        write(tmp_path / 'AAPL.json', b'{}')
+        write(tmp_path / 'MSFT.json', b'{}')
+        cache.published.add(os.path.normpath(tmp_path / 'AAPL.json'))
+
+        await cache.get('quote', ticker='AAPL')
+        await cache.get('quote', ticker='MSFT')
+        ttls = {key.split(b':')[2]: await cache.redis.ttl(key) for key in await cache.redis.keys('file:*')}
+        assert 60 < ttls[b'AAPL'] <= 3600
+        assert ttls[b'MSFT'] <= 60
+    asyncio.run(run())
+
+
+def test_keys_only_use_template_fields(tmp_path):
+    async def run():
+        endpoints = {'price': (str(tmp_path / '{time_period}-{ticker}.json'), b'[]', 60)}
+        cache = FileCache(fakeredis.FakeAsyncRedis(), endpoints=endpoints)
+        write(tmp_path / 'max-AAPL.json', b'[1]')
+
+        assert cache.cache_key('price', {'ticker': 'AAPL', 'time_period': 'max', 'extra': 'x'}) == 'file:price:max-AAPL'
+        bodies = await cache.get_many([
+            ('price', {'time_period': 'max', 'ticker': 'AAPL'}),
+            ('price', {'ticker': 'AAPL', 'time_period': 'max', 'extra': '../x'}),
+        ])
+        assert [gzip.decompress(body) for body in bodies] == [b'[1]', b'[1]']
+        assert len(cache.local.entries) == 1
+    asyncio.run(run())
+
+
+def test_local_tier_evicts_least_recently_used():
+    local = LocalCache(max_bytes=160)
+    for pos in range(16):
+        local.put(pos, 'sig', b'x' * 10)
+    assert local.get(0, 'sig') is not None
+    local.put(16, 'sig', b'x' * 10)
+
+    assert local.get(1, 'sig') is None
+    assert local.get(0, 'sig') is not None and local.get(16, 'sig') is not None
+    assert local.size == 160
+    # Stale signatures miss, and a payload over 1/16th of the tier isn't kept
+    assert local.get(0, 'other') is None
+    local.put(0, 'sig', b'x' * 11)
+    assert local.get(0, 'sig') is None and local.size == 150
+
+
+class FakeRequest:
+    def __init__(self, method='GET', **headers):
+        self.method = method
+        self.headers = {key.replace('_', '-'): value for key, value in headers.items()}
+
+
+def test_conditional_responses(tmp_path):
+    async def run():
+        cache = make_cache(tmp_path)
+        path = tmp_path / 'AAPL.json'
+        write(path, b'{"price":1}')
+
+        first = await cache.response('quote', FakeRequest(accept_encoding='gzip'), ticker='AAPL')
+        assert first.status_code == 200 and gzip.decompress(first.body) == b'{"price":1}'
+        etag, last_modified = first.headers['etag'], first.headers['last-modified']
+        assert etag.startswith('W/"')
+
+        assert (await cache.response('quote', FakeRequest(if_none_match=etag), ticker='AAPL')).status_code == 304
+        assert (await cache.response('quote', FakeRequest(if_modified_since=last_modified), ticker='AAPL')).status_code == 304
+        # If-None-Match wins over If-Modified-Since
+        mismatch = FakeRequest(if_none_match='"other"', if_modified_since=last_modified)
+        assert (await cache.response('quote', mismatch, ticker='AAPL')).status_code == 200
+        # Preconditions on POST never short-circuit to 304
+        post = FakeRequest('POST', if_none_match=etag, if_modified_since=last_modified)
+        assert (await cache.response('quote', post, ticker='AAPL')).status_code == 200
+
+        write(path, b'{"price":2}')
+        second = await cache.response('quote', FakeRequest(if_none_match=etag), ticker='AAPL')
+        assert second.status_code == 200 and second.headers['etag'] != etag
+
+        # A precompressed sibling is streamed as is, with validators of its own coding
+        write(tmp_path / 'AAPL.json.gz', gzip.compress(b'{"price":2}'))
+        streamed = await cache.response('quote', FakeRequest(accept_encoding='gzip'), ticker='AAPL')
+        assert streamed.status_code == 200 and streamed.headers['etag'] == second.headers['etag']
+        assert streamed.path == str(tmp_path / 'AAPL.json.gz')
+        revalidated = await cache.response('quote', FakeRequest(accept_encoding='gzip', if_none_match=streamed.headers['etag']), ticker='AAPL')
+        assert revalidated.status_code == 304
+    asyncio.run(run())
+
+
+def test_signature_keyed_entries_expire_within_a_day(tmp_path):
+    async def run():
+        cache = make_cache(tmp_path, ttl=3600*3600)
+        write(tmp_path / 'AAPL.json', b'{"price":1}')
+        await cache.get('quote', ticker='AAPL')
+        write(tmp_path / 'AAPL.json', b'{"price":2}')
+        await cache.get('quote', ticker='AAPL')
+
+        keys = await cache.redis.keys('file:*')
+        # The entry of the first version is orphaned, but only until its TTL runs out
+        assert len(keys) == 2
+        assert all(0 < ttl <= 24 * 3600 for ttl in [await cache.redis.ttl(key) for key in keys])
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+import orjson
+import redis
+
+from utils import helper
+
+
+class FlakyRedis:
+    def __init__(self, failures):
+        self.failures = failures
+        self.published = []
+
+    def publish(self, channel, message):
+        if self.failures:
+            self.failures -= 1
+            raise redis.ConnectionError('down')
+        self.published.append((channel, orjson.loads(message)))
+
+
+def test_publish_recovers_after_a_transient_error(monkeypatch):
+    clients = []
+
+    def connect(**kwargs):
+        clients.append(FlakyRedis(failures=1 if not clients else 0))
+        return clients[-1]
+
+    now = [1000.0]
+    monkeypatch.setattr(helper.redis, 'Redis', connect)
+    monkeypatch.setattr(helper._time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(helper, '_PUBLISHER', None)
+    monkeypatch.setattr(helper, '_PUBLISH_RETRY_AT', 0)
+
+    helper.publish_changes(['json/a.json'])
+    # Backing off: no new connection attempt
+    helper.publish_changes(['json/b.json'])
+    assert len(clients) == 1
+
+    now[0] += helper.PUBLISH_RETRY_SECONDS
+    helper.publish_changes(['json/c.json'])
+    assert len(clients) == 2
+    assert clients[1].published == [(helper.CHANGES_CHANNEL, ['json/c.json'])]
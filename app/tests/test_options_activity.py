@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from utils.options_activity import (
+    META_QUERY, activity_query, connect, covers, decode_rows, mark_synced, normalize_ticker, store_activity
+)
+from utils.trading_calendar import last_trading_day, now_et
+
+
+def item(id, ticker, day, time='10:00:00'):
+    return {'id': id, 'ticker': ticker, 'date': day, 'time': time}
+
+
+def test_dotted_tickers_are_stored_and_queried_with_a_dash(tmp_path):
+    today = date.today().isoformat()
+    con = connect(str(tmp_path / 'activity.db'))
+    store_activity(con, [item('1', 'BRK.B', today), item('2', 'AAPL', today)])
+
+    query, params = activity_query('brk.b')
+    rows = decode_rows(con.execute(query, params).fetchall())
+    assert [row['id'] for row in rows] == ['1']
+    assert normalize_ticker('BRK.B') == normalize_ticker('brk-b') == 'BRK-B'
+
+
+def test_retention_window_is_pruned(tmp_path):
+    old = (date.today() - timedelta(days=40)).isoformat()
+    con = connect(str(tmp_path / 'activity.db'))
+    store_activity(con, [item('1', 'AAPL', old), item('2', 'AAPL', date.today().isoformat())])
+    assert [row[0] for row in con.execute("SELECT id FROM options_activity")] == ['2']
+
+
+def test_store_misses_fall_back():
+    today = date.today()
+    since = (today - timedelta(days=3)).isoformat()
+    meta = {'since': since}
+    rows = [('{}',)] * 2
+
+    # A full page is the newest activity
+    assert covers(rows, 2, '', '', meta)
+    # A short page is only complete once the cron has synced the store
+    assert not covers(rows, 10, (today - timedelta(days=1)).isoformat(), '', meta)
+    # Nothing is covered by an empty store
+    assert not covers([], 10, today.isoformat(), '', {})
+
+
+def test_short_pages_of_a_synced_store_are_served():
+    today = now_et().date()
+    synced = last_trading_day(today).isoformat()
+    rows = [('{}',)] * 2
+
+    # Filled for a few days: ranges inside the stored window are complete
+    meta = {'since': (today - timedelta(days=3)).isoformat(), 'synced': synced}
+    assert covers(rows, 10, (today - timedelta(days=1)).isoformat(), '', meta)
+    assert not covers(rows, 10, (today - timedelta(days=10)).isoformat(), '', meta)
+    # ... but not the whole retention window a request without a range asks for
+    assert not covers(rows, 10, '', '', meta)
+
+    # Filled for the whole retention window: a ticker's short page is all its activity
+    meta = {'since': (today - timedelta(days=60)).isoformat(), 'synced': synced}
+    assert covers(rows, 10, '', '', meta)
+    assert covers([], 10, '', '', meta)
+    # Unless the cron stopped syncing before the end of the range
+    stale = {**meta, 'synced': (today - timedelta(days=7)).isoformat()}
+    assert not covers(rows, 10, '', '', stale)
+    assert covers(rows, 10, '', (today - timedelta(days=8)).isoformat(), stale)
+
+
+def test_mark_synced(tmp_path):
+    con = connect(str(tmp_path / 'activity.db'))
+    mark_synced(con)
+    mark_synced(con)
+    meta = dict(con.execute(META_QUERY).fetchall())
+    assert meta == {'since': date.today().isoformat(), 'synced': now_et().date().isoformat()}
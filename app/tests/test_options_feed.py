@@ -0,0 +1,41 @@
+import asyncio
+
+import orjson
+import pytest
+
+from utils.options_feed import CursorError, OptionsFeed, encode_cursor
+
+
+def make_feed(tmp_path, count=5):
+    items = [
+        {'id': str(i), 'ticker': 'AAPL' if i % 2 else 'MSFT', 'put_call': 'Calls', 'sentiment': 'Bullish', 'cost_basis': str(i * 1000)}
+        for i in range(count)
+    ]
+    path = tmp_path / 'data.json'
+    path.write_bytes(orjson.dumps(items))
+    feed = OptionsFeed(str(path))
+    asyncio.run(feed.refresh())
+    return feed
+
+
+def test_cursor_pages_through_the_feed(tmp_path):
+    feed = make_feed(tmp_path)
+    first, cursor = feed.page(limit=2)
+    second, cursor = feed.page(cursor=cursor, limit=2)
+    third, cursor = feed.page(cursor=cursor, limit=2)
+    assert [item['id'] for item in first + second + third] == ['0', '1', '2', '3', '4']
+    assert cursor is None
+
+
+def test_legacy_last_id_maps_to_a_cursor(tmp_path):
+    feed = make_feed(tmp_path)
+    items, _ = feed.page(cursor=encode_cursor('1'), limit=100)
+    assert [item['id'] for item in items] == ['2', '3', '4']
+    with pytest.raises(CursorError):
+        feed.page(cursor=encode_cursor('gone'))
+
+
+def test_ticker_filter(tmp_path):
+    feed = make_feed(tmp_path)
+    items, _ = feed.page(ticker='AAPL', limit=10)
+    assert [item['id'] for item in items] == ['1', '3']
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+import numpy as np
+
+from utils.price_matrix import PriceMatrix, correlate, correlation_window, save_price_matrix
+from utils.price_store import create_prices_table, upsert_prices
+
+
+# Mon 2024-07-01 .. Fri 2024-07-12 with Independence Day (Thu 07-04) in between
+SESSIONS = ['2024-07-01', '2024-07-02', '2024-07-03', '2024-07-05', '2024-07-08',
+            '2024-07-09', '2024-07-10', '2024-07-11', '2024-07-12']
+
+
+def matrix(rows, dates=SESSIONS):
+    symbols = list(rows)
+    close = np.array([rows[symbol] for symbol in symbols], dtype=np.float64)
+    arrays = {'close': close, 'volume': np.ones_like(close), 'high': close, 'low': close}
+    return PriceMatrix({'version': '1', 'symbols': symbols, 'dates': dates}, arrays)
+
+
+def test_correlate_over_common_sessions():
+    base = np.array([1, 3, 2, 5, 4, 6, 8, 7, 9], dtype=np.float64)
+    late = base * 2 + 1
+    late[0] = np.nan
+    window = correlation_window(matrix({'A': base, 'B': late, 'C': -base}), None, None, min_overlap=0.8)
+
+    values = correlate(window, 'A')
+    # B misses a day the others have, but still lines up on the ones it shares with A
+    assert np.allclose(values, [1, 1, -1])
+
+
+def test_correlate_requires_overlap():
+    base = np.arange(1, 10, dtype=np.float64)
+    sparse = base.copy()
+    sparse[:5] = np.nan
+    window = correlation_window(matrix({'A': base, 'B': sparse, 'C': base[::-1].copy()}), None, None)
+
+    assert 'B' not in window['index']
+    assert np.allclose(correlate(window, 'A'), [1, -1])
+
+
+def test_correlation_window_skips_non_sessions():
+    dates = SESSIONS[:3] + ['2024-07-04'] + SESSIONS[3:]
+    base = np.array([1, 3, 2, 100, 5, 4, 6, 8, 7, 9], dtype=np.float64)
+    other = base.copy()
+    other[3] = -100
+    window = correlation_window(matrix({'A': base, 'B': other}, dates), None, None)
+
+    assert window['centred'].shape == (2, len(SESSIONS))
+    assert np.allclose(correlate(window, 'A'), [1, 1])
+
+
+def prices_db(bars):
+    con = sqlite3.connect(':memory:')
+    create_prices_table(con)
+    upsert_prices(con, [(symbol, day, close, close, close, close, 100, 0) for symbol, day, close in bars])
+    return con
+
+
+def test_incremental_save(tmp_path):
+    directory = str(tmp_path / 'stocks')
+    con = prices_db([('AAPL', '2024-07-01', 1), ('AAPL', '2024-07-02', 2), ('MSFT', '2024-07-01', 10)])
+    save_price_matrix(con, directory)
+
+    # A corrected old bar is only picked up for refreshed symbols; new days,
+    # the partial last day and new symbols always are
+    upsert_prices(con, [
+        ('AAPL', '2024-07-01', 0.5, 0.5, 0.5, 0.5, 100, 0), ('MSFT', '2024-07-01', 5, 5, 5, 5, 100, 0),
+        ('AAPL', '2024-07-02', 2.5, 2.5, 2.5, 2.5, 100, 0), ('AAPL', '2024-07-03', 3, 3, 3, 3, 100, 0),
+        ('NVDA', '2024-06-28', 7, 7, 7, 7, 100, 0),
+    ])
+    saved = save_price_matrix(con, directory, refresh=('MSFT',))
+
+    assert saved.symbols == ['AAPL', 'MSFT', 'NVDA']
+    assert saved.dates == ['2024-06-28', '2024-07-01', '2024-07-02', '2024-07-03']
+    assert np.array_equal(saved['close'], [
+        [np.nan, 1, 2.5, 3],
+        [np.nan, 5, np.nan, np.nan],
+        [7, np.nan, np.nan, np.nan],
+    ], equal_nan=True)
+    # Refreshed and new symbols match a full rebuild
+    assert np.array_equal(save_price_matrix(con, directory, full=True)['close'][1:], saved['close'][1:], equal_nan=True)
+    # Only the two latest versions are kept
+    assert len([entry for entry in os.listdir(tmp_path) if entry.startswith('stocks-')]) == 2
@@ -0,0 +1,80 @@
+import asyncio
+import sqlite3
+
+from utils.price_store import PriceLoader, migrate_ticker_tables, read_prices, upsert_prices
+
+
+def test_migrate_ticker_tables():
+    con = sqlite3.connect(':memory:')
+    con.execute("CREATE TABLE stocks (symbol TEXT PRIMARY KEY, name TEXT)")
+    con.execute("CREATE TABLE \"BRK-B\" (date TEXT, open REAL, high REAL, low REAL, close REAL, volume INTEGER, change_percent REAL)")
+    con.executemany(
+        "INSERT INTO \"BRK-B\" VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [('2024-01-02', 1, 2, 0.5, 1.5, 100, 0.1), ('2024-01-03', 1.5, 2.5, 1, 2, 200, 0.2)]
+    )
+
+    assert migrate_ticker_tables(con) == 1
+    tables = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {'stocks', 'prices'}
+    assert list(read_prices(con, 'BRK-B', columns=['date', 'close'])['close']) == [1.5, 2]
+    # Already migrated databases are left alone
+    assert migrate_ticker_tables(con) == 0
+
+
+class FakeFMP:
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    async def get_historical_price_full(self, symbol, start_date, end_date):
+        self.calls.append((symbol, start_date))
+        # Newest first, like the provider
+        return {'historical': [bar for bar in self.history.get(symbol, [])[::-1] if start_date <= bar['date'] <= end_date]}
+
+
+def bar(day, price):
+    return {'date': day, 'open': price, 'high': price, 'low': price, 'close': price, 'volume': 100, 'changePercent': 0}
+
+
+def loaded(history, stored):
+    con = sqlite3.connect(':memory:')
+    migrate_ticker_tables(con)
+    upsert_prices(con, stored)
+    fmp = FakeFMP(history)
+    loader = PriceLoader(con, fmp, '2024-01-01', '2024-01-31')
+
+    async def run():
+        for symbol in history:
+            await loader.fetch(symbol)
+    asyncio.run(run())
+    loader.flush()
+    return con, fmp, loader
+
+
+def closes(con, symbol):
+    return list(read_prices(con, symbol, columns=['date', 'close'])['close'])
+
+
+def test_loader_only_fetches_from_the_last_stored_day():
+    stored = [('AAPL', '2024-01-02', 10, 10, 10, 10, 100, 0), ('AAPL', '2024-01-03', 11, 11, 11, 11, 100, 0)]
+    history = {
+        'AAPL': [bar('2024-01-02', 10), bar('2024-01-03', 11), bar('2024-01-04', 12)],
+        'MSFT': [bar('2024-01-02', 20), bar('2024-01-03', 21)],
+    }
+    con, fmp, loader = loaded(history, stored)
+
+    assert fmp.calls == [('AAPL', '2024-01-03'), ('MSFT', '2024-01-01')]
+    assert loader.refreshed == set()
+    assert closes(con, 'AAPL') == [10, 11, 12]
+    assert closes(con, 'MSFT') == [20, 21]
+
+
+def test_loader_refetches_split_adjusted_history():
+    stored = [('AAPL', '2024-01-02', 10, 10, 10, 10, 100, 0), ('AAPL', '2024-01-03', 11, 11, 11, 11, 100, 0)]
+    # A 2:1 split: the provider's whole history is adjusted, including the last stored day
+    history = {'AAPL': [bar('2024-01-02', 5), bar('2024-01-03', 5.5), bar('2024-01-04', 6)]}
+    con, fmp, loader = loaded(history, stored)
+
+    assert fmp.calls == [('AAPL', '2024-01-03'), ('AAPL', '2024-01-01')]
+    assert loader.refreshed == {'AAPL'}
+    assert closes(con, 'AAPL') == [5, 5.5, 6]
@@ -0,0 +1,47 @@
+import fakeredis
+
+from utils.reference_data import DEPENDENT_PREFIXES, drop_dependent_keys, invalidate_stale_keys
+
+
+def test_new_reference_version_keeps_the_file_cache_and_its_dependency_index():
+    redis_client = fakeredis.FakeRedis()
+    invalidate_stale_keys(redis_client, '1')
+    redis_client.set('file:stock-quote:AAPL:abc', b'body')
+    redis_client.sadd('deps:json/quote/AAPL.json', 'file:stock-quote:AAPL:abc')
+    redis_client.set('similar-etfs-SPY', b'[]')
+
+    # Same version: nothing is touched
+    assert invalidate_stale_keys(redis_client, '1') == 0
+    assert redis_client.exists('similar-etfs-SPY')
+
+    invalidate_stale_keys(redis_client, '2')
+    assert redis_client.exists('file:stock-quote:AAPL:abc')
+    assert redis_client.smembers('deps:json/quote/AAPL.json') == {b'file:stock-quote:AAPL:abc'}
+    assert not redis_client.exists('similar-etfs-SPY')
+
+
+def test_only_declared_dependent_keys_are_dropped():
+    redis_client = fakeredis.FakeRedis()
+    invalidate_stale_keys(redis_client, '1')
+    redis_client.set('full-searchbar-1', b'[]')
+    redis_client.set('get-quant-stats-AAPL', b'{}')
+    redis_client.set('options-watchlist-abc', b'{}')
+    redis_client.set('LIMITER/127.0.0.1/searchbar', 1)
+
+    assert invalidate_stale_keys(redis_client, '2') == 2
+    assert sorted(redis_client.keys()) == [b'LIMITER/127.0.0.1/searchbar', b'options-watchlist-abc', b'reference:version']
+
+
+def test_long_lived_api_keys_are_dropped():
+    redis_client = fakeredis.FakeRedis()
+    keys = ['options-gex-dex-AAPL-gex', 'options-oi-AAPL-strike', 'info-text-pe', 'shareholders-AAPL',
+            'earnings-call-transcripts-AAPL-2024-1', 'insider-trading-statistics-AAPL', 'ipo-calendar-2024',
+            'heatmap', 'wiim-AAPL', 'reddit-tracker', 'popular-etfs']
+    for key in keys:
+        assert key.startswith(DEPENDENT_PREFIXES)
+        redis_client.set(key, b'[]', ex=3600*60)
+    redis_client.set('file:stock-quote:AAPL', b'{}')
+
+    # Also run without a version change, e.g. after publish_db.py
+    assert drop_dependent_keys(redis_client) == len(keys)
+    assert redis_client.keys() == [b'file:stock-quote:AAPL']
@@ -0,0 +1,49 @@
+from utils.column_table import ColumnTable
+from utils.screener_store import ScreenerStore
+
+
+ROWS = [
+    {'symbol': 'A', 'marketCap': 10, 'pe': 2},
+    {'symbol': 'B', 'marketCap': 10, 'pe': 2.5},
+    {'symbol': 'C', 'marketCap': None, 'pe': None},
+    {'symbol': 'D', 'marketCap': 5},
+    {'symbol': 'E', 'marketCap': 10, 'pe': 1.0},
+]
+
+
+def test_rows_round_trip(tmp_path):
+    ColumnTable.from_rows(ROWS).save(str(tmp_path / 'screener'))
+    store = ScreenerStore(ColumnTable.load(str(tmp_path / 'screener')))
+
+    rows = store.rows(['symbol', 'marketCap', 'pe'])
+    assert rows == ROWS
+    # Ints stay ints and floats stay floats, even within one column
+    assert [type(row.get('pe')) for row in rows] == [int, float, type(None), type(None), float]
+
+
+def test_ties_keep_the_original_order():
+    store = ScreenerStore.from_rows(ROWS)
+
+    for sort_by in ('marketCap', 'pe'):
+        for ascending in (False, True):
+            expected = sorted(
+                (row for row in ROWS if row.get(sort_by) is not None),
+                key=lambda row: row[sort_by], reverse=not ascending
+            )
+            total, page = store.query(sort_by=sort_by, ascending=ascending, columns=['symbol'])
+            assert total == len(ROWS)
+            # NaN last in both directions
+            assert [row['symbol'] for row in page] == [row['symbol'] for row in expected] + [
+                row['symbol'] for row in ROWS if row.get(sort_by) is None
+            ]
+
+
+def test_rows_match_the_source_rows():
+    rows = [
+        {'symbol': 'A', 'sector': 'Tech', 'tags': ['x'], 'marketCap': 1},
+        {'symbol': 'B', 'sector': None, 'marketCap': 2.5},
+        {'symbol': 'C', 'tags': None},
+    ]
+    keys = ['symbol', 'sector', 'tags', 'marketCap', 'unknown']
+    expected = [{key: row[key] for key in keys if key in row} for row in rows]
+    assert ScreenerStore.from_rows(rows).rows(keys) == expected
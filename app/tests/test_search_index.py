@@ -0,0 +1,110 @@
+import random
+import re
+
+from utils.search_index import NO_MATCH, PRIORITY_STRATEGIES, SearchIndex
+
+
+ITEMS = [
+    {'symbol': 'NVDA', 'name': 'NVIDIA Corporation', 'type': 'Stock', 'marketCap': 3_000_000_000_000, 'isin': 'US67066G1040'},
+    {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'type': 'Stock', 'marketCap': 3_100_000_000_000, 'isin': 'US5949181045'},
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'type': 'Stock', 'marketCap': 3_200_000_000_000, 'isin': 'US0378331005'},
+    {'symbol': 'APLE', 'name': 'Apple Hospitality REIT, Inc.', 'type': 'Stock', 'marketCap': 3_500_000_000, 'isin': None},
+    {'symbol': 'A', 'name': 'Agilent Technologies, Inc.', 'type': 'Stock', 'marketCap': 40_000_000_000, 'isin': None},
+    {'symbol': 'BRK.B', 'name': 'Berkshire Hathaway Inc.', 'type': 'Stock', 'marketCap': 900_000_000_000, 'isin': None},
+    {'symbol': 'BRK-B', 'name': 'Berkshire Hathaway Inc.', 'type': 'Stock', 'marketCap': 900_000_000_000, 'isin': None},
+    {'symbol': 'SPY', 'name': 'SPDR S&P 500 ETF Trust', 'type': 'ETF', 'isin': None},
+    {'symbol': 'MS', 'name': 'Morgan Stanley', 'type': 'Stock', 'marketCap': 150_000_000_000, 'isin': None},
+    {'symbol': 'META', 'name': 'Meta Platforms, Inc.', 'type': 'Stock', 'marketCap': 1_200_000_000_000, 'isin': None},
+]
+
+
+def baseline_score(item, query):
+    # calculate_score() of the /searchbar handler the index replaced
+    name, symbol, query = item['name'].lower(), item['symbol'].lower(), query.lower()
+    if len(query) == 1:
+        if symbol == query:
+            score = PRIORITY_STRATEGIES['exact_symbol_match']
+        elif name == query:
+            score = PRIORITY_STRATEGIES['exact_name_match']
+        else:
+            score = NO_MATCH
+    elif symbol == query:
+        score = PRIORITY_STRATEGIES['exact_symbol_match']
+    elif symbol.startswith(query):
+        score = PRIORITY_STRATEGIES['symbol_prefix_match']
+    elif name == query:
+        score = PRIORITY_STRATEGIES['exact_name_match']
+    elif name.startswith(query):
+        score = PRIORITY_STRATEGIES['name_prefix_match']
+    elif query in symbol:
+        score = PRIORITY_STRATEGIES['symbol_contains']
+    elif query in name:
+        score = PRIORITY_STRATEGIES['name_contains']
+    else:
+        score = NO_MATCH
+    return score + (1 if '.' in symbol else 0)
+
+
+def baseline_search(items, query, limit=5):
+    if not query:
+        return []
+    exact = next((item for item in items if item.get('isin') == query), None)
+    if exact:
+        return [exact]
+    pattern = re.compile(re.escape(query.lower()), re.IGNORECASE)
+    matches = [item for item in items if pattern.search(item['name']) or pattern.search(item['symbol'])]
+    return sorted(
+        matches,
+        key=lambda item: (baseline_score(item, query), 0 if item.get('marketCap') is None else -item['marketCap'])
+    )[:limit]
+
+
+def symbols(results):
+    return [item['symbol'] for item in results]
+
+
+def test_search_matches_the_baseline_ranking():
+    index = SearchIndex(ITEMS)
+    for query in ('a', 'ap', 'APPLE', 'corp', 'brk', 'hathaway', 'ms', 'm', 'inc', 'p 5', 'US0378331005', 'zzz'):
+        assert symbols(index.search(query)) == symbols(baseline_search(ITEMS, query)), query
+
+
+def test_search_matches_the_baseline_on_random_universes():
+    rng = random.Random(7)
+    alphabet = 'abcde.'
+    for _ in range(20):
+        items = [{
+            'symbol': ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).upper(),
+            'name': ' '.join(''.join(rng.choice('abcde') for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 3))),
+            'marketCap': rng.choice([None, rng.randint(1, 5) * 10**9]),
+        } for _ in range(60)]
+        index = SearchIndex(items)
+        for query in ['a', 'b.', 'ab', 'cd e', 'abc', 'ea', 'dd'] + [rng.choice(items)['symbol'] for _ in range(5)]:
+            assert index.search(query) == baseline_search(items, query), query
+
+
+def test_exact_symbol_comes_first():
+    index = SearchIndex(ITEMS)
+    # MS is much smaller than MSFT but matches exactly
+    assert symbols(index.search('ms'))[:2] == ['MS', 'MSFT']
+    assert symbols(index.search('A'))[0] == 'A'
+    # The dotted class share ranks after its dash spelling
+    assert symbols(index.search('brk')) == ['BRK-B', 'BRK.B']
+
+
+def test_empty_and_unmatched_queries():
+    index = SearchIndex(ITEMS)
+    assert index.search('') == []
+    assert index.search('qqqqq') == []
+    assert index.fuzzy_search('') == []
+    assert index.fuzzy_search('!!') == []
+    assert index.fuzzy_search('qqqqqqqq') == []
+
+
+def test_typos_go_through_the_fuzzy_path():
+    index = SearchIndex(ITEMS)
+    for query, expected in (('nvidai', 'NVDA'), ('micorsoft', 'MSFT'), ('berkshre hath', 'BRK-B'), ('morgn stanly', 'MS')):
+        assert index.search(query) == []
+        assert symbols(index.fuzzy_search(query))[0] == expected, query
+    # Closer matches rank first, ties by market cap
+    assert symbols(index.fuzzy_search('appel')) == ['AAPL', 'APLE']
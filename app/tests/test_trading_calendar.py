@@ -0,0 +1,61 @@
+from datetime import date, datetime
+
+from utils.cache_policy import ttl_for
+from utils.trading_calendar import (
+    AFTER_HOURS, CLOSED, ET, PRE_MARKET, REGULAR, early_closes, holidays, is_trading_day, market_session,
+    next_session_change,
+)
+
+
+def et(*args):
+    return datetime(*args, tzinfo=ET)
+
+
+def test_holidays():
+    assert holidays(2024) == {
+        date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 27),
+        date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2), date(2024, 11, 28), date(2024, 12, 25),
+    }
+    # Observed on the Monday / Friday next to a weekend holiday
+    assert date(2022, 6, 20) in holidays(2022) and date(2022, 12, 26) in holidays(2022)
+    assert date(2021, 7, 5) in holidays(2021)
+    # A Saturday New Year's Day closes nothing in the previous year
+    assert date(2021, 12, 31) not in holidays(2021) and date(2022, 1, 1) not in holidays(2022)
+    # Juneteenth only since 2022
+    assert date(2021, 6, 18) not in holidays(2021)
+    assert not is_trading_day(date(2025, 1, 9))
+    assert not is_trading_day('2024-07-06') and is_trading_day('2024-07-05')
+
+
+def test_early_closes():
+    assert early_closes(2024) == {date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)}
+    # July 3rd is the observed holiday in 2020, December 24th a Saturday in 2022
+    assert date(2020, 7, 3) not in early_closes(2020)
+    assert early_closes(2022) == {date(2022, 11, 25)}
+
+    assert market_session(et(2024, 7, 3, 12, 59)) == REGULAR
+    assert market_session(et(2024, 7, 3, 13, 0)) == AFTER_HOURS
+    assert market_session(et(2024, 7, 3, 17, 0)) == CLOSED
+    assert market_session(et(2024, 7, 2, 16, 30)) == AFTER_HOURS
+
+
+def test_session_changes():
+    assert market_session(et(2024, 7, 1, 3, 59)) == CLOSED
+    assert market_session(et(2024, 7, 1, 9, 0)) == PRE_MARKET
+    assert next_session_change(et(2024, 7, 1, 9, 0)) == et(2024, 7, 1, 9, 30)
+    # Over the holiday, to the next pre-market open
+    assert next_session_change(et(2024, 7, 3, 17, 30)) == et(2024, 7, 5, 4, 0)
+    assert next_session_change(et(2024, 7, 12, 21, 0)) == et(2024, 7, 15, 4, 0)
+
+
+def test_ttl_for():
+    assert ttl_for(900, et(2024, 7, 12, 21, 0)) == 900
+    assert ttl_for('intraday', et(2024, 7, 1, 10, 0)) == 180
+    assert ttl_for('live', et(2024, 7, 3, 14, 0)) == 120
+    # Closed TTLs stop at the next session change...
+    assert ttl_for('live', et(2024, 7, 12, 21, 0)) == 12 * 3600
+    assert ttl_for('daily', et(2024, 7, 12, 21, 0)) == 55 * 3600
+    assert ttl_for('daily', et(2024, 7, 3, 17, 30)) == 34 * 3600 + 1800
+    # ...but never drop below the regular one
+    assert ttl_for('intraday', et(2024, 7, 1, 9, 0)) == 600
+    assert ttl_for('intraday', et(2024, 7, 1, 9, 28)) == 180
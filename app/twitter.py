@@ -21,7 +21,6 @@ access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
 
 con = sqlite3.connect('stocks.db')
 cursor = con.cursor()
-cursor.execute("PRAGMA journal_mode = wal")
 cursor.execute("SELECT DISTINCT symbol FROM stocks")
 stock_symbols = [row[0] for row in cursor.fetchall()]
 
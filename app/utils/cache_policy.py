@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from utils.trading_calendar import CLOSED, REGULAR, market_session, next_session_change, now_et
+
+
+# Endpoint class -> Redis TTL in seconds during the regular session, during
+# pre/after hours, and while the market is closed. Data that follows the tape
+# doesn't change overnight or on weekends, so there is nothing to rebuild.
+TTL_POLICY = {
+    'live': (60, 60*2, 3600*12),
+    'intraday': (60*3, 60*10, 3600*12),
+    'daily': (3600*24, 3600*24, 3600*24*4),
+    'static': (3600*3600, 3600*3600, 3600*3600),
+}
+
+
+def ttl_for(policy, now=None):
+    """
+    TTL for an endpoint class at `now` (default: the current time). Plain
+    numbers are returned as they are. A stretched TTL never runs past the
+    next session change, so the first request of a session sees fresh data.
+    """
+    if isinstance(policy, int):
+        return policy
+    regular, extended, closed = TTL_POLICY[policy]
+    now = now_et() if now is None else now
+    session = market_session(now)
+    if session == REGULAR:
+        return regular
+    ttl = closed if session == CLOSED else extended
+    remaining = (next_session_change(now) - now) // timedelta(seconds=1)
+    return max(regular, min(ttl, remaining))
@@ -0,0 +1,191 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import orjson
+
+from utils.helper import write_json
+
+
+# String columns with at most this many distinct values are stored as category
+# codes (filterable); anything else goes to the string table
+MAX_CATEGORIES = 512
+ARRAYS = ('numeric', 'integer', 'codes', 'offsets', 'blob', 'present')
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ColumnTable:
+    """
+    Read-only columnar copy of a list of row dicts.
+
+    Numbers live in one float64 matrix (NaN for null), with a mask of the ones
+    that were ints, low cardinality strings in an int32 code matrix, and everything else (names, ISINs, lists, ...) as
+    orjson encoded values in a single string table (offsets + blob). A
+    presence matrix keeps "missing" apart from null, so rows round-trip exactly.
+
+    A table saved with save() is loaded with np.load(mmap_mode='r'): every
+    worker maps the same pages instead of holding its own copy of the data.
+    """
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.size = manifest['size']
+        self.numeric_names = manifest['numeric']
+        self.categorical_names = list(manifest['categorical'])
+        self.categories = [manifest['categorical'][name] for name in self.categorical_names]
+        self.text_names = manifest['text']
+        self.names = self.numeric_names + self.categorical_names + self.text_names
+        self.position = {name: pos for pos, name in enumerate(self.names)}
+        # name -> (kind, row in its own matrix)
+        self.slots = {name: ('numeric', pos) for pos, name in enumerate(self.numeric_names)}
+        self.slots.update((name, ('categorical', pos)) for pos, name in enumerate(self.categorical_names))
+        self.slots.update((name, ('text', pos)) for pos, name in enumerate(self.text_names))
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+
+        self.numeric_columns = {name: self.numeric[pos] for pos, name in enumerate(self.numeric_names)}
+        self.categorical_columns = {
+            name: ({category: code for code, category in enumerate(categories)}, self.codes[pos])
+            for pos, (name, categories) in enumerate(zip(self.categorical_names, self.categories))
+        }
+
+    @classmethod
+    def from_rows(cls, rows):
+        size = len(rows)
+        kinds = {}
+        for row in rows:
+            for key, value in row.items():
+                kind = kinds.setdefault(key, set())
+                if value is not None:
+                    kind.add('number' if _is_number(value) else 'string' if isinstance(value, str) else 'other')
+
+        numeric_names, categorical, text_names = [], {}, []
+        for key, kind in kinds.items():
+            if kind == {'number'}:
+                numeric_names.append(key)
+            elif kind == {'string'}:
+                distinct = {row[key] for row in rows if row.get(key) is not None}
+                if len(distinct) <= MAX_CATEGORIES:
+                    categorical[key] = sorted(distinct)
+                else:
+                    text_names.append(key)
+            else:
+                text_names.append(key)
+
+        names = numeric_names + list(categorical) + text_names
+        present = np.array([[key in row for row in rows] for key in names], dtype=bool).reshape(len(names), size)
+
+        numeric = np.array(
+            [[np.nan if row.get(key) is None else row[key] for row in rows] for key in numeric_names],
+            dtype=np.float64
+        ).reshape(len(numeric_names), size)
+        # Mixed columns keep ints as ints on the way out
+        integer = np.array(
+            [[isinstance(row.get(key), int) for row in rows] for key in numeric_names],
+            dtype=bool
+        ).reshape(len(numeric_names), size)
+
+        codes = np.full((len(categorical), size), -1, dtype=np.int32)
+        for pos, (key, categories) in enumerate(categorical.items()):
+            lookup = {category: code for code, category in enumerate(categories)}
+            codes[pos] = [lookup.get(row.get(key), -1) for row in rows]
+
+        chunks = []
+        offsets = np.zeros((len(text_names), size + 1), dtype=np.int64)
+        total = 0
+        for pos, key in enumerate(text_names):
+            offsets[pos, 0] = total
+            for idx, row in enumerate(rows):
+                if key in row:
+                    value = orjson.dumps(row[key], option=orjson.OPT_SERIALIZE_NUMPY)
+                    chunks.append(value)
+                    total += len(value)
+                offsets[pos, idx + 1] = total
+        blob = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+
+        manifest = {
+            'version': str(time.time_ns()),
+            'size': size,
+            'numeric': numeric_names,
+            'categorical': categorical,
+            'text': text_names,
+        }
+        arrays = {'numeric': numeric, 'integer': integer, 'codes': codes, 'offsets': offsets, 'blob': blob, 'present': present}
+        return cls(manifest, arrays)
+
+    def value(self, name, idx):
+        if not self.present[self.position[name], idx]:
+            raise KeyError(name)
+        kind, pos = self.slots[name]
+        if kind == 'numeric':
+            value = float(self.numeric[pos, idx])
+            if value != value:
+                return None
+            return int(value) if self.integer[pos, idx] else value
+        if kind == 'categorical':
+            code = int(self.codes[pos, idx])
+            return None if code < 0 else self.categories[pos][code]
+        start, end = self.offsets[pos, idx], self.offsets[pos, idx + 1]
+        return orjson.loads(bytes(self.blob[start:end]))
+
+    def row(self, idx, keys):
+        """The row as a dict limited to `keys`, with the same missing keys as the source row."""
+        present = self.present[:, idx]
+        return {key: self.value(key, idx) for key in keys if key in self.position and present[self.position[key]]}
+
+    def column(self, name):
+        """Every value of a column in row order, decoded in one pass (None where a row lacks it)."""
+        kind, pos = self.slots[name]
+        if kind == 'numeric':
+            return [
+                None if value != value else int(value) if integer else value
+                for value, integer in zip(self.numeric[pos].tolist(), self.integer[pos].tolist())
+            ]
+        if kind == 'categorical':
+            # Code -1 (null) picks the trailing None
+            categories = list(self.categories[pos]) + [None]
+            return [categories[code] for code in self.codes[pos].tolist()]
+        offsets = self.offsets[pos].tolist()
+        blob = bytes(self.blob[offsets[0]:offsets[-1]])
+        start = offsets[0]
+        return [
+            orjson.loads(blob[begin - start:end - start]) if end > begin else None
+            for begin, end in zip(offsets, offsets[1:])
+        ]
+
+    def text_values(self, name):
+        return self.column(name)
+
+    def save(self, directory):
+        """
+        Write the table as a new version directory next to `directory`, then
+        atomically point `directory`.json at it. Readers holding the previous
+        version keep their mapping; only the two latest versions are kept.
+        """
+        parent, base = os.path.split(directory.rstrip('/'))
+        version_dir = os.path.join(parent, f"{base}-{self.version}")
+        os.makedirs(version_dir, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(version_dir, f"{name}.npy"), getattr(self, name))
+        write_json(os.path.join(version_dir, 'manifest.json'), self.manifest, compress=False)
+        write_json(f"{directory}.json", {'path': os.path.basename(version_dir)}, compress=False)
+
+        versions = sorted(entry for entry in os.listdir(parent or '.') if entry.startswith(f"{base}-"))
+        for entry in versions[:-2]:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory):
+        """Map the version `directory`.json currently points at."""
+        with open(f"{directory}.json", 'rb') as file:
+            pointer = orjson.loads(file.read())
+        version_dir = os.path.join(os.path.dirname(directory.rstrip('/')), pointer['path'])
+        with open(os.path.join(version_dir, 'manifest.json'), 'rb') as file:
+            manifest = orjson.loads(file.read())
+        arrays = {name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+        return cls(manifest, arrays)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.db_snapshot import snapshot_version
+
+
+# All API reads share one bounded thread pool, so a burst of cache misses can't
+# spawn unbounded threads or starve asyncio.to_thread users
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('DB_POOL_WORKERS', 8)), thread_name_prefix='sqlite-ro')
+# How often (seconds) a pool checks whether a new snapshot was published
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv('DB_SNAPSHOT_CHECK_INTERVAL', 5))
+
+
+class ReadOnlyPool:
+    """
+    Pool of read-only connections to one SQLite database for the API handlers.
+
+    Connections are opened with mode=ro and query_only, and keep a statement
+    cache, so the constant queries of the handlers are prepared once per
+    connection. Queries run on DB_EXECUTOR, never on the event loop.
+
+    When publish_snapshot() swaps the database under db_path, connections to
+    the previous version are closed and reopened lazily, on their next use.
+    """
+
+    def __init__(self, db_path, size=4, cached_statements=128):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        # One slot per connection; a slot holds None until it is first used,
+        # then (connection, snapshot version it was opened on)
+        self.slots = queue.LifoQueue()
+        self.version = snapshot_version(db_path)
+        self.checked = time.monotonic()
+        for _ in range(size):
+            self.slots.put(None)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _current_version(self):
+        # One stat() per interval, not per query
+        now = time.monotonic()
+        if now - self.checked >= SNAPSHOT_CHECK_INTERVAL:
+            self.checked = now
+            self.version = snapshot_version(self.db_path)
+        return self.version
+
+    def _run(self, fn):
+        conn, version = self.slots.get() or (None, None)
+        try:
+            current = self._current_version()
+            if conn is not None and version != current:
+                conn.close()
+                conn = None
+            if conn is None:
+                conn, version = self._connect(), current
+            return fn(conn)
+        except sqlite3.DatabaseError:
+            # Don't hand a possibly broken connection to the next caller
+            if conn is not None:
+                conn.close()
+            conn = None
+            raise
+        finally:
+            self.slots.put(None if conn is None else (conn, version))
+
+    async def run(self, fn):
+        """Run fn(connection) on the DB thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(DB_EXECUTOR, self._run, fn)
+
+    async def fetchone(self, query, params=()):
+        return await self.run(lambda conn: conn.execute(query, params).fetchone())
+
+    async def fetchall(self, query, params=()):
+        return await self.run(lambda conn: conn.execute(query, params).fetchall())
+
+    def close(self):
+        while not self.slots.empty():
+            slot = self.slots.get_nowait()
+            if slot is not None:
+                slot[0].close()
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import time
+
+
+# Published databases live here as <name>-<version>.db; <name>.db in the
+# working directory is a symlink to the current one. Snapshots are read-only
+# and stay in rollback journal mode, so readers must not switch them to WAL
+SNAPSHOT_DIR = 'snapshots'
+DATABASES = ('stocks', 'etf', 'crypto', 'institute')
+KEEP_VERSIONS = 2
+
+
+def snapshot_version(db_path):
+    """
+    Identity of the file `db_path` currently resolves to. It changes when a
+    new snapshot is published, so readers can compare it with the one they
+    opened. None if there is no such file.
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def publish_snapshot(source_path, name, snapshot_dir=SNAPSHOT_DIR, link_dir='.'):
+    """
+    Compact `source_path` into a new versioned snapshot and atomically point
+    `link_dir`/`name`.db at it. Connections that are already open keep
+    reading the previous version; only new connections see the new one, and
+    of the long-lived readers only ReadOnlyPool reopens on its own.
+    Returns the snapshot path.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    version = time.time_ns()
+    target = os.path.join(snapshot_dir, f"{name}-{version}.db")
+    partial = f"{target}.tmp"
+
+    con = sqlite3.connect(source_path)
+    try:
+        # Fresh statistics for the query planner, then a defragmented copy
+        con.execute("ANALYZE")
+        con.commit()
+        con.execute("VACUUM INTO ?", (partial,))
+    finally:
+        con.close()
+
+    con = sqlite3.connect(partial)
+    try:
+        con.execute("PRAGMA journal_mode = DELETE")
+        result = con.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        con.close()
+    if result != 'ok':
+        os.remove(partial)
+        raise sqlite3.DatabaseError(f"Snapshot of {source_path} failed quick_check: {result}")
+    os.replace(partial, target)
+
+    link = os.path.join(link_dir, f"{name}.db")
+    replaced_file = os.path.exists(link) and not os.path.islink(link)
+    temp_link = f"{link}.{version}.tmp"
+    os.symlink(os.path.relpath(target, link_dir), temp_link)
+    os.replace(temp_link, link)
+    if replaced_file:
+        # Journal files of the plain database the symlink replaced
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(link + suffix):
+                os.remove(link + suffix)
+
+    versions = sorted(
+        entry for entry in os.listdir(snapshot_dir)
+        if entry.startswith(f"{name}-") and entry.endswith('.db') and entry[len(name) + 1:-3].isdigit()
+    )
+    for entry in versions[:-KEEP_VERSIONS]:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(os.path.join(snapshot_dir, entry + suffix)):
+                os.remove(os.path.join(snapshot_dir, entry + suffix))
+    return target
+
@@ -0,0 +1,605 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import string
+from collections import OrderedDict, defaultdict
+from email.utils import formatdate, parsedate_to_datetime
+from functools import partial
+
+import orjson
+
+from fastapi.responses import FileResponse, Response
+from redis.exceptions import LockError
+
+from utils.cache_policy import ttl_for
+from utils.helper import CHANGES_CHANNEL, PRECOMPRESS_SUFFIXES
+
+
+# Size cap of the per-worker cache tier in front of Redis
+L1_MAX_BYTES = int(os.getenv('L1_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Single-flight: how long one worker may hold the rebuild lock for a key, and
+# how long the last built value stays around to be served while it does
+REBUILD_LOCK_SECONDS = 10
+STALE_SECONDS = int(os.getenv('CACHE_STALE_SECONDS', 300))
+# Entries built from files whose writer announces rewrites (utils.helper.write_json)
+# live until their files change, capped at this age
+MAX_AGE = int(os.getenv('FILE_CACHE_MAX_AGE', 7 * 24 * 3600))
+# Every other entry is keyed by the signature of its files, so a rewrite misses
+# anyway and the TTL only bounds how long a superseded entry lingers in Redis
+SIGNATURE_MAX_AGE = int(os.getenv('FILE_CACHE_SIGNATURE_MAX_AGE', 24 * 3600))
+
+# Endpoint -> (path template under json/, fallback body, Redis TTL). The TTL is
+# an endpoint class of TTL_POLICY (utils/cache_policy.py) or a fixed number of seconds.
+# A path template can also be a dict, in which case the files are stitched into
+# one JSON object ({"quarter": ..., "annual": ...}) without being decoded.
+FILE_ENDPOINTS = {
+    'correlation-ticker': ('json/correlation/companies/{ticker}.json', b'[]', 'daily'),
+    'stock-rating': ('json/ta-rating/{ticker}.json', b'{}', 'daily'),
+    'historical-price': ('json/historical-price/{time_period}/{ticker}.json', b'[]', 'daily'),
+    'export-price-data': ('json/export/price/{time_period}/{ticker}.json', b'[]', 'daily'),
+    'one-day-price': ('json/one-day-price/{ticker}.json', b'[]', 'intraday'),
+    'similar-stocks': ('json/similar-stocks/{ticker}.json', b'[]', 'daily'),
+    'market-movers': ('json/market-movers/markethours/{params}.json', b'[]', 'intraday'),
+    'mini-plots-index': ('json/mini-plots-index/data.json', b'[]', 'intraday'),
+    'market-news': ('json/market-news/{news_type}.json', b'[]', 'intraday'),
+    'stock-news': ('json/market-news/companies/{ticker}.json', b'[]', 60*30),
+    'stock-press-release': ('json/market-news/press-releases/{ticker}.json', b'[]', 60*60),
+    'stock-dividend': ('json/dividends/companies/{ticker}.json', b'{"history":[]}', 'static'),
+    'stock-quote': ('json/quote/{ticker}.json', b'{}', 'live'),
+    'stock-income': ({
+        'quarter': 'json/financial-statements/income-statement/quarter/{ticker}.json',
+        'annual': 'json/financial-statements/income-statement/annual/{ticker}.json',
+    }, b'[]', 'daily'),
+    'stock-balance-sheet': ({
+        'quarter': 'json/financial-statements/balance-sheet-statement/quarter/{ticker}.json',
+        'annual': 'json/financial-statements/balance-sheet-statement/annual/{ticker}.json',
+    }, b'[]', 'daily'),
+    'stock-ratios': ({
+        'quarter': 'json/financial-statements/ratios/quarter/{ticker}.json',
+        'annual': 'json/financial-statements/ratios/annual/{ticker}.json',
+    }, b'[]', 'daily'),
+    'stock-cash-flow': ({
+        'quarter': 'json/financial-statements/cash-flow-statement/quarter/{ticker}.json',
+        'annual': 'json/financial-statements/cash-flow-statement/annual/{ticker}.json',
+    }, b'[]', 'daily'),
+    'economic-calendar': ('json/economic-calendar/calendar.json', b'[]', 'daily'),
+    'earnings-calendar': ('json/earnings-calendar/calendar.json', b'[]', 'daily'),
+    'dividends-calendar': ('json/dividends-calendar/calendar.json', b'[]', 'daily'),
+    'stock-splits-calendar': ('json/stock-splits-calendar/calendar.json', b'[]', 'daily'),
+    'stockdeck': ('json/stockdeck/{ticker}.json', b'[]', 'daily'),
+    'analyst-summary-rating': ('json/analyst/summary/{ticker}.json', b'{}', 60*60),
+    'analyst-ticker-history': ('json/analyst/history/{ticker}.json', b'[]', 60*60),
+    'congress-trading-ticker': ('json/congress-trading/company/{ticker}.json', b'[]', 15*60),
+    'cik-data': ('json/hedge-funds/companies/{cik}.json', b'[]', 'static'),
+    'all-hedge-funds': ('json/hedge-funds/all-hedge-funds.json', b'[]', 'static'),
+    'etf-holdings': ('json/etf/holding/{ticker}.json', b'{}', 'intraday'),
+    'etf-sector-weighting': ('json/etf-sector/{ticker}.json', b'[]', 'static'),
+    'all-etf-tickers': ('json/all-symbols/etfs.json', b'[]', 'daily'),
+    'all-crypto-tickers': ('json/all-symbols/cryptos.json', b'[]', 'daily'),
+    'congress-rss-feed': ('json/congress-trading/rss-feed/data.json', b'[]', 60*15),
+    'historical-sector-price': ('json/sector/{sector}.json', b'[]', 60*60),
+    'ticker-mentioning': ('json/ticker-mentioning/data.json', b'[]', 'daily'),
+    'top-etf-ticker-holder': ('json/top-etf-ticker-holder/{ticker}.json', b'[]', 'daily'),
+    'all-etf-providers': ('json/all-etf-providers/data.json', b'[]', 'daily'),
+    'etf-provider': ('json/etf/provider/{etf_provider}.json', b'[]', 'intraday'),
+    'etf-bitcoin-list': ('json/etf-bitcoin-list/data.json', b'[]', 'daily'),
+    'analyst-estimate': ('json/analyst-estimate/{ticker}.json', b'[]', 'daily'),
+    'insider-trading': ('json/insider-trading/history/{ticker}.json', b'[]', 'daily'),
+    'get-executives': ('json/executives/{ticker}.json', b'[]', 'daily'),
+    'get-sec-filings': ('json/sec-filings/{ticker}.json', b'[]', 'daily'),
+    'trending': ('json/trending/data.json', b'[]', 'intraday'),
+    'pre-post-quote': ('json/pre-post-quote/{ticker}.json', b'{}', 'live'),
+    'get-quote': ('json/quote/{ticker}.json', b'{}', 'live'),
+    'options-contract-history': ('json/hottest-contracts/contracts/{contract_id}.json', b'[]', 3600*60),
+    'options-stats-ticker': ('json/options-stats/companies/{ticker}.json', b'{}', 'intraday'),
+    'options-gex-ticker': ('json/options-gex/companies/{ticker}.json', b'[]', 'static'),
+    'options-historical-data-ticker': ('json/options-historical-data/companies/{ticker}.json', b'[]', 'static'),
+    'options-historical-flow': ('json/options-historical-data/flow-data/{selected_date}.json', b'[]', 'static'),
+    'options-flow-feed': ('json/options-flow/feed/data.json', b'[]', 'live'),
+    'options-zero-dte': ('json/options-flow/zero-dte/data.json', b'[]', 'live'),
+    'options-bubble': ('json/options-bubble/{ticker}.json', b'{}', 'daily'),
+    'top-analysts': ('json/analyst/top-analysts.json', b'[]', 60*60*2),
+    'top-analysts-stocks': ('json/analyst/top-stocks.json', b'[]', 60*60*2),
+    'analyst-stats': ('json/analyst/analyst-db/{analyst_id}.json', b'{}', 60*60*2),
+    'dashboard-info': ('json/dashboard/data.json', b'[]', 'intraday'),
+    'sentiment-analysis': ('json/sentiment-analysis/{ticker}.json', b'[]', 'static'),
+    'trend-analysis': ('json/trend-analysis/{ticker}.json', b'[]', 'static'),
+    'price-analysis': ('json/price-analysis/{ticker}.json', b'{}', 'static'),
+    'fundamental-predictor-analysis': ('json/fundamental-predictor-analysis/{ticker}.json', b'{}', 'static'),
+    'value-at-risk': ('json/var/{ticker}.json', b'{}', 'static'),
+    'government-contract': ('json/government-contract/{ticker}.json', b'[]', 'static'),
+    'corporate-lobbying': ('json/corporate-lobbying/companies/{ticker}.json', b'[]', 'static'),
+    'enterprise-values': ('json/enterprise-values/{ticker}.json', b'[]', 'static'),
+    'share-statistics': ('json/share-statistics/{ticker}.json', b'{}', 'static'),
+    'politician-stats': ('json/congress-trading/politician-db/{politician_id}.json', b'{}', 'static'),
+    'all-politicians': ('json/congress-trading/search_list.json', b'[]', 'static'),
+    'most-shorted-stocks': ('json/most-shorted-stocks/data.json', b'[]', 'static'),
+    'historical-dark-pool': ('json/dark-pool/companies/{ticker}.json', b'[]', 3600*60),
+    'dark-pool-level': ('json/dark-pool/price-level/{ticker}.json', b'[]', 'intraday'),
+    'market-maker': ('json/market-maker/companies/{ticker}.json', b'{}', 'static'),
+    'clinical-trial': ('json/clinical-trial/companies/{ticker}.json', b'[]', 'static'),
+    'fda-calendar': ('json/fda-calendar/data.json', b'[]', 60*15),
+    'fail-to-deliver': ('json/fail-to-deliver/companies/{ticker}.json', b'[]', 'static'),
+    'analyst-insight': ('json/analyst/insight/{ticker}.json', b'{}', 'static'),
+    'hottest-contracts': ('json/hottest-contracts/companies/{ticker}.json', b'[]', 'intraday'),
+    'implied-volatility': ('json/implied-volatility/{ticker}.json', b'[]', 60*60),
+    'cramer-tracker': ('json/cramer-tracker/data.json', b'[]', 'static'),
+    'lobbying-tracker': ('json/corporate-lobbying/tracker/data.json', b'[]', 60*15),
+    'historical-market-cap': ('json/market-cap/companies/{ticker}.json', b'[]', 'static'),
+    'economic-indicator': ('json/economic-indicator/data.json', b'{}', 'static'),
+    'sector-industry-overview': ('json/industry/overview.json', b'{}', 'static'),
+    'sector-overview': ('json/industry/sector-overview.json', b'[]', 'static'),
+    'industry-stocks': ('json/industry/industries/{filter_list}.json', b'{}', 'intraday'),
+    'industry-overview': ('json/industry/industry-overview.json', b'[]', 'static'),
+    'next-earnings': ('json/earnings/next/{ticker}.json', b'{}', 15*60),
+    'earnings-surprise': ('json/earnings/surprise/{ticker}.json', b'{}', 15*60),
+    'price-action-earnings': ('json/earnings/past/{ticker}.json', b'[]', 3600*60),
+    'fomc-impact': ('json/fomc-impact/companies/{ticker}.json', b'{}', 'static'),
+    'sentiment-tracker': ('json/tracker/sentiment/data.json', b'[]', 'intraday'),
+    'business-metrics': ('json/business-metrics/{ticker}.json', b'{}', 'static'),
+    'insider-tracker': ('json/tracker/insider/data.json', b'[]', 'intraday'),
+    'statistics': ('json/statistics/{ticker}.json', b'{}', 60*60),
+    'list-category': ('json/{category_type}/list/{filter_list}.json', b'[]', 'intraday'),
+    'pre-after-market-movers': ('json/market-movers/{category}/{params}.json', b'{"gainers":[],"losers":[]}', 'intraday'),
+    'profile': ('json/profile/{ticker}.json', b'{}', 'static'),
+    'market-flow': ('json/market-flow/data.json', b'{}', 'intraday'),
+    'newsletter': ('json/newsletter/data.json', b'[]', 3600),
+}
+
+
+def stat_file(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def stat_signature(st):
+    """Cheap version tag for a file (mtime/inode/size), None if it doesn't exist."""
+    if st is None:
+        return None
+    return f"{st.st_mtime_ns:x}.{st.st_ino:x}.{st.st_size:x}"
+
+
+def file_signature(path):
+    return stat_signature(stat_file(path))
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (q=0 entries dropped)."""
+    if request is None:
+        return {'gzip'}
+    accepted = set()
+    for part in request.headers.get('accept-encoding', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def template_fields(template):
+    """Placeholder names of a path template (of all paths of a composite one), in order."""
+    templates = template.values() if isinstance(template, dict) else [template]
+    fields = []
+    for path in templates:
+        for _, field, _, _ in string.Formatter().parse(path):
+            if field and field not in fields:
+                fields.append(field)
+    return tuple(fields)
+
+
+def _path_list(paths):
+    if paths is None:
+        return []
+    if isinstance(paths, dict):
+        return [os.path.normpath(path) for path in paths.values()]
+    return [os.path.normpath(paths)]
+
+
+def _safe_params(params):
+    # Params end up in a file path, so anything that could walk out of json/ is rejected
+    for value in params.values():
+        value = str(value)
+        if not value or '/' in value or '\\' in value or '..' in value:
+            return False
+    return True
+
+
+class LocalCache:
+    """
+    Per-worker LRU in front of Redis, bounded by the total size of the stored
+    values. Entries carry the signature of the file(s) they were built from and
+    are only returned while that signature still matches.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def get(self, key, signature):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != signature:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, signature, value):
+        # A single huge payload (e.g. max price history) must not flush the whole tier
+        if len(value) > self.max_bytes // 16:
+            self.discard(key)
+            return
+        self.discard(key)
+        self.entries[key] = (signature, value)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class FileCache:
+    """
+    Serves the files listed in FILE_ENDPOINTS as pre-gzipped bytes.
+
+    The raw file is never decoded: it is read, gzipped once and stored in Redis
+    under a key that embeds the file signature, so a rewrite by a cron job is
+    picked up on the next request and the old entry simply expires. When a cron
+    job already wrote a fresh precompressed sibling (see utils.helper.write_json)
+    the sibling is streamed from disk instead.
+    """
+
+    def __init__(self, redis_client, endpoints=FILE_ENDPOINTS, compresslevel=6, local_max_bytes=L1_MAX_BYTES, max_age=MAX_AGE, signature_max_age=SIGNATURE_MAX_AGE):
+        self.redis = redis_client
+        self.endpoints = endpoints
+        self.fields = {endpoint: template_fields(entry[0]) for endpoint, entry in endpoints.items()}
+        self.compresslevel = compresslevel
+        self.local = LocalCache(local_max_bytes)
+        self.inflight = {}
+        self.max_age = max_age
+        self.signature_max_age = signature_max_age
+        # source path -> local keys built from it, for invalidate()
+        self.dependents = defaultdict(set)
+        # Paths a change notification has been seen for, i.e. whose writer publishes
+        self.published = set()
+        self.listening = False
+        self.listener = None
+
+    def expiry(self, ttl, paths=()):
+        # Only files whose writer is known to publish changes get evicted on a
+        # rewrite. Everything else relies on the signature in the key, so its
+        # TTL is capped to keep superseded entries from piling up
+        if self.listening and paths and all(path in self.published for path in paths):
+            return max(ttl, self.max_age)
+        return min(ttl, self.signature_max_age)
+
+    def resolve(self, endpoint, **params):
+        """Return (paths, fallback, ttl) for an endpoint, paths being a dict for composite entries."""
+        template, fallback, policy = self.endpoints[endpoint]
+        ttl = ttl_for(policy)
+        # Only the template's own fields, so a missing one raises KeyError and extras are ignored
+        params = {field: params[field] for field in self.fields[endpoint]}
+        if not _safe_params(params):
+            return None, fallback, ttl
+        if isinstance(template, dict):
+            return {key: path.format(**params) for key, path in template.items()}, fallback, ttl
+        return template.format(**params), fallback, ttl
+
+    def stat(self, paths):
+        if paths is None:
+            return None
+        if isinstance(paths, dict):
+            return {key: stat_file(path) for key, path in paths.items()}
+        return stat_file(paths)
+
+    def signature(self, stats):
+        if isinstance(stats, dict):
+            return '-'.join(str(stat_signature(st)) for st in stats.values())
+        return str(stat_signature(stats))
+
+    def cache_key(self, endpoint, params):
+        # Built from the template fields only, in template order, so the same
+        # file gets the same key however the params were passed
+        parts = '-'.join(str(params[field]) for field in self.fields[endpoint])
+        return f"file:{endpoint}:{parts}"
+
+    def precompressed(self, path, st, accepted):
+        """Return (path, encoding, stat) of a sibling written by the cron job, if it is up to date."""
+        if st is None:
+            return None
+        for encoding, suffix in PRECOMPRESS_SUFFIXES.items():
+            if encoding not in accepted:
+                continue
+            variant_st = stat_file(path + suffix)
+            if variant_st is not None and variant_st.st_mtime_ns >= st.st_mtime_ns:
+                return path + suffix, encoding, variant_st
+        return None
+
+    def _read(self, path, fallback):
+        try:
+            with open(path, 'rb') as file:
+                return file.read() or fallback
+        except OSError:
+            return fallback
+
+    def build(self, paths, fallback):
+        """Read the source file(s) and gzip the raw bytes (runs off the event loop)."""
+        if paths is None:
+            body = fallback
+        elif isinstance(paths, dict):
+            body = b'{' + b','.join(
+                b'"' + key.encode() + b'":' + self._read(path, fallback)
+                for key, path in paths.items()
+            ) + b'}'
+        else:
+            body = self._read(paths, fallback)
+        return gzip.compress(body, compresslevel=self.compresslevel)
+
+    async def cached(self, key, stats, build, ttl, paths=None):
+        """
+        Return the bytes for `key`, checking the local tier, then Redis, then
+        calling `build` in a worker thread. `stats` are the source file stats the
+        entry was built from; a changed file invalidates both tiers. `paths` are
+        the source files, so a change notification for them evicts the entry.
+        """
+        compressed, _ = await self.cached_entry(key, stats, build, ttl, paths)
+        return compressed
+
+    async def cached_entry(self, key, stats, build, ttl, paths=None):
+        """Like cached(), but returns (bytes, fresh); fresh is False for a stale value served during a rebuild."""
+        signature = self.signature(stats)
+        compressed = self.local.get(key, signature)
+        if compressed is not None:
+            return compressed, True
+
+        # Concurrent misses in this worker share one load
+        redis_key = f"{key}:{signature}"
+        task = self.inflight.get(redis_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, redis_key, signature, build, ttl, _path_list(paths)))
+            self.inflight[redis_key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(redis_key, None))
+        compressed, fresh = await asyncio.shield(task)
+
+        if fresh:
+            self.local.put(key, signature, compressed)
+            for path in _path_list(paths):
+                self.dependents[path].add(key)
+        return compressed, fresh
+
+    async def _load(self, key, redis_key, signature, build, ttl, paths):
+        compressed = await self.redis.get(redis_key)
+        if compressed:
+            return compressed, True
+
+        # Across workers, only the lock holder rebuilds
+        stale_key = f"stale:{key}"
+        lock = self.redis.lock(f"lock:{redis_key}", timeout=REBUILD_LOCK_SECONDS, blocking=False)
+        if await lock.acquire():
+            try:
+                compressed = await asyncio.to_thread(build)
+                expiry = self.expiry(ttl, paths)
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.set(redis_key, compressed, ex=expiry)
+                    pipe.hset(stale_key, mapping={'signature': signature, 'body': compressed})
+                    pipe.expire(stale_key, expiry + STALE_SECONDS)
+                    for path in paths:
+                        pipe.sadd(f"deps:{path}", redis_key)
+                        pipe.expire(f"deps:{path}", expiry)
+                    await pipe.execute()
+                return compressed, True
+            finally:
+                try:
+                    await lock.release()
+                except LockError:
+                    pass
+
+        # Someone else is rebuilding: serve the previous value if there is one...
+        stale = await self.redis.hgetall(stale_key)
+        if stale.get(b'body'):
+            return stale[b'body'], stale.get(b'signature') == signature.encode()
+
+        # ...otherwise wait for their result, and build it ourselves if they take too long
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REBUILD_LOCK_SECONDS
+        while loop.time() < deadline:
+            await asyncio.sleep(0.05)
+            compressed = await self.redis.get(redis_key)
+            if compressed:
+                return compressed, True
+        compressed = await asyncio.to_thread(build)
+        await self.redis.set(redis_key, compressed, ex=self.expiry(ttl, paths))
+        return compressed, True
+
+    async def invalidate(self, paths):
+        """Drop everything built from `paths`, locally and in Redis."""
+        for path in paths:
+            path = os.path.normpath(path)
+            for key in self.dependents.pop(path, ()):
+                self.local.discard(key)
+            deps_key = f"deps:{path}"
+            redis_keys = await self.redis.smembers(deps_key)
+            if redis_keys:
+                await self.redis.unlink(deps_key, *redis_keys)
+
+    async def listen(self):
+        """Follow the change notifications of the cron writers (see utils.helper.publish_changes)."""
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANGES_CHANNEL)
+                    self.listening = True
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            paths = [os.path.normpath(path) for path in orjson.loads(message['data'])]
+                            self.published.update(paths)
+                            await self.invalidate(paths)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Notifications may be lost while disconnected, so fall back to the plain TTLs
+                self.listening = False
+                print(f"File change listener error: {e}")
+                await asyncio.sleep(5)
+
+    def start_listening(self):
+        if self.listener is None:
+            self.listener = asyncio.create_task(self.listen())
+
+    async def stop_listening(self):
+        if self.listener is not None:
+            self.listener.cancel()
+            self.listener = None
+            self.listening = False
+
+    async def get(self, endpoint, **params):
+        """Return the gzipped body for an endpoint, building and caching it on a miss."""
+        paths, fallback, ttl = self.resolve(endpoint, **params)
+        key = self.cache_key(endpoint, params)
+        return await self.cached(key, self.stat(paths), partial(self.build, paths, fallback), ttl, paths)
+
+    async def get_many(self, requests):
+        """
+        Gzipped bodies for a list of (endpoint, params), in order. Whatever the
+        local tier doesn't have is fetched with a single Redis MGET, and only the
+        remaining misses go through the regular (single-flight) build path.
+        """
+        entries = []
+        for endpoint, params in requests:
+            paths, fallback, ttl = self.resolve(endpoint, **params)
+            stats = self.stat(paths)
+            entries.append((self.cache_key(endpoint, params), stats, self.signature(stats), partial(self.build, paths, fallback), ttl, paths))
+
+        results = [self.local.get(key, signature) for key, _, signature, _, _, _ in entries]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        values = await self.redis.mget([f"{entries[i][0]}:{entries[i][2]}" for i in missing])
+        rebuild = []
+        for i, value in zip(missing, values):
+            if value:
+                key, _, signature, _, _, _ = entries[i]
+                self.local.put(key, signature, value)
+                results[i] = value
+            else:
+                rebuild.append(i)
+
+        built = await asyncio.gather(*[
+            self.cached(key, stats, build, ttl, paths)
+            for key, stats, _, build, ttl, paths in (entries[i] for i in rebuild)
+        ])
+        for i, value in zip(rebuild, built):
+            results[i] = value
+        return results
+
+    async def batch(self, requests):
+        """All bodies of get_many() as one gzipped JSON array."""
+        bodies = await self.get_many(requests)
+        return await asyncio.to_thread(
+            lambda: gzip.compress(b'[' + b','.join(gzip.decompress(body) for body in bodies) + b']', compresslevel=self.compresslevel)
+        )
+
+    async def cached_response(self, request, key, stats, build, ttl, paths=None):
+        """cached() wrapped in a gzip Response, answering conditional requests with 304."""
+        headers = validator_headers(stats, 'gzip')
+        if not_modified(request, headers):
+            return Response(status_code=304, headers=headers)
+        compressed, fresh = await self.cached_entry(key, stats, build, ttl, paths)
+        if not fresh:
+            # The body is from an older version of the file, so its validators don't apply
+            headers.pop("ETag", None)
+            headers.pop("Last-Modified", None)
+        return gzip_response(compressed, headers)
+
+    async def response(self, endpoint, request=None, **params):
+        paths, fallback, ttl = self.resolve(endpoint, **params)
+        stats = self.stat(paths)
+
+        if isinstance(paths, str):
+            variant = self.precompressed(paths, stats, accepted_encodings(request))
+            if variant is not None:
+                variant_path, encoding, variant_st = variant
+                headers = validator_headers(stats, encoding)
+                if not_modified(request, headers):
+                    return Response(status_code=304, headers=headers)
+                return FileResponse(
+                    variant_path,
+                    media_type="application/json",
+                    headers={"Content-Encoding": encoding, **headers},
+                    stat_result=variant_st,
+                )
+
+        key = self.cache_key(endpoint, params)
+        return await self.cached_response(request, key, stats, partial(self.build, paths, fallback), ttl, paths)
+
+
+def validator_headers(stats, encoding):
+    """
+    ETag/Last-Modified for a representation built from `stats`. The ETag is
+    derived from the source signature plus the content coding, so gzip and
+    brotli bodies of the same file never share a tag. It is weak because the
+    cron-written .gz sibling and the gzip built here are the same content but
+    not the same bytes.
+    """
+    if isinstance(stats, dict):
+        present = [st for st in stats.values() if st is not None]
+        signature = '-'.join(str(stat_signature(st)) for st in stats.values())
+    else:
+        present = [stats] if stats is not None else []
+        signature = str(stat_signature(stats))
+
+    digest = hashlib.blake2b(signature.encode(), digest_size=12).hexdigest()
+    headers = {
+        "ETag": f'W/"{digest}-{encoding}"',
+        # Revalidate every time; without this browsers apply heuristic freshness to Last-Modified
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if present:
+        headers["Last-Modified"] = formatdate(max(st.st_mtime for st in present), usegmt=True)
+    return headers
+
+
+def not_modified(request, headers):
+    """
+    True when the request's If-None-Match / If-Modified-Since match the current
+    validators. Only GET and HEAD are answered with 304; for other methods a
+    matching precondition means 412 (RFC 9110 13.1), so those always get the body.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return False
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+        if if_none_match.strip() == '*':
+            return True
+        # Weak comparison (RFC 9110 8.8.3.2)
+        etag = headers["ETag"].removeprefix('W/')
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+    if_modified_since = request.headers.get('if-modified-since')
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def gzip_response(compressed_data, headers=None):
+    return Response(
+        content=compressed_data,
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip", **(headers or {})},
+    )
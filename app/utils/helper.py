@@ -1,27 +1,21 @@
-from datetime import datetime, timedelta, time, date
+from datetime import timedelta, time
 import os
+import gzip
 import orjson
-import pytz
+import redis
+import time as _time
 
-def check_market_hours():
+from utils.trading_calendar import is_trading_day, last_trading_day, now_et
 
-    holidays = ['2025-01-01', '2025-01-09','2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25']
+def check_market_hours():
 
-    
     # Get the current date and time in ET (Eastern Time)
-    et_timezone = pytz.timezone('America/New_York')
-    current_time = datetime.now(et_timezone)
-    current_date_str = current_time.strftime('%Y-%m-%d')
+    current_time = now_et()
     current_hour = current_time.hour
     current_minute = current_time.minute
-    current_day = current_time.weekday()  # Monday is 0, Sunday is 6
-
-    # Check if the current date is a holiday or weekend
-    is_weekend = current_day >= 5  # Saturday (5) or Sunday (6)
-    is_holiday = current_date_str in holidays
 
     # Determine the market status
-    if is_weekend or is_holiday:
+    if not is_trading_day(current_time):
         return False #"Market is closed."
     elif (current_hour == 16 and current_minute == 10) or 9 <= current_hour < 16:
         return True #"Market hours."
@@ -29,52 +23,121 @@ def check_market_hours():
         return False #"Market is closed."
 
 
-def load_latest_json(directory: str, find=True):
+def latest_json_path(directory: str, find=True):
     """
-    Load the JSON file corresponding to today's date (New York time) or the last Friday if today is a weekend.
+    Path of the JSON file for today's date (New York time) or the last trading day if the market is closed today.
     If `find` is True, try going back one day up to 10 times until a JSON file is found.
     If `find` is False, only check the current date (or adjusted Friday for weekends).
+    Returns None if no file is found.
+    """
+    # Today's date in New York, or the last trading day on weekends and holidays
+    today_ny = last_trading_day(now_et())
+
+    attempts = 0
+
+    # Loop to find the JSON file
+    while True:
+        # Construct the filename based on the adjusted date
+        target_file_path = os.path.join(directory, f"{today_ny}.json")
+        if os.path.exists(target_file_path):
+            return target_file_path
+
+        # If find is False, only check the current date and exit
+        if not find:
+            print(f"No JSON file found for date: {today_ny}. Exiting as `find` is set to False.")
+            return None
+
+        # Increment attempts and move to the previous day
+        attempts += 1
+        if attempts >= 10:
+            print("No JSON file found after 10 attempts.")
+            return None
+        today_ny -= timedelta(days=1)
+
+
+def load_latest_json(directory: str, find=True):
+    """
+    Load the JSON file found by `latest_json_path`, or an empty list if there is none.
     """
     try:
-        # Get today's date in New York timezone
-        ny_tz = pytz.timezone("America/New_York")
-        today_ny = datetime.now(ny_tz).date()
-
-        # Adjust to Friday if today is Saturday or Sunday
-        if today_ny.weekday() == 5:  # Saturday
-            today_ny -= timedelta(days=1)
-        elif today_ny.weekday() == 6:  # Sunday
-            today_ny -= timedelta(days=2)
-
-        attempts = 0
-
-        # Loop to find the JSON file
-        while True:
-            # Construct the filename based on the adjusted date
-            target_filename = f"{today_ny}.json"
-            target_file_path = os.path.join(directory, target_filename)
-
-            # Check if the file exists and load it
-            if os.path.exists(target_file_path):
-                with open(target_file_path, 'rb') as file:
-                    print(f"JSON file found for date: {today_ny}")
-                    return orjson.loads(file.read())
-
-            # If find is False, only check the current date and exit
-            if not find:
-                print(f"No JSON file found for date: {today_ny}. Exiting as `find` is set to False.")
-                break
-
-            # Increment attempts and move to the previous day
-            attempts += 1
-            if attempts >= 10:
-                print("No JSON file found after 10 attempts.")
-                break
-            today_ny -= timedelta(days=1)
-
-        # Return an empty list if no file is found
-        return []
+        target_file_path = latest_json_path(directory, find)
+        if target_file_path is None:
+            return []
+        with open(target_file_path, 'rb') as file:
+            print(f"JSON file found: {target_file_path}")
+            return orjson.loads(file.read())
 
     except Exception as e:
         print(f"Error loading JSON file: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+# Encodings the API can serve straight from disk, in order of preference.
+# gzip is always written; zstd/brotli only when the module is installed and
+# listed in PRECOMPRESS_ENCODINGS (e.g. "gzip,zstd,br").
+PRECOMPRESS_SUFFIXES = {'br': '.br', 'zstd': '.zst', 'gzip': '.gz'}
+
+def _compressors():
+    enabled = os.getenv('PRECOMPRESS_ENCODINGS', 'gzip').replace(' ', '').split(',')
+    compressors = {'gzip': lambda raw: gzip.compress(raw, compresslevel=9)}
+    if 'zstd' in enabled:
+        try:
+            import zstandard
+            compressors['zstd'] = zstandard.ZstdCompressor(level=19).compress
+        except ImportError:
+            pass
+    if 'br' in enabled:
+        try:
+            import brotli
+            compressors['br'] = lambda raw: brotli.compress(raw, quality=11)
+        except ImportError:
+            pass
+    return compressors
+
+_COMPRESSORS = None
+
+# Cron writers announce rewritten files here so the API can evict what it cached from them
+CHANGES_CHANNEL = 'file-changes'
+# After a failed publish, skip publishing for this many seconds instead of
+# paying the connect timeout on every write
+PUBLISH_RETRY_SECONDS = 30
+_PUBLISHER = None
+_PUBLISH_RETRY_AT = 0
+
+def publish_changes(paths):
+    """Best effort: without a reachable Redis the writer just carries on."""
+    global _PUBLISHER, _PUBLISH_RETRY_AT
+    if _time.monotonic() < _PUBLISH_RETRY_AT:
+        return
+    try:
+        if _PUBLISHER is None:
+            _PUBLISHER = redis.Redis(host=os.getenv('REDIS_HOST', 'redis'), port=6379, db=0, socket_connect_timeout=1, socket_timeout=1)
+        _PUBLISHER.publish(CHANGES_CHANNEL, orjson.dumps([os.path.normpath(path) for path in paths]))
+    except redis.RedisError:
+        # Start over with a fresh client once the backoff is over
+        _PUBLISHER = None
+        _PUBLISH_RETRY_AT = _time.monotonic() + PUBLISH_RETRY_SECONDS
+
+def _atomic_write(path, raw):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as file:
+        file.write(raw)
+    os.replace(tmp_path, path)
+
+def write_json(path, data, compress=True):
+    """
+    Write `data` as JSON to `path` atomically. With `compress`, also write
+    precompressed siblings (`path.gz`, and optionally `.zst`/`.br`) so the API can
+    send the file as-is instead of gzipping it on every cache miss.
+    The siblings are written after the JSON file so they are never older than it
+    once the write is complete. The API is then told the file changed.
+    """
+    global _COMPRESSORS
+    raw = data if isinstance(data, bytes) else orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    _atomic_write(path, raw)
+    if compress:
+        if _COMPRESSORS is None:
+            _COMPRESSORS = _compressors()
+        for encoding, compressor in _COMPRESSORS.items():
+            _atomic_write(path + PRECOMPRESS_SUFFIXES[encoding], compressor(raw))
+    publish_changes([path])
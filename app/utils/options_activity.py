@@ -0,0 +1,120 @@
+import sqlite3
+from datetime import date, timedelta
+
+import orjson
+
+from utils.trading_calendar import last_trading_day, now_et
+
+
+# Rolling store of raw Benzinga options activity, filled by cron_options_flow.py
+# and read by the per-ticker options flow endpoints.
+OPTIONS_ACTIVITY_DB = 'options_activity.db'
+RETENTION_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS options_activity (
+    id TEXT PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS options_activity_ticker_date_time
+    ON options_activity (ticker, date, time);
+CREATE TABLE IF NOT EXISTS options_activity_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# 'since': first day the cron stored the whole market's activity; nothing before it is in the store.
+# 'synced': last trading day the cron stored it on, so the store is complete up to that day.
+META_QUERY = "SELECT key, value FROM options_activity_meta WHERE key IN ('since', 'synced')"
+
+
+def normalize_ticker(ticker):
+    """Symbol spelling of stocks.db and the API ('brk.b' -> 'BRK-B')."""
+    return ticker.upper().replace('.', '-')
+
+
+def connect(path=OPTIONS_ACTIVITY_DB):
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode = wal")
+    con.executescript(SCHEMA)
+    with con:
+        con.execute("INSERT OR IGNORE INTO options_activity_meta (key, value) VALUES ('since', ?)", (date.today().isoformat(),))
+    return con
+
+
+def store_activity(con, items, retention_days=RETENTION_DAYS):
+    """Upsert raw activity items and drop anything older than the retention window."""
+    rows = [
+        (item['id'], normalize_ticker(item['ticker']), item['date'], item['time'], orjson.dumps(item))
+        for item in items if item.get('id') and item.get('ticker')
+    ]
+    cutoff = (date.today() - timedelta(days=retention_days)).isoformat()
+    with con:
+        con.executemany(
+            "INSERT INTO options_activity (id, ticker, date, time, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET ticker=excluded.ticker, date=excluded.date, time=excluded.time, data=excluded.data",
+            rows
+        )
+        con.execute("DELETE FROM options_activity WHERE date < ?", (cutoff,))
+    return len(rows)
+
+
+def mark_synced(con):
+    """Record that the whole market's activity has been stored up to today."""
+    with con:
+        con.execute(
+            "INSERT INTO options_activity_meta (key, value) VALUES ('synced', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (now_et().date().isoformat(),)
+        )
+
+
+def activity_query(ticker, start_date='', end_date='', limit=500, offset=0):
+    """(sql, params) for newest first activity of `ticker`, sliced through the (ticker, date, time) index."""
+    query = "SELECT data FROM options_activity WHERE ticker = ?"
+    params = [normalize_ticker(ticker)]
+    if start_date:
+        query += " AND date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND date <= ?"
+        params.append(end_date)
+    query += " ORDER BY date DESC, time DESC LIMIT ? OFFSET ?"
+    params += [limit, offset]
+    return query, params
+
+
+def complete_from(since, retention_days=RETENTION_DAYS):
+    """First day the store holds every trade of every ticker, or None if it is empty."""
+    if not since:
+        return None
+    return max(since, (date.today() - timedelta(days=retention_days)).isoformat())
+
+
+def covers(rows, limit, start_date, end_date, meta, retention_days=RETENTION_DAYS):
+    """
+    Whether a store page can be served as is. A full page is the newest
+    matching activity. A short one is complete when the store holds every
+    ticker's activity over the whole requested range: from its start (the
+    retention window if none is given) up to its end, capped at the last
+    trading day. Anything else (older activity, a store the cron hasn't
+    synced lately) has to be fetched from Benzinga.
+    """
+    if len(rows) >= limit:
+        return True
+    first_day = complete_from(meta.get('since'), retention_days)
+    synced = meta.get('synced')
+    if not (first_day and synced):
+        return False
+    today = now_et().date()
+    start = start_date or (today - timedelta(days=retention_days)).isoformat()
+    end = last_trading_day(min(end_date, today.isoformat()) if end_date else today).isoformat()
+    return start >= first_day and end <= synced
+
+
+def decode_rows(rows):
+    return [orjson.loads(row[0]) for row in rows]
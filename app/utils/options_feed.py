@@ -0,0 +1,106 @@
+import asyncio
+import base64
+import time
+from bisect import bisect_right
+
+import orjson
+
+from utils.file_cache import file_signature
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(item_id):
+    return base64.urlsafe_b64encode(item_id.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except Exception:
+        raise CursorError("Invalid cursor")
+
+
+class OptionsFeed:
+    """
+    The options flow feed kept in memory, reloaded when the file changes.
+
+    The feed is newest first. Cursors carry the id of the last item sent, so
+    they survive reloads as long as that trade is still in the feed; the
+    id -> position map makes resuming O(1), and the per-ticker position lists
+    keep ticker filtered pages O(page size) as well.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.signature = None
+        self.checked_at = 0.0
+        self.items = []
+        self.positions = {}
+        self.ticker_positions = {}
+        self.lock = asyncio.Lock()
+
+    def _load(self):
+        with open(self.path, 'rb') as file:
+            items = orjson.loads(file.read())
+        positions = {}
+        ticker_positions = {}
+        for pos, item in enumerate(items):
+            positions[item['id']] = pos
+            ticker_positions.setdefault(item['ticker'], []).append(pos)
+        return items, positions, ticker_positions
+
+    async def refresh(self):
+        now = time.monotonic()
+        if now - self.checked_at < self.check_interval:
+            return
+        async with self.lock:
+            if now - self.checked_at < self.check_interval:
+                return
+            self.checked_at = now
+            signature = file_signature(self.path)
+            if signature == self.signature:
+                return
+            try:
+                items, positions, ticker_positions = await asyncio.to_thread(self._load)
+            except Exception as e:
+                print(f"Error loading options feed: {e}")
+                return
+            # Swap everything at once so readers never see a half updated feed
+            self.items, self.positions, self.ticker_positions = items, positions, ticker_positions
+            self.signature = signature
+
+    def page(self, cursor='', limit=100, ticker='', put_call='', sentiment='', min_premium=0):
+        """Returns (items, next cursor or None)."""
+        items, positions = self.items, self.positions
+        start = 0
+        if cursor:
+            pos = positions.get(decode_cursor(cursor))
+            if pos is None:
+                raise CursorError("Cursor expired")
+            start = pos + 1
+
+        if ticker:
+            candidates = self.ticker_positions.get(ticker, [])
+            candidates = candidates[bisect_right(candidates, start - 1):]
+        else:
+            candidates = range(start, len(items))
+
+        result = []
+        for pos in candidates:
+            item = items[pos]
+            if put_call and item['put_call'] != put_call:
+                continue
+            if sentiment and item['sentiment'] != sentiment:
+                continue
+            if min_premium and float(item['cost_basis']) < min_premium:
+                continue
+            result.append(item)
+            if len(result) >= limit:
+                break
+
+        next_cursor = encode_cursor(result[-1]['id']) if len(result) >= limit else None
+        return result, next_cursor
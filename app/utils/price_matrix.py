@@ -0,0 +1,252 @@
+import math
+import os
+import shutil
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from utils.helper import write_json
+from utils.trading_calendar import is_trading_day
+
+
+# Dense (symbol x trading day) copies of the prices table of each database,
+# refreshed by the create_*_db.py builders after their OHLC load
+PRICE_MATRICES = {
+    'stocks': 'json/price-matrix/stocks',
+    'etf': 'json/price-matrix/etf',
+    'crypto': 'json/price-matrix/crypto',
+}
+FIELDS = {
+    'close': np.float64,
+    'high': np.float32,
+    'low': np.float32,
+    'volume': np.float64,
+}
+FETCH_SIZE = 100_000
+# SQLite caps the number of host parameters of a statement
+SYMBOL_CHUNK = 500
+# Share of a window's trading sessions two symbols need in common to be correlated
+MIN_OVERLAP = 0.9
+
+
+class PriceMatrix:
+    """
+    Close, high, low and volume of every symbol on every trading day of a
+    prices table, one .npy array per field with NaN where a symbol has no bar.
+    Rows follow `symbols`, columns follow `dates`; a row is contiguous, so a
+    symbol's history is a single slice.
+
+    Arrays are loaded with np.load(mmap_mode='r'), so every job (and every
+    worker of a job) maps the same pages from the OS cache instead of
+    querying SQLite symbol by symbol.
+    """
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.symbols = manifest['symbols']
+        self.dates = manifest['dates']
+        self.index = {symbol: pos for pos, symbol in enumerate(self.symbols)}
+        self.arrays = arrays
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def days(self, start_date=None, end_date=None):
+        """Column range of the dates between start_date and end_date (inclusive)."""
+        start = 0 if start_date is None else bisect_left(self.dates, str(start_date))
+        end = len(self.dates) if end_date is None else bisect_right(self.dates, str(end_date))
+        return start, end
+
+    def slice(self, field, symbols=None, start_date=None, end_date=None):
+        """
+        (symbols, dates, values) of a block of the matrix. Without `symbols`
+        the values are a view of the mapped array; unknown symbols are skipped.
+        """
+        start, end = self.days(start_date, end_date)
+        values = self.arrays[field]
+        if symbols is None:
+            return self.symbols, self.dates[start:end], values[:, start:end]
+        symbols = [symbol for symbol in symbols if symbol in self.index]
+        return symbols, self.dates[start:end], values[[self.index[symbol] for symbol in symbols], start:end]
+
+    def frame(self, symbol, fields=('close',), start_date=None, end_date=None):
+        """One symbol's bars as a DataFrame with a date column, like read_prices()."""
+        start, end = self.days(start_date, end_date)
+        row = self.index[symbol]
+        present = ~np.isnan(self.arrays['close'][row, start:end])
+        data = {'date': np.asarray(self.dates[start:end])[present]}
+        for field in fields:
+            data[field] = self.arrays[field][row, start:end][present]
+        return pd.DataFrame(data)
+
+    def last_before(self, field, date):
+        """{symbol: value} of the last bar on or before `date`."""
+        _, end = self.days(None, date)
+        if end == 0:
+            return {}
+        present = ~np.isnan(self.arrays[field][:, :end])
+        has_bar = present.any(axis=1)
+        last = end - 1 - np.argmax(present[:, ::-1], axis=1)
+        values = self.arrays[field][np.arange(len(self.symbols)), last]
+        return {symbol: float(values[pos]) for pos, symbol in enumerate(self.symbols) if has_bar[pos]}
+
+    @classmethod
+    def load(cls, directory):
+        """Map the version `directory`.json currently points at."""
+        with open(f"{directory}.json", 'rb') as file:
+            pointer = orjson.loads(file.read())
+        version_dir = os.path.join(os.path.dirname(directory.rstrip('/')), pointer['path'])
+        with open(os.path.join(version_dir, 'manifest.json'), 'rb') as file:
+            manifest = orjson.loads(file.read())
+        arrays = {field: np.load(os.path.join(version_dir, f"{field}.npy"), mmap_mode='r') for field in FIELDS}
+        return cls(manifest, arrays)
+
+
+def _chunks(symbols):
+    for pos in range(0, len(symbols), SYMBOL_CHUNK):
+        chunk = symbols[pos:pos + SYMBOL_CHUNK]
+        yield chunk, ', '.join('?' * len(chunk))
+
+
+def _load_previous(directory):
+    try:
+        return PriceMatrix.load(directory)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_price_matrix(con, directory, full=False, refresh=()):
+    """
+    Write the prices table of `con` as a new matrix version and point
+    `directory`.json at it. Unless `full` is set, the previous version is
+    reused: only its last day (which may have been partial) onwards and the
+    whole history of symbols it doesn't know (or listed in `refresh`) are
+    read from SQLite.
+    """
+    previous = None if full else _load_previous(directory)
+    symbols = [row[0] for row in con.execute("SELECT DISTINCT symbol FROM prices ORDER BY symbol")]
+    if previous is not None and previous.dates:
+        since = previous.dates[-1]
+        added = [symbol for symbol in symbols if symbol not in previous or symbol in refresh]
+    else:
+        previous, since, added = None, '', symbols
+
+    dates = {row[0] for row in con.execute("SELECT DISTINCT date FROM prices WHERE date >= ?", (since,))}
+    if previous is not None:
+        dates.update(previous.dates)
+        for chunk, placeholders in _chunks(added):
+            dates.update(row[0] for row in con.execute(f"SELECT DISTINCT date FROM prices WHERE symbol IN ({placeholders})", chunk))
+    dates = sorted(dates)
+    rows = {symbol: pos for pos, symbol in enumerate(symbols)}
+    columns = {date: pos for pos, date in enumerate(dates)}
+
+    parent, base = os.path.split(directory.rstrip('/'))
+    version = str(time.time_ns())
+    version_dir = os.path.join(parent, f"{base}-{version}")
+    os.makedirs(version_dir, exist_ok=True)
+    arrays = {}
+    for field, dtype in FIELDS.items():
+        arrays[field] = np.lib.format.open_memmap(
+            os.path.join(version_dir, f"{field}.npy"), mode='w+', dtype=dtype, shape=(len(symbols), len(dates))
+        )
+        arrays[field][:] = np.nan
+
+    queries = [("SELECT symbol, date, close, high, low, volume FROM prices WHERE date >= ?", (since,))]
+    if previous is not None:
+        kept = [symbol for symbol in previous.symbols if symbol in rows]
+        target = np.ix_([rows[symbol] for symbol in kept], [columns[date] for date in previous.dates])
+        source = [previous.index[symbol] for symbol in kept]
+        for field in FIELDS:
+            arrays[field][target] = previous[field][source]
+            arrays[field][[rows[symbol] for symbol in added]] = np.nan
+        for chunk, placeholders in _chunks(added):
+            queries.append((f"SELECT symbol, date, close, high, low, volume FROM prices WHERE symbol IN ({placeholders})", chunk))
+
+    for query, params in queries:
+        cursor = con.execute(query, params)
+        while True:
+            batch = cursor.fetchmany(FETCH_SIZE)
+            if not batch:
+                break
+            row_index = [rows[item[0]] for item in batch]
+            column_index = [columns[item[1]] for item in batch]
+            for pos, field in enumerate(FIELDS, start=2):
+                arrays[field][row_index, column_index] = np.array([item[pos] for item in batch], dtype=np.float64)
+
+    for field in FIELDS:
+        arrays[field].flush()
+    manifest = {'version': version, 'symbols': symbols, 'dates': dates}
+    write_json(os.path.join(version_dir, 'manifest.json'), manifest, compress=False)
+    write_json(f"{directory}.json", {'path': os.path.basename(version_dir)}, compress=False)
+
+    versions = sorted(entry for entry in os.listdir(parent or '.') if entry.startswith(f"{base}-"))
+    for entry in versions[:-2]:
+        shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+    return PriceMatrix.load(directory)
+
+
+def open_price_matrix(directory, con=None):
+    """Map the matrix at `directory`, building it from `con` if there is none yet."""
+    matrix = _load_previous(directory)
+    if matrix is None:
+        if con is None:
+            raise FileNotFoundError(f"No price matrix at {directory}")
+        matrix = save_price_matrix(con, directory, full=True)
+    return matrix
+
+
+def correlation_window(matrix, start_date, end_date, min_overlap=MIN_OVERLAP):
+    """
+    Inputs of correlate() for the window: closes on the trading sessions of
+    the calendar (stray bars on other days are ignored), centred on each
+    symbol's mean, with their presence mask, and the average volumes. Symbols
+    that can't reach the overlap on their own are left out.
+    """
+    symbols, dates, close = matrix.slice('close', start_date=start_date, end_date=end_date)
+    _, _, volume = matrix.slice('volume', start_date=start_date, end_date=end_date)
+    sessions = np.array([is_trading_day(day) for day in dates], dtype=bool)
+    min_days = max(2, math.ceil(min_overlap * sessions.sum()))
+
+    close = np.asarray(close[:, sessions], dtype=np.float64)
+    present = ~np.isnan(close)
+    keep = present.sum(axis=1) >= min_days
+    close, present = close[keep], present[keep]
+    centred = np.where(present, close - np.nanmean(close, axis=1, keepdims=True), 0.0)
+    return {
+        'index': {symbol: pos for pos, symbol in enumerate(np.asarray(symbols)[keep])},
+        'present': present.astype(np.float64),
+        'centred': centred,
+        'squared': centred ** 2,
+        'volume': np.nanmean(np.asarray(volume[:, sessions])[keep], axis=1),
+        'min_days': min_days,
+    }
+
+
+def correlate(window, symbol):
+    """
+    Pearson correlation of `symbol` with every symbol of the window, each pair
+    over the sessions both have a close on. NaN where that overlap is too short.
+    """
+    pos = window['index'][symbol]
+    present, centred = window['present'], window['centred']
+    x, x_present = centred[pos], present[pos]
+    # Sums over the common sessions of each pair, as matrix-vector products
+    n = present @ x_present
+    sum_x = present @ x
+    sum_y = centred @ x_present
+    sum_xy = centred @ x
+    sum_xx = present @ x ** 2
+    sum_yy = window['squared'] @ x_present
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_xy - sum_x * sum_y / n
+        variance = (sum_xx - sum_x ** 2 / n) * (sum_yy - sum_y ** 2 / n)
+        values = covariance / np.sqrt(variance)
+    values[n < window['min_days']] = np.nan
+    return values
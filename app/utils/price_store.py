@@ -0,0 +1,182 @@
+import math
+
+import pandas as pd
+
+
+# Daily OHLC bars of every symbol of a database (stocks.db, etf.db, crypto.db)
+# in one clustered table, instead of one table per symbol
+PRICE_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume', 'change_percent')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    change_percent REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_date ON prices (date);
+"""
+
+
+def create_prices_table(con):
+    con.executescript(SCHEMA)
+
+
+def _columns(columns):
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    unknown = set(columns) - set(PRICE_COLUMNS) - {'symbol'}
+    if unknown:
+        raise ValueError(f"Unknown price columns: {sorted(unknown)}")
+    return ', '.join(columns)
+
+
+def _range(start_date, end_date):
+    where, params = [], []
+    if start_date is not None:
+        where.append("date >= ?")
+        params.append(str(start_date))
+    if end_date is not None:
+        where.append("date <= ?")
+        params.append(str(end_date))
+    return where, params
+
+
+def price_query(symbol, start_date=None, end_date=None, columns=PRICE_COLUMNS):
+    """
+    Compatibility accessor for the old `SELECT ... FROM "{symbol}" WHERE date
+    BETWEEN ? AND ?` queries: returns (sql, params) for one symbol's rows in
+    date order, read through the (symbol, date) primary key.
+    """
+    where, params = _range(start_date, end_date)
+    sql = f"SELECT {_columns(columns)} FROM prices WHERE " + ' AND '.join(["symbol = ?"] + where) + " ORDER BY date"
+    return sql, [symbol] + params
+
+
+def price_rows(con, symbol, start_date=None, end_date=None, columns=PRICE_COLUMNS):
+    sql, params = price_query(symbol, start_date, end_date, columns)
+    return con.execute(sql, params).fetchall()
+
+
+def read_prices(con, symbol, start_date=None, end_date=None, columns=PRICE_COLUMNS):
+    """DataFrame of one symbol's rows, as pd.read_sql_query used to return for its table."""
+    sql, params = price_query(symbol, start_date, end_date, columns)
+    return pd.read_sql_query(sql, con, params=params)
+
+
+def first_price(con, symbol, columns=PRICE_COLUMNS):
+    """The oldest row of a symbol, or None."""
+    return con.execute(f"SELECT {_columns(columns)} FROM prices WHERE symbol = ? ORDER BY date LIMIT 1", (symbol,)).fetchone()
+
+
+def read_price_window(con, start_date=None, end_date=None, columns=('date', 'close'), symbols=None):
+    """
+    Rows of every symbol (or of `symbols`) in the date range, with a symbol
+    column, ordered by symbol and date. One range scan over the date index
+    instead of one statement per symbol.
+    """
+    where, params = _range(start_date, end_date)
+    if symbols is not None:
+        symbols = list(symbols)
+        where.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+        params += symbols
+    sql = f"SELECT symbol, {_columns(columns)} FROM prices"
+    if where:
+        sql += " WHERE " + ' AND '.join(where)
+    return pd.read_sql_query(sql + " ORDER BY symbol, date", con, params=params)
+
+
+def last_bars(con):
+    """{symbol: (date, open)} of the last stored bar of every symbol."""
+    # SQLite returns the bare open column from the row holding MAX(date)
+    return {symbol: (date, open_price) for symbol, date, open_price in con.execute("SELECT symbol, MAX(date), open FROM prices GROUP BY symbol")}
+
+
+def upsert_prices(con, rows):
+    """Write (symbol, date, open, high, low, close, volume, change_percent) rows in one transaction."""
+    with con:
+        con.executemany(
+            f"INSERT OR REPLACE INTO prices (symbol, {', '.join(PRICE_COLUMNS)}) VALUES ({', '.join('?' * (len(PRICE_COLUMNS) + 1))})",
+            rows
+        )
+
+
+class PriceLoader:
+    """
+    Fetches the daily bars of the symbols a create_*_db.py builder lists and
+    writes them with one executemany per batch.
+
+    A symbol already in the table is only fetched from its last stored day
+    on, since that bar may have been partial. If the open of that day changed,
+    the provider re-adjusted the history (a split), so the whole range is
+    fetched again and the symbol is recorded in `refreshed`.
+    """
+
+    def __init__(self, con, fmp, start_date, end_date):
+        self.con = con
+        self.fmp = fmp
+        self.start_date = start_date
+        self.end_date = end_date
+        self.stored = last_bars(con)
+        self.symbols = set()
+        self.refreshed = set()
+        self.pending = []
+
+    async def _bars(self, symbol, start_date):
+        data = await self.fmp.get_historical_price_full(symbol, start_date, self.end_date)
+        return [bar for bar in data.get('historical', [])[::-1] if bar.get('date') and bar['date'] >= start_date]
+
+    async def fetch(self, symbol):
+        self.symbols.add(symbol)
+        try:
+            since, stored_open = self.stored.get(symbol, (None, None))
+            bars = await self._bars(symbol, max(since or self.start_date, self.start_date))
+            if since and bars and bars[0]['date'] == since and not math.isclose(bars[0].get('open') or 0, stored_open or 0, rel_tol=1e-4):
+                bars = await self._bars(symbol, self.start_date)
+                self.refreshed.add(symbol)
+            self.pending.extend(
+                (symbol, bar['date'], bar.get('open'), bar.get('high'), bar.get('low'), bar.get('close'), bar.get('volume'), bar.get('changePercent'))
+                for bar in bars
+            )
+        except Exception as e:
+            print(f"Failed to fetch OHLC data for symbol {symbol}: {str(e)}")
+
+    def flush(self):
+        """Write the bars fetched since the last flush."""
+        upsert_prices(self.con, self.pending)
+        self.pending = []
+
+    def prune(self):
+        """Drop the bars of symbols the builder no longer lists."""
+        stale = set(self.stored) - self.symbols
+        with self.con:
+            self.con.executemany("DELETE FROM prices WHERE symbol = ?", [(symbol,) for symbol in stale])
+        return len(stale)
+
+
+def migrate_ticker_tables(con):
+    """
+    Move the bars of the old per-symbol tables into `prices` and drop those
+    tables. Returns the number of migrated tables.
+    """
+    create_prices_table(con)
+    legacy = set(PRICE_COLUMNS)
+    tables = [row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'prices'")]
+    migrated = 0
+    for table in tables:
+        columns = {row[1] for row in con.execute(f"PRAGMA table_info(\"{table}\")")}
+        if columns != legacy:
+            continue
+        with con:
+            con.execute(
+                f"INSERT OR IGNORE INTO prices (symbol, {', '.join(PRICE_COLUMNS)}) "
+                f"SELECT ?, {', '.join(PRICE_COLUMNS)} FROM \"{table}\" WHERE date IS NOT NULL",
+                (table,)
+            )
+            con.execute(f"DROP TABLE \"{table}\"")
+        migrated += 1
+    return migrated
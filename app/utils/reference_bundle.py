@@ -0,0 +1,97 @@
+import asyncio
+import os
+
+import orjson
+
+from utils.column_table import ColumnTable
+from utils.file_cache import file_signature
+from utils.reference_data import REFERENCE_SNAPSHOT, load_reference_data
+from utils.screener_store import ScreenerStore
+from utils.search_index import SearchIndex
+
+
+STOCK_SCREENER_PATH = 'json/stock-screener/data.json'
+# Memory mapped column table of the screener data, see ColumnTable.save()
+SCREENER_TABLE = 'json/reference/screener'
+RELOAD_INTERVAL = int(os.getenv('REFERENCE_RELOAD_INTERVAL', 30))
+
+
+class ReferenceData:
+    """
+    Everything the API derives from the reference snapshot and the screener
+    data, built together and never mutated afterwards. A reload builds a new
+    bundle and swaps it in, so a request that grabbed the old one keeps a
+    consistent view until it finishes. The screener data is mapped from the
+    shared column table, so workers don't each hold a copy of it.
+    """
+
+    def __init__(self, snapshot, screener_table):
+        self.snapshot_version = snapshot['version']
+        self.version = f"{snapshot['version']}-{screener_table.version}"
+        self.etf_symbols = snapshot['etf_symbols']
+        self.crypto_symbols = snapshot['crypto_symbols']
+        self.etf_set = set(self.etf_symbols)
+        self.crypto_set = set(self.crypto_symbols)
+        self.searchbar_data = snapshot['searchbar_data']
+        self.search_index = SearchIndex(self.searchbar_data)
+        self.screener_store = ScreenerStore(screener_table)
+
+    @classmethod
+    def load(cls):
+        try:
+            screener_table = ColumnTable.load(SCREENER_TABLE)
+        except (OSError, ValueError, KeyError) as e:
+            # No table written yet, build a private one from the JSON file
+            print(f"Could not map screener table {SCREENER_TABLE}: {e}")
+            with open(STOCK_SCREENER_PATH, 'rb') as file:
+                screener_table = ColumnTable.from_rows(orjson.loads(file.read()))
+        return cls(load_reference_data(), screener_table)
+
+
+def source_signature():
+    return file_signature(REFERENCE_SNAPSHOT), file_signature(f"{SCREENER_TABLE}.json"), file_signature(STOCK_SCREENER_PATH)
+
+
+class ReferenceReloader:
+    """
+    Holds the current ReferenceData and rebuilds it in a worker thread when
+    the snapshot or screener file changes, replacing the pm2 restarts after
+    restart_json.py. `on_reload` is called (in a thread) with every new bundle.
+    """
+
+    def __init__(self, interval=RELOAD_INTERVAL, on_reload=None):
+        self.interval = interval
+        self.on_reload = on_reload
+        self.signature = source_signature()
+        self.current = ReferenceData.load()
+        self.task = None
+
+    async def reload(self):
+        signature = source_signature()
+        if signature == self.signature:
+            return False
+        try:
+            bundle = await asyncio.to_thread(ReferenceData.load)
+            if self.on_reload is not None:
+                await asyncio.to_thread(self.on_reload, bundle)
+        except Exception as e:
+            # Keep serving the previous data, and retry on the next tick
+            print(f"Error reloading reference data: {e}")
+            return False
+        self.current = bundle
+        self.signature = signature
+        return True
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reload()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.watch())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
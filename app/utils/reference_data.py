@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import orjson
+
+from utils.helper import write_json
+
+
+# Everything the API needs from the databases at boot, prebuilt by restart_json.py
+REFERENCE_SNAPSHOT = 'json/reference/snapshot.json'
+SNAPSHOT_FORMAT = 1
+
+# Prefixes of the API's Redis keys that are not file-backed (see FileCache):
+# built from the databases, the reference data or files whose writers don't
+# announce rewrites. Only these are dropped when the reference data or the
+# databases change; everything else (file cache entries, rate limits, ...) is
+# versioned or expires on its own.
+DEPENDENT_PREFIXES = (
+    'similar-etfs-',
+    'history-employees-',
+    'price-prediction-',
+    'get-quant-stats-',
+    'revenue-segmentation-',
+    'crypto-profile-',
+    'etf-profile-',
+    'etf-new-launches',
+    'stock-screener-data-',
+    'full-searchbar-',
+    'shareholders-',
+    'earnings-call-transcripts-',
+    'popular-etfs',
+    'insider-trading-statistics-',
+    'ipo-calendar-',
+    'heatmap',
+    'options-gex-dex-',
+    'options-oi-',
+    'wiim-',
+    'reddit-tracker',
+    'info-text-',
+)
+
+def _fetchall(db_path, query):
+    with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as con:
+        return con.execute(query).fetchall()
+
+
+def build_reference_data(stock_screener_data=None):
+    """Query the databases for the symbol sets and searchbar universe of the API."""
+    stock_list_data = [{
+        'symbol': row[0],
+        'name': row[1],
+        'type': row[2].capitalize(),
+        'marketCap': row[3],
+    } for row in _fetchall('stocks.db', "SELECT symbol, name, type, marketCap FROM stocks") if row[3] is not None]
+
+    etf_rows = _fetchall('etf.db', "SELECT symbol, name, type FROM etfs")
+    etf_list_data = [{
+        'symbol': row[0],
+        'name': row[1],
+        'type': row[2].upper(),
+    } for row in etf_rows]
+
+    crypto_symbols = [row[0] for row in _fetchall('crypto.db', "SELECT DISTINCT symbol FROM cryptos")]
+
+    if stock_screener_data is None:
+        with open("json/stock-screener/data.json", 'rb') as file:
+            stock_screener_data = orjson.loads(file.read())
+    isin_map = {item['symbol']: item.get('isin') for item in stock_screener_data}
+
+    searchbar_data = stock_list_data + etf_list_data
+    for item in searchbar_data:
+        item['isin'] = isin_map.get(item['symbol'])
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': str(time.time_ns()),
+        'etf_symbols': list(dict.fromkeys(row[0] for row in etf_rows)),
+        'crypto_symbols': crypto_symbols,
+        'searchbar_data': searchbar_data,
+    }
+
+
+def save_reference_snapshot(stock_screener_data=None, path=REFERENCE_SNAPSHOT):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_json(path, build_reference_data(stock_screener_data), compress=False)
+
+
+def load_reference_data(path=REFERENCE_SNAPSHOT):
+    """Load the prebuilt snapshot, falling back to querying the databases if there is none yet."""
+    try:
+        with open(path, 'rb') as file:
+            data = orjson.loads(file.read())
+        if data.get('format') == SNAPSHOT_FORMAT:
+            return data
+        print(f"Reference snapshot {path} has an old format, rebuilding")
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"Could not load reference snapshot {path}: {e}")
+    return build_reference_data()
+
+
+def drop_dependent_keys(redis_client, prefixes=DEPENDENT_PREFIXES):
+    """Unlink every key under `prefixes` (sync client). Returns how many were dropped."""
+    # One pass over the keyspace rather than a MATCH scan per prefix
+    prefixes = tuple(prefix.encode() for prefix in prefixes)
+    deleted = 0
+    batch = []
+    for key in redis_client.scan_iter(count=1000):
+        if key.startswith(prefixes):
+            batch.append(key)
+        if len(batch) >= 1000:
+            deleted += redis_client.unlink(*batch)
+            batch = []
+    if batch:
+        deleted += redis_client.unlink(*batch)
+    return deleted
+
+
+def invalidate_stale_keys(redis_client, version, prefixes=DEPENDENT_PREFIXES):
+    """
+    Replaces flushing Redis on every boot: the keys under `prefixes` are only
+    dropped when the reference data actually changed since the last boot, and
+    nothing else is touched. Meant for a sync client; the first worker to boot
+    with a new version does the cleanup.
+    """
+    previous = redis_client.set('reference:version', version, get=True)
+    if previous is not None and previous.decode() == version:
+        return 0
+    return drop_dependent_keys(redis_client, prefixes)
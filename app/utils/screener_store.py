@@ -0,0 +1,119 @@
+import numpy as np
+
+from utils.column_table import ColumnTable
+
+
+# Columns the screener table sorts by most, argsorted once at load time
+PRESORTED_COLUMNS = ('marketCap', 'changesPercentage', 'price', 'volume', 'pe')
+# Always part of a screener row, whatever was requested
+ALWAYS_INCLUDE = ['symbol', 'marketCap', 'price', 'changesPercentage', 'name', 'volume', 'pe']
+MAX_LIMIT = 1000
+
+
+class ScreenerStore:
+    """
+    Query layer over the stock screener universe, built once per data load.
+
+    The data itself is a ColumnTable (numeric fields as float64 columns, low
+    cardinality strings as category codes), usually memory mapped from the
+    snapshot restart_json.py writes, so a query is a handful of vectorized
+    comparisons over the whole universe instead of a Python loop in the browser.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.size = table.size
+        self.numeric = table.numeric_columns
+        self.categorical = table.categorical_columns
+        self.index = {symbol: idx for idx, symbol in enumerate(table.text_values('symbol'))} if 'symbol' in table.position else {}
+
+        # (descending, ascending) order, NaN last, ties broken by the original order
+        self.presorted = {
+            key: (self._argsort(self.numeric[key], False), self._argsort(self.numeric[key], True))
+            for key in PRESORTED_COLUMNS if key in self.numeric
+        }
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(ColumnTable.from_rows(rows))
+
+    @staticmethod
+    def _argsort(column, ascending):
+        keys = np.nan_to_num(column, nan=np.inf) if ascending else -np.nan_to_num(column, nan=-np.inf)
+        return np.argsort(keys, kind='stable')
+
+    def __len__(self):
+        return self.size
+
+    def get(self, symbol):
+        idx = self.index.get(symbol)
+        return None if idx is None else self.table.row(idx, self.table.names)
+
+    def project(self, symbols, keys):
+        """{symbol: {key: value}} for the given symbols only, limited to `keys`."""
+        result = {}
+        for symbol in symbols:
+            idx = self.index.get(symbol)
+            if idx is not None:
+                result[symbol] = self.table.row(idx, keys)
+        return result
+
+    def rows(self, keys):
+        """Every row limited to `keys`, in the original order, built column by column."""
+        rows = [{} for _ in range(self.size)]
+        for key in keys:
+            if key not in self.table.position:
+                continue
+            present = self.table.present[self.table.position[key]]
+            values = self.table.column(key)
+            if present.all():
+                for row, value in zip(rows, values):
+                    row[key] = value
+            else:
+                for row, value, has_key in zip(rows, values, present.tolist()):
+                    if has_key:
+                        row[key] = value
+        return rows
+
+    def _mask(self, filters):
+        mask = np.ones(self.size, dtype=bool)
+        for item in filters:
+            name = item.get('name')
+            if name in self.numeric:
+                column = self.numeric[name]
+                if item.get('min') is not None:
+                    mask &= column >= item['min']
+                if item.get('max') is not None:
+                    mask &= column <= item['max']
+            elif name in self.categorical:
+                lookup, codes = self.categorical[name]
+                values = item.get('values') or ([item['value']] if item.get('value') is not None else [])
+                wanted = [lookup[value] for value in values if value in lookup]
+                mask &= np.isin(codes, wanted)
+            elif name in self.table.text_names:
+                # High cardinality strings aren't coded, compare them one by one
+                values = set(item.get('values') or ([item['value']] if item.get('value') is not None else []))
+                mask &= np.fromiter((isinstance(value, str) and value in values for value in self.table.text_values(name)), dtype=bool, count=self.size)
+            else:
+                raise ValueError(f"Unknown screener field: {name}")
+        return mask
+
+    def _order(self, mask, sort_by, ascending):
+        if sort_by not in self.numeric:
+            raise ValueError(f"Cannot sort by: {sort_by}")
+        presorted = self.presorted.get(sort_by)
+        if presorted is not None:
+            order = presorted[1] if ascending else presorted[0]
+            return order[mask[order]]
+
+        ids = np.flatnonzero(mask)
+        return ids[self._argsort(self.numeric[sort_by][ids], ascending)]
+
+    def query(self, filters=(), sort_by='marketCap', ascending=False, limit=100, offset=0, columns=()):
+        """Returns (total matches, requested page of rows projected to `columns`)."""
+        mask = self._mask(filters)
+        order = self._order(mask, sort_by, ascending)
+        page = order[offset:offset + min(limit, MAX_LIMIT)]
+
+        keys = list(dict.fromkeys(ALWAYS_INCLUDE + list(columns) + [sort_by]))
+        return len(order), [self.table.row(idx, keys) for idx in page.tolist()]
@@ -0,0 +1,249 @@
+import re
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from Levenshtein import distance as levenshtein
+
+
+# Prioritization strategy dictionary
+PRIORITY_STRATEGIES = {
+    'exact_symbol_match': 0,
+    'symbol_prefix_match': 1,
+    'exact_name_match': 2,
+    'name_prefix_match': 3,
+    'symbol_contains': 4,
+    'name_contains': 5
+}
+NO_MATCH = len(PRIORITY_STRATEGIES)
+
+# Fuzzy search budget: verify at most this many candidate tokens per query token
+FUZZY_MAX_CANDIDATES = 200
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _padded_grams(token):
+    return _grams(f"${token}$", 3)
+
+
+def _max_distance(token):
+    # Short tokens only tolerate a single typo, otherwise everything matches
+    if len(token) <= 4:
+        return 1
+    if len(token) <= 8:
+        return 2
+    return 3
+
+
+def _prefix_range(keys, prefix):
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return lo, hi
+
+
+class SearchIndex:
+    """
+    Search index over the searchbar universe, built once per data load.
+
+    Entries are stored in ranking order (descending marketCap, then original
+    order), so an entry id doubles as its tie-breaking key and every posting
+    list is already sorted by market cap. A query only touches the exact/prefix
+    matches and the shortest n-gram posting list of the query, and stops walking
+    as soon as nothing further down the list can make it into the top results.
+    Results are identical to sorting the whole universe by
+    (calculate_score, -marketCap).
+    """
+
+    def __init__(self, items):
+        order = sorted(
+            range(len(items)),
+            key=lambda i: (0 if items[i].get('marketCap') is None else -items[i]['marketCap'], i)
+        )
+        self.items = [items[i] for i in order]
+        self.symbols = [item['symbol'].lower() for item in self.items]
+        self.names = [(item['name'] or '').lower() for item in self.items]
+        self.dot_penalty = bytes(1 if '.' in symbol else 0 for symbol in self.symbols)
+
+        self.isin = {}
+        self.exact_symbol = defaultdict(list)
+        self.exact_name = defaultdict(list)
+        for idx, item in enumerate(self.items):
+            if item.get('isin'):
+                self.isin.setdefault(item['isin'], item)
+            self.exact_symbol[self.symbols[idx]].append(idx)
+            self.exact_name[self.names[idx]].append(idx)
+
+        # Sorted (key, id) arrays for prefix lookups
+        symbol_sorted = sorted((symbol, idx) for idx, symbol in enumerate(self.symbols))
+        name_sorted = sorted((name, idx) for idx, name in enumerate(self.names))
+        self.symbol_keys = [key for key, _ in symbol_sorted]
+        self.symbol_ids = array('I', (idx for _, idx in symbol_sorted))
+        self.name_keys = [key for key, _ in name_sorted]
+        self.name_ids = array('I', (idx for _, idx in name_sorted))
+
+        # Bigram/trigram posting lists; ids are appended in ranking order
+        self.symbol_grams = {2: defaultdict(lambda: array('I')), 3: defaultdict(lambda: array('I'))}
+        self.name_grams = {2: defaultdict(lambda: array('I')), 3: defaultdict(lambda: array('I'))}
+        for idx in range(len(self.items)):
+            for n in (2, 3):
+                for gram in _grams(self.symbols[idx], n):
+                    self.symbol_grams[n][gram].append(idx)
+                for gram in _grams(self.names[idx], n):
+                    self.name_grams[n][gram].append(idx)
+        for grams in (*self.symbol_grams.values(), *self.name_grams.values()):
+            grams.default_factory = None
+
+        # Token vocabulary for fuzzy search: token -> entry ids, and padded
+        # trigram -> token ids. Edit distance is only computed on the tokens
+        # sharing the most trigrams with the query, never on the whole universe.
+        token_ids = {}
+        self.token_entries = []
+        for idx in range(len(self.items)):
+            for token in {self.symbols[idx], *TOKEN_PATTERN.findall(self.names[idx])}:
+                if token not in token_ids:
+                    token_ids[token] = len(self.token_entries)
+                    self.token_entries.append(array('I'))
+                self.token_entries[token_ids[token]].append(idx)
+        self.tokens = list(token_ids)
+        self.token_keys = sorted(self.tokens)
+        self.token_key_ids = array('I', (token_ids[token] for token in self.token_keys))
+        self.token_grams = defaultdict(lambda: array('I'))
+        for token_id, token in enumerate(self.tokens):
+            for gram in _padded_grams(token):
+                self.token_grams[gram].append(token_id)
+        self.token_grams.default_factory = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def score(self, idx, query):
+        """Same scoring as the original calculate_score(), on pre-lowercased fields."""
+        symbol, name = self.symbols[idx], self.names[idx]
+        if len(query) == 1:
+            if symbol == query:
+                base_score = PRIORITY_STRATEGIES['exact_symbol_match']
+            elif name == query:
+                base_score = PRIORITY_STRATEGIES['exact_name_match']
+            else:
+                base_score = NO_MATCH
+        elif symbol == query:
+            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
+        elif symbol.startswith(query):
+            base_score = PRIORITY_STRATEGIES['symbol_prefix_match']
+        elif name == query:
+            base_score = PRIORITY_STRATEGIES['exact_name_match']
+        elif name.startswith(query):
+            base_score = PRIORITY_STRATEGIES['name_prefix_match']
+        elif query in symbol:
+            base_score = PRIORITY_STRATEGIES['symbol_contains']
+        elif query in name:
+            base_score = PRIORITY_STRATEGIES['name_contains']
+        else:
+            base_score = NO_MATCH
+        return base_score + self.dot_penalty[idx]
+
+    def _walk(self, ids, matches, limit, candidates):
+        # `ids` are in ranking order: once `limit` dot-free matches are found,
+        # every later match has a worse (score, rank) than those.
+        found = 0
+        for idx in ids:
+            if matches(idx):
+                candidates.add(idx)
+                if not self.dot_penalty[idx]:
+                    found += 1
+                    if found >= limit:
+                        break
+
+    def _postings(self, grams, query):
+        n = 3 if len(query) >= 3 else 2
+        postings = grams[n]
+        best = None
+        for gram in _grams(query, n):
+            posting = postings.get(gram)
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best or ()
+
+    def search(self, query, limit=5):
+        if not query:
+            return []
+
+        # Check for exact ISIN match first
+        exact_match = self.isin.get(query)
+        if exact_match is not None:
+            return [exact_match]
+
+        query = query.lower()
+        candidates = set(self.exact_symbol.get(query, ())) | set(self.exact_name.get(query, ()))
+
+        if len(query) == 1:
+            # Everything else scores the same, so the best are simply the highest ranked matches
+            self._walk(range(len(self.items)), lambda idx: query in self.symbols[idx] or query in self.names[idx], limit, candidates)
+        else:
+            lo, hi = _prefix_range(self.symbol_keys, query)
+            candidates.update(self.symbol_ids[lo:hi])
+            lo, hi = _prefix_range(self.name_keys, query)
+            candidates.update(self.name_ids[lo:hi])
+            self._walk(self._postings(self.symbol_grams, query), lambda idx: query in self.symbols[idx], limit, candidates)
+            self._walk(self._postings(self.name_grams, query), lambda idx: query in self.names[idx], limit, candidates)
+
+        best = heapq.nsmallest(limit, candidates, key=lambda idx: (self.score(idx, query), idx))
+        return [self.items[idx] for idx in best]
+
+    def _fuzzy_tokens(self, token, prefix=False):
+        """Vocabulary tokens within the edit distance budget of `token`, as {token_id: distance}."""
+        max_distance = _max_distance(token)
+        matches = {}
+        if prefix:
+            # The last query token may still be being typed
+            lo, hi = _prefix_range(self.token_keys, token)
+            matches.update((token_id, 0) for token_id in self.token_key_ids[lo:hi])
+
+        overlap = Counter()
+        for gram in _padded_grams(token):
+            overlap.update(self.token_grams.get(gram, ()))
+
+        for token_id, _ in overlap.most_common(FUZZY_MAX_CANDIDATES):
+            if token_id in matches:
+                continue
+            candidate = self.tokens[token_id]
+            if abs(len(candidate) - len(token)) > max_distance:
+                continue
+            dist = levenshtein(token, candidate, score_cutoff=max_distance)
+            if dist <= max_distance:
+                matches[token_id] = dist
+        return matches
+
+    def fuzzy_search(self, query, limit=5):
+        """
+        Typo tolerant search ("nvidai", "micorsoft"). Every query token has to
+        match a symbol or name token within a bounded edit distance; results are
+        ranked by total distance, then market cap.
+        """
+        tokens = TOKEN_PATTERN.findall(query.lower())
+        if not tokens:
+            return []
+
+        distances = None
+        for position, token in enumerate(tokens):
+            token_distances = {}
+            prefix = len(tokens) > 1 and position == len(tokens) - 1
+            for token_id, dist in self._fuzzy_tokens(token, prefix).items():
+                for idx in self.token_entries[token_id]:
+                    if dist < token_distances.get(idx, dist + 1):
+                        token_distances[idx] = dist
+            if distances is None:
+                distances = token_distances
+            else:
+                distances = {idx: dist + token_distances[idx] for idx, dist in distances.items() if idx in token_distances}
+            if not distances:
+                return []
+
+        best = heapq.nsmallest(limit, distances, key=lambda idx: (distances[idx] + self.dot_penalty[idx], idx))
+        return [self.items[idx] for idx in best]
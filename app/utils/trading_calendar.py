@@ -0,0 +1,181 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+# NYSE trading calendar. Holidays follow the exchange rules, so there is no
+# list to update every year; one-off closures go into SPECIAL_CLOSURES.
+ET = ZoneInfo('America/New_York')
+
+PRE_MARKET_OPEN = time(4, 0)
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+AFTER_HOURS_CLOSE = time(20, 0)
+EARLY_AFTER_HOURS_CLOSE = time(17, 0)
+
+# National days of mourning and other unscheduled closures
+SPECIAL_CLOSURES = {
+    date(2018, 12, 5),
+    date(2025, 1, 9),
+}
+
+# market_session() values
+PRE_MARKET = 'pre'
+REGULAR = 'open'
+AFTER_HOURS = 'after'
+CLOSED = 'closed'
+
+
+def _nth_weekday(year, month, weekday, n):
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    last = date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day):
+    # Saturday holidays are observed on Friday, Sunday holidays on Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def holidays(year):
+    """Full day closures of the year."""
+    days = {
+        _nth_weekday(year, 1, 0, 3),    # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),    # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),      # Memorial Day
+        _observed(date(year, 7, 4)),    # Independence Day
+        _nth_weekday(year, 9, 0, 1),    # Labor Day
+        _nth_weekday(year, 11, 3, 4),   # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day on a Saturday is not moved back into the previous year
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))  # Juneteenth
+    days.update(day for day in SPECIAL_CLOSURES if day.year == year)
+    return frozenset(days)
+
+
+@lru_cache(maxsize=None)
+def early_closes(year):
+    """Days the regular session ends at 13:00 ET."""
+    candidates = (
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),  # Day after Thanksgiving
+        date(year, 12, 24),
+    )
+    return frozenset(day for day in candidates if is_trading_day(day))
+
+
+def _as_date(day):
+    if isinstance(day, datetime):
+        return day.astimezone(ET).date() if day.tzinfo else day.date()
+    if isinstance(day, str):
+        return date.fromisoformat(day[:10])
+    return day
+
+
+def now_et():
+    return datetime.now(ET)
+
+
+def is_holiday(day):
+    day = _as_date(day)
+    return day in holidays(day.year)
+
+
+def is_trading_day(day):
+    day = _as_date(day)
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def previous_trading_day(day):
+    """The last trading day strictly before `day`."""
+    day = _as_date(day) - timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def next_trading_day(day):
+    """The first trading day strictly after `day`."""
+    day = _as_date(day) + timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def last_trading_day(day):
+    """`day` itself if the market trades on it, else the trading day before."""
+    day = _as_date(day)
+    return day if is_trading_day(day) else previous_trading_day(day)
+
+
+def market_close(day):
+    day = _as_date(day)
+    return EARLY_CLOSE if day in early_closes(day.year) else MARKET_CLOSE
+
+
+def after_hours_close(day):
+    day = _as_date(day)
+    return EARLY_AFTER_HOURS_CLOSE if day in early_closes(day.year) else AFTER_HOURS_CLOSE
+
+
+def market_session(now=None):
+    """One of PRE_MARKET, REGULAR, AFTER_HOURS or CLOSED for `now` (default: the current time)."""
+    now = now_et() if now is None else now.astimezone(ET)
+    if not is_trading_day(now):
+        return CLOSED
+    current = now.time()
+    if current < PRE_MARKET_OPEN:
+        return CLOSED
+    if current < MARKET_OPEN:
+        return PRE_MARKET
+    if current < market_close(now):
+        return REGULAR
+    if current < after_hours_close(now):
+        return AFTER_HOURS
+    return CLOSED
+
+
+def is_market_open(now=None):
+    return market_session(now) == REGULAR
+
+
+def next_session_change(now=None):
+    """When market_session() stops returning its current value."""
+    now = now_et() if now is None else now.astimezone(ET)
+    day = now.date()
+    if is_trading_day(day):
+        for boundary in (PRE_MARKET_OPEN, MARKET_OPEN, market_close(day), after_hours_close(day)):
+            change = datetime.combine(day, boundary, tzinfo=ET)
+            if change > now:
+                return change
+    return datetime.combine(next_trading_day(day), PRE_MARKET_OPEN, tzinfo=ET)